@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from .endpoints import auth, itineraries, vendors, bookings, support  # Relative imports
+from .endpoints import auth, itineraries, vendors, bookings, support, transactions  # Relative imports
 
 api_router = APIRouter()
 
@@ -8,4 +8,5 @@ api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(itineraries.router, prefix="/itineraries", tags=["itineraries"])
 api_router.include_router(vendors.router, prefix="/vendors", tags=["vendors"])
 api_router.include_router(bookings.router, prefix="/bookings", tags=["bookings"])
-api_router.include_router(support.router, prefix="/support", tags=["support"])
\ No newline at end of file
+api_router.include_router(support.router, prefix="/support", tags=["support"])
+api_router.include_router(transactions.router, prefix="/transactions", tags=["transactions"])
\ No newline at end of file
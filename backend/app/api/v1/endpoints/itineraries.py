@@ -1,5 +1,10 @@
-from fastapi import APIRouter, Query
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from typing import List, Optional, Tuple
+from backend.app.schemas.itinerary import ItineraryListItem, ITINERARY_LIST_FIELDS
+from backend.app.services.itinerary_catalogue import ItineraryCatalogue
+from backend.app.services.translation_service import TRANSLATION_LANGUAGES, get_translation_service
+from backend.app.utils.helpers import project_fields
+from backend.app.utils.validation import validate_fields_param, ValidationResult
 
 router = APIRouter()
 
@@ -80,51 +85,98 @@ ITINERARIES = [
     }
 ]
 
+# id index, category index, map clusters and pre-encoded bodies; call catalogue.load() when the data changes
+catalogue = ItineraryCatalogue(ITINERARIES)
 
-@router.get("/")
+# Deepest map tile zoom served (past CLUSTER_MAX_ZOOM, tiles list single pins)
+MAX_TILE_ZOOM = 22
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Validate the `fields=` parameter against the itinerary whitelist"""
+    validation_result = ValidationResult()
+    is_valid, selected_fields = validate_fields_param(fields, ITINERARY_LIST_FIELDS, result=validation_result)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=validation_result.errors[0]["message"]
+        )
+    return selected_fields
+
+
+# Static paths are declared before /{itinerary_id} so they are never captured as an ID
+
+@router.get("/", response_model=List[ItineraryListItem], response_model_exclude_unset=True)
 async def get_itineraries(
+        request: Request,
         category: Optional[str] = Query(None),
         search: Optional[str] = Query(None),
         limit: int = Query(10, le=50),
-        offset: int = Query(0, ge=0)
+        offset: int = Query(0, ge=0),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,title,price_per_person")
 ):
     """Get itineraries with filters"""
-    filtered = ITINERARIES.copy()
+    selected_fields = _parse_fields(fields)
 
-    if category:
-        filtered = [i for i in filtered if i["category"] == category]
+    if not category and not search:
+        return catalogue.page(offset, limit, selected_fields).response(request.headers.get("accept-encoding"))
 
-    if search:
-        search_lower = search.lower()
-        filtered = [
-            i for i in filtered
-            if search_lower in i["title"].lower() or search_lower in i["description"].lower()
-        ]
+    filtered = catalogue.filter(category, search)
 
     # Apply pagination
     start = offset
     end = offset + limit
-    return filtered[start:end]
+    return [project_fields(i, selected_fields) for i in filtered[start:end]]
 
 
-@router.get("/featured")
-async def get_featured_itineraries(limit: int = Query(6, le=20)):
+@router.get("/featured", response_model=List[ItineraryListItem], response_model_exclude_unset=True)
+async def get_featured_itineraries(
+        request: Request,
+        limit: int = Query(6, le=20),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return")
+):
     """Get featured itineraries"""
-    return ITINERARIES[:limit]
+    selected_fields = _parse_fields(fields)
+    return catalogue.page(0, limit, selected_fields).response(request.headers.get("accept-encoding"))
+
+
+@router.get("/categories")
+async def get_categories(request: Request):
+    """Get list of itinerary categories"""
+    return catalogue.categories_body.response(request.headers.get("accept-encoding"))
+
+
+@router.get("/clusters/{z}/{x}/{y}")
+async def get_itinerary_clusters(z: int, x: int, y: int, request: Request):
+    """Clustered itinerary meeting points in map tile z/x/y (Web Mercator)"""
+    if not 0 <= z <= MAX_TILE_ZOOM or not (0 <= x < 1 << z and 0 <= y < 1 << z):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid tile. Zoom must be 0-{MAX_TILE_ZOOM} and x, y within 0 to 2^z - 1"
+        )
+    return catalogue.clusters.tile_body(z, x, y).response(request.headers.get("accept-encoding"))
 
 
 @router.get("/{itinerary_id}")
-async def get_itinerary(itinerary_id: str):
+async def get_itinerary(
+        itinerary_id: str,
+        request: Request,
+        lang: Optional[str] = Query(None, description="Translate text fields: as, hi or bn")
+):
     """Get itinerary by ID"""
-    for itinerary in ITINERARIES:
-        if itinerary["id"] == itinerary_id:
-            return itinerary
+    if lang and lang != "en":
+        if lang not in TRANSLATION_LANGUAGES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid language code. Must be one of: en, {', '.join(TRANSLATION_LANGUAGES)}"
+            )
+        itinerary = catalogue.get(itinerary_id)
+        if itinerary is not None:
+            # Served from the translation store once the catalogue is pre-translated
+            return await get_translation_service().translate_itinerary(itinerary, lang)
 
-    return {"error": "Itinerary not found", "id": itinerary_id}
+    body = catalogue.body(itinerary_id)
+    if body is not None:
+        return body.response(request.headers.get("accept-encoding"))
 
-
-@router.get("/categories")
-async def get_categories():
-    """Get list of itinerary categories"""
-    categories = list(set([i["category"] for i in ITINERARIES]))
-    return {"categories": categories}
\ No newline at end of file
+    return {"error": "Itinerary not found", "id": itinerary_id}
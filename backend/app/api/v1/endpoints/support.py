@@ -1,13 +1,34 @@
-from fastapi import APIRouter, HTTPException, Query, status
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from typing import Optional
 from backend.app.utils.validation import sanitize_input
+from backend.app.core.responses import PreEncodedJSON
+from backend.app.services.phrasebook import get_phrasebook
+from backend.app.services.translation_memory import get_translation_memory
+from backend.app.services.translation_service import TranslationService, get_translation_service
+from backend.app.utils.geolocation import TRAVEL_SPEEDS_KMH, calculate_safety_score
+from backend.app.schemas.support import NearbyBatchRequest, RouteAnalysisRequest
+from backend.app.utils.route_analysis import analyze_route
+from backend.app.utils.safety_raster import TIMES_OF_DAY, get_safety_raster
+from backend.app.utils.spatial_index import POINT_SETS, get_point_index
+from backend.app.utils.travel_matrix import MATRIX_MODES, get_travel_matrix
 
 router = APIRouter()
 
+# Parsed, indexed and pre-serialized once at import time
+phrasebook = get_phrasebook()
+translation_memory = get_translation_memory()
+
+EMERGENCY_CONTACTS_BODY = PreEncodedJSON({
+    "contacts": TranslationService.get_emergency_contacts()
+})
+
 
 @router.get("/phrasebook")
 async def get_phrasebook(
-        category: Optional[str] = Query(None)
+        request: Request,
+        category: Optional[str] = Query(None),
+        lang: str = Query("as", description="Phrase language: as, hi or bn"),
+        q: Optional[str] = Query(None, max_length=100, description="Search English or phonetic text")
 ):
     """
     Get local language phrasebook with input sanitization
@@ -17,20 +38,20 @@ async def get_phrasebook(
         if category:
             category = sanitize_input(category)
 
-        # Your existing phrasebook logic...
-        phrases = [...]
-
-        if category:
-            phrases = [p for p in phrases if p["category"] == category]
+        if lang not in phrasebook.languages:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid language code. Must be one of: {', '.join(phrasebook.languages)}"
+            )
 
-        # Sanitize output
-        sanitized_phrases = [sanitize_input(phrase) for phrase in phrases]
+        if q:
+            phrases = phrasebook.search(q, lang, category or None)
+            return {"phrases": phrases, "total": len(phrases)}
 
-        return {
-            "phrases": sanitized_phrases,
-            "total": len(sanitized_phrases)
-        }
+        return phrasebook.body(lang, category or None).response(request.headers.get("accept-encoding"))
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -38,6 +59,147 @@ async def get_phrasebook(
         )
 
 
+@router.get("/emergency-contacts")
+async def get_emergency_contacts(request: Request):
+    """
+    Get emergency contacts for Guwahati
+    """
+    return EMERGENCY_CONTACTS_BODY.response(request.headers.get("accept-encoding"))
+
+
+@router.get("/safety")
+async def get_safety_score(
+        lat: float = Query(..., ge=-90, le=90),
+        lng: float = Query(..., ge=-180, le=180),
+        time_of_day: str = Query("day", description="day or night")
+):
+    """
+    Safety score and recommendations for a location
+    """
+    if time_of_day not in TIMES_OF_DAY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid time_of_day. Must be one of: {', '.join(TIMES_OF_DAY)}"
+        )
+    return calculate_safety_score(lat, lng, time_of_day)
+
+
+@router.get("/safety/heatmap")
+async def get_safety_heatmap(
+        south: float = Query(..., ge=-90, le=90),
+        west: float = Query(..., ge=-180, le=180),
+        north: float = Query(..., ge=-90, le=90),
+        east: float = Query(..., ge=-180, le=180),
+        time_of_day: str = Query("day", description="day or night"),
+        size: int = Query(64, ge=8, le=256, description="Maximum cells per side")
+):
+    """
+    Safety score grid for a map viewport, rows from north to south
+    """
+    if time_of_day not in TIMES_OF_DAY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid time_of_day. Must be one of: {', '.join(TIMES_OF_DAY)}"
+        )
+    if south >= north or west >= east:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Viewport must have south < north and west < east"
+        )
+    return get_safety_raster().window(south, west, north, east, time_of_day, size)
+
+
+# Safety samples per analysed route, however long its legs are
+ROUTE_MAX_SAMPLES = 20000
+
+
+@router.post("/route")
+async def get_route_analysis(request: RouteAnalysisRequest):
+    """
+    Distance, ETA per travel mode and safety along every leg of a stop sequence
+    """
+    if request.time_of_day not in TIMES_OF_DAY:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid time_of_day. Must be one of: {', '.join(TIMES_OF_DAY)}"
+        )
+    modes = request.modes or list(TRAVEL_SPEEDS_KMH)
+    if any(mode not in TRAVEL_SPEEDS_KMH for mode in modes):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid mode. Must be one of: {', '.join(TRAVEL_SPEEDS_KMH)}"
+        )
+    stops = [(stop.lat, stop.lng) for stop in request.stops]
+    return analyze_route(stops, modes, request.time_of_day, request.sample_km, max_samples=ROUTE_MAX_SAMPLES)
+
+
+@router.get("/travel-time")
+async def get_travel_time(
+        from_id: str = Query(..., description="Meeting point or landmark id"),
+        to_id: Optional[str] = Query(None, description="Destination id; omit to rank the nearest points by ETA"),
+        mode: str = Query("walking", description="walking, auto or driving"),
+        limit: int = Query(5, ge=1, le=50)
+):
+    """
+    Travel time between known points, or the known points nearest by ETA
+    """
+    matrix = get_travel_matrix()
+    if mode not in MATRIX_MODES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid mode. Must be one of: {', '.join(MATRIX_MODES)}"
+        )
+    if from_id not in matrix or (to_id is not None and to_id not in matrix):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Unknown point id")
+
+    if to_id is not None:
+        return matrix.lookup(from_id, to_id, mode)
+    return {"from": from_id, "nearest": matrix.rank(from_id, mode, limit)}
+
+
+def _point_index(kind: str):
+    if kind not in POINT_SETS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid kind. Must be one of: {', '.join(POINT_SETS)}"
+        )
+    return get_point_index(kind)
+
+
+@router.get("/nearby")
+async def get_nearby_points(
+        lat: float = Query(..., ge=-90, le=90),
+        lng: float = Query(..., ge=-180, le=180),
+        kind: str = Query("meeting_point", description="meeting_point or landmark"),
+        k: int = Query(5, ge=1, le=50),
+        radius_km: Optional[float] = Query(None, gt=0, le=50),
+        types: Optional[str] = Query(None, description="Comma-separated types, e.g. temple,riverfront")
+):
+    """
+    The k nearest meeting points or landmarks, optionally within a radius and of given types
+    """
+    index = _point_index(kind)
+    type_list = [t.strip() for t in types.split(",") if t.strip()] if types else None
+    points = index.nearest(lat, lng, k, radius_km, type_list)
+    return {"points": points, "total": len(points)}
+
+
+@router.post("/nearby/batch")
+async def get_nearby_points_batch(request: NearbyBatchRequest):
+    """
+    Nearest meeting points or landmarks for many origins at once (e.g. every stop of an itinerary)
+    """
+    index = _point_index(request.kind)
+    origins = [(origin.lat, origin.lng) for origin in request.origins]
+    results = index.nearest_many(origins, request.k, request.radius_km, request.types)
+    return {
+        "results": [
+            {"origin": {"lat": lat, "lng": lng}, "points": points}
+            for (lat, lng), points in zip(origins, results)
+        ]
+    }
+
+
 @router.get("/translate")
 async def translate_text(
         text: str = Query(..., description="Text to translate"),
@@ -66,17 +228,27 @@ async def translate_text(
                 detail=f"Invalid language code. Must be one of: {', '.join(valid_languages)}"
             )
 
-        # Your translation logic...
-        translations = {...}
+        if sanitized_lang == "en":
+            match = {"translated": sanitized_text, "phonetic": "", "match": "exact"}
+        else:
+            # Answered locally unless the memory has nothing close enough
+            match = translation_memory.lookup(sanitized_text, sanitized_lang)
 
-        text_lower = sanitized_text.lower()
-        translated = translations.get(text_lower, f"{sanitized_text} (Translation not available)")
+        if match is None:
+            translated = await get_translation_service().translate_text(sanitized_text, sanitized_lang)
+            if translated is None:
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Translation not available"
+                )
+            match = {"translated": translated, "phonetic": "", "match": "upstream"}
 
         return {
             "original": sanitized_text,
-            "translated": translated.split(" (")[0],
-            "phonetic": translated.split(" (")[1].rstrip(")") if "(" in translated else "",
-            "language": "Assamese" if sanitized_lang == "as" else sanitized_lang.upper()
+            "translated": match["translated"],
+            "phonetic": match["phonetic"],
+            "language": "Assamese" if sanitized_lang == "as" else sanitized_lang.upper(),
+            "match": match["match"]
         }
 
     except HTTPException:
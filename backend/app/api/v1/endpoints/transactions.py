@@ -1,11 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Optional
+import orjson
 from backend.app.services.payment_service import PaymentService
+from backend.app.services.transaction_service import IdempotencyKeyReused, TransactionService, TransactionConflict
+from backend.app.services.webhook_queue import get_webhook_queue
 from backend.app.core.dependencies import get_current_user
-from backend.app.schemas.transaction import Transaction, TransactionCreate
+from backend.app.schemas.transaction import Transaction
 
 router = APIRouter()
 payment_service = PaymentService()
+transaction_service = TransactionService(payment_service)
 
 
 @router.post("/create-order")
@@ -13,29 +18,42 @@ async def create_payment_order(
         amount: float,
         booking_id: str,
         currency: str = "INR",
+        idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
         current_user: dict = Depends(get_current_user)
 ):
-    """Create Razorpay order for payment"""
+    """Create Razorpay order for payment (safe to retry with the same Idempotency-Key)"""
     try:
-        # Create order
-        order = payment_service.create_order(
+        # Create order, or return the one already created for this key
+        transaction = await transaction_service.create_order(
+            booking_id=booking_id,
             amount=amount,
             currency=currency,
-            receipt=f"booking_{booking_id}"
+            idempotency_key=f"{current_user['id']}:{idempotency_key}" if idempotency_key else None
         )
 
-        if not order:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Failed to create payment order"
-            )
-
         return {
-            "order_id": order["id"],
-            "amount": order["amount"],
-            "currency": order["currency"],
-            "key": payment_service.client.auth[0]  # Razorpay key ID
+            "order_id": transaction["razorpay_order_id"],
+            "amount": int(round(transaction["amount"] * 100)),  # In paise, as Razorpay returns it
+            "currency": transaction["currency"],
+            "key": payment_service.key_id  # Razorpay key ID
         }
+    except IdempotencyKeyReused as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    except TransactionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Failed to create payment order"
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -66,25 +84,33 @@ async def verify_payment(
                 detail="Invalid payment signature"
             )
 
-        # Get order details
-        order = payment_service.get_order(razorpay_order_id)
+        # Record the payment in the ledger (a replayed verify returns the stored result)
+        transaction = await transaction_service.verify_payment(
+            booking_id,
+            razorpay_order_id,
+            razorpay_payment_id,
+            razorpay_signature
+        )
 
-        if not order:
+        if not transaction:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Order not found"
             )
 
-        # Update booking payment status (simplified)
-        # In production, you'd update the transactions table
-
         return {
             "success": True,
             "message": "Payment verified successfully",
             "order_id": razorpay_order_id,
             "payment_id": razorpay_payment_id,
-            "amount": order["amount"] / 100  # Convert from paise
+            "transaction_id": transaction["id"],
+            "amount": transaction["amount"]
         }
+    except TransactionConflict as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e)
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -94,15 +120,87 @@ async def verify_payment(
         )
 
 
+@router.post("/webhook")
+async def razorpay_webhook(
+        request: Request,
+        x_razorpay_signature: Optional[str] = Header(None),
+        x_razorpay_event_id: Optional[str] = Header(None)
+):
+    """
+    Razorpay webhook receiver: verify, enqueue, acknowledge
+
+    Events are applied to transactions and bookings by the background
+    webhook workers, so this returns as soon as the event is durably queued.
+    """
+    body = await request.body()
+
+    if not payment_service.verify_webhook_signature(body, x_razorpay_signature):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid webhook signature"
+        )
+
+    try:
+        event_type = orjson.loads(body).get("event", "unknown")
+    except orjson.JSONDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid webhook payload"
+        )
+
+    # The SQLite insert (and its fsync) runs off the event loop
+    queued = await run_in_threadpool(get_webhook_queue().enqueue, x_razorpay_event_id, event_type, body)
+    return {"status": "queued" if queued else "duplicate"}
+
+
+async def _check_booking_access(booking_id: str, current_user: dict):
+    """Only the booking's customer, its vendor or an admin may see its payments"""
+    if current_user.get("role") == "admin":
+        return
+
+    booking = transaction_service.supabase.table("bookings") \
+        .select("user_id, vendor_id") \
+        .eq("id", booking_id) \
+        .limit(1) \
+        .execute()
+
+    if not booking.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Booking not found"
+        )
+
+    if (booking.data[0]["user_id"] != current_user["id"] and
+            booking.data[0].get("vendor_id") != current_user.get("vendor_id")):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to view this transaction"
+        )
+
+
+@router.get("/booking/{booking_id}", response_model=List[Transaction])
+async def get_booking_transactions(
+        booking_id: str,
+        current_user: dict = Depends(get_current_user)
+):
+    """Get all transactions for a booking"""
+    await _check_booking_access(booking_id, current_user)
+    return await transaction_service.get_booking_transactions(booking_id)
+
+
 @router.get("/{transaction_id}", response_model=Transaction)
 async def get_transaction(
         transaction_id: str,
         current_user: dict = Depends(get_current_user)
 ):
     """Get transaction by ID"""
-    # This is a simplified version
-    # In production, you'd fetch from transactions table
-    raise HTTPException(
-        status_code=status.HTTP_501_NOT_IMPLEMENTED,
-        detail="Transaction retrieval not implemented"
-    )
\ No newline at end of file
+    transaction = await transaction_service.get_transaction(transaction_id)
+
+    if not transaction:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+
+    await _check_booking_access(transaction["booking_id"], current_user)
+    return transaction
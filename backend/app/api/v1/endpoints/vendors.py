@@ -1,15 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from typing import List, Optional, Dict
-from backend.app.schemas.vendor import VendorCreate, VendorUpdate, Vendor
+from backend.app.schemas.vendor import VendorCreate, VendorUpdate, Vendor, VendorListItem, VENDOR_LIST_FIELDS
 from backend.app.services.vendor_service import VendorService
 from backend.app.core.dependencies import get_current_user, get_current_vendor
 from backend.app.core.validators import validate_vendor_data
-from backend.app.utils.validation import sanitize_input, validate_uuid, ValidationResult
+from backend.app.utils.validation import sanitize_input, validate_uuid, validate_fields_param, ValidationResult
 
 router = APIRouter()
 vendor_service = VendorService()
 
 
+@router.get("/", response_model=List[VendorListItem], response_model_exclude_unset=True)
+async def get_vendors(
+        verified_only: bool = Query(True),
+        limit: int = Query(20, ge=1, le=100),
+        offset: int = Query(0, ge=0),
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. id,business_name,rating")
+):
+    """
+    Get list of vendors, optionally restricted to a sparse fieldset
+    """
+    validation_result = ValidationResult()
+    is_valid, selected_fields = validate_fields_param(fields, VENDOR_LIST_FIELDS, result=validation_result)
+    if not is_valid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=validation_result.errors[0]["message"]
+        )
+
+    try:
+        vendors = await vendor_service.get_vendors(
+            verified_only=verified_only,
+            limit=limit,
+            offset=offset,
+            fields=selected_fields
+        )
+        if vendors is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Failed to fetch vendors"
+            )
+        return [sanitize_input(vendor) for vendor in vendors]
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch vendors: {str(e)}"
+        )
+
+
 @router.post("/", response_model=Vendor)
 async def create_vendor(
         vendor_data: VendorCreate,
@@ -0,0 +1,194 @@
+"""
+Response compression negotiated by Accept-Encoding.
+
+Brotli is used when the optional `brotli` package is installed and the client
+accepts it, gzip otherwise. Bodies below the size threshold are sent as-is and
+streamed responses are compressed incrementally.
+"""
+
+import gzip
+import zlib
+from typing import Dict, List, Optional, Tuple
+from backend.app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def supported_encodings() -> List[str]:
+    """Encodings this server can produce, in order of preference"""
+    return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Pick the best supported encoding from an Accept-Encoding header"""
+    if not accept_encoding:
+        return None
+
+    accepted: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        parts = item.strip().split(";")
+        coding = parts[0].strip().lower()
+        quality = 1.0
+        for param in parts[1:]:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    best, best_quality = None, 0.0
+    for coding in supported_encodings():
+        quality = accepted.get(coding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+def compress(data: bytes, encoding: str, best: bool = False) -> bytes:
+    """Compress a complete body (best=True trades CPU for size, for bodies compressed once)"""
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if best else BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=9 if best else GZIP_LEVEL, mtime=0)
+
+
+class StreamCompressor:
+    """Incremental compressor for streamed bodies"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def chunk(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.process(data) + self._compressor.flush()
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def _is_compressible(headers: List[Tuple[bytes, bytes]]) -> bool:
+    content_type = b""
+    for key, value in headers:
+        if key == b"content-encoding":
+            return False  # already encoded (e.g. a pre-compressed body)
+        if key == b"content-type":
+            content_type = value
+    content_type = content_type.decode("latin-1").lower()
+    return any(content_type.startswith(t) for t in COMPRESSIBLE_TYPES)
+
+
+def _with_encoding(headers: List[Tuple[bytes, bytes]], encoding: str,
+                   content_length: Optional[int]) -> List[Tuple[bytes, bytes]]:
+    vary = [value for key, value in headers if key == b"vary"]
+    if not any(b"accept-encoding" in value.lower() for value in vary):
+        vary.append(b"Accept-Encoding")
+    headers = [
+        (key, value) for key, value in headers
+        if key not in (b"content-length", b"vary")
+    ]
+    headers.append((b"content-encoding", encoding.encode("latin-1")))
+    headers.append((b"vary", b", ".join(vary)))
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode("latin-1")))
+    return headers
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses larger than minimum_size"""
+
+    def __init__(self, app, minimum_size: int = settings.COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = None
+        for key, value in scope["headers"]:
+            if key == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = negotiate_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                if message["status"] not in (204, 304) and _is_compressible(message.get("headers", [])):
+                    # Hold the start message until the first body chunk shows the size
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                headers = start_message.get("headers", [])
+                if not more_body and len(body) < self.minimum_size:
+                    # Small enough that compressing costs more than it saves
+                    passthrough = True
+                    await send(start_message)
+                    start_message = None
+                    await send(message)
+                    return
+
+                if not more_body:
+                    compressed = compress(body, encoding)
+                    await send({**start_message, "headers": _with_encoding(headers, encoding, len(compressed))})
+                    start_message = None
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                # Streaming response: length unknown, compress chunk by chunk
+                compressor = StreamCompressor(encoding)
+                await send({**start_message, "headers": _with_encoding(headers, encoding, None)})
+                start_message = None
+
+            chunk = compressor.chunk(body) if body else b""
+            if more_body:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": chunk + compressor.finish()})
+
+        await self.app(scope, receive, send_compressed)
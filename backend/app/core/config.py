@@ -1,32 +1,130 @@
-import os
-from dotenv import load_dotenv
+from functools import lru_cache
+from pathlib import Path
+from typing import ClassVar
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables
-load_dotenv()
+# backend/, whichever directory the app is started from: .env and the default data paths live under it
+BASE_DIR = Path(__file__).resolve().parents[2]
+ENV_FILE = BASE_DIR / ".env"
+DATA_DIR = BASE_DIR / "data"
 
 
-class Settings:
+class Settings(BaseSettings):
+    """
+    Application settings: the environment first, then backend/.env, then the defaults here
+
+    Values are type-checked and validated once, when get_settings() first runs.
+    ClassVar constants are not configurable.
+    """
+
+    model_config = SettingsConfigDict(env_file=ENV_FILE, case_sensitive=True, extra="ignore", validate_default=True)
+
     # API Settings
-    PROJECT_NAME: str = "Guwahati Heritage Experiences API"
-    VERSION: str = "1.0.0"
-    API_V1_STR: str = "/api/v1"
+    PROJECT_NAME: ClassVar[str] = "Guwahati Heritage Experiences API"
+    VERSION: ClassVar[str] = "1.0.0"
+    API_V1_STR: ClassVar[str] = "/api/v1"
 
     # Supabase Configuration
-    SUPABASE_URL: str = os.getenv("SUPABASE_URL", "https://your-project.supabase.co")
-    SUPABASE_KEY: str = os.getenv("SUPABASE_KEY", "your-anon-key")
-    SUPABASE_SERVICE_ROLE_KEY: str = os.getenv("SUPABASE_SERVICE_ROLE_KEY", "")
+    SUPABASE_URL: str = "https://your-project.supabase.co"
+    SUPABASE_KEY: str = "your-anon-key"
+    SUPABASE_SERVICE_ROLE_KEY: str = ""
 
     # JWT Settings
-    SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-jwt-key-change-this-in-production")
-    ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
+    SECRET_KEY: str = "your-super-secret-jwt-key-change-this-in-production"
+    ALGORITHM: ClassVar[str] = "HS256"
 
     # Token Expiry Times
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
-    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    ACCESS_TOKEN_EXPIRE_MINUTES: ClassVar[int] = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: ClassVar[int] = 30
+
+    # Razorpay
+    RAZORPAY_KEY_ID: str = ""
+    RAZORPAY_KEY_SECRET: str = ""
+    RAZORPAY_API_BASE: str = "https://api.razorpay.com/v1"
+    PAYMENT_GATEWAY_TIMEOUT: float = Field(10, gt=0)
+    PAYMENT_GATEWAY_MAX_RETRIES: int = Field(3, ge=0)
+    RAZORPAY_WEBHOOK_SECRET: str = ""
+
+    # Webhook ingestion queue (SQLite file) and its worker pool
+    WEBHOOK_QUEUE_PATH: str = str(DATA_DIR / "webhook_queue.db")
+    WEBHOOK_WORKERS: int = Field(2, ge=1)
+    WEBHOOK_BATCH_SIZE: int = Field(100, ge=1)
+
+    # Google Translate (a local stub can stand in via GOOGLE_TRANSLATE_API_BASE)
+    GOOGLE_TRANSLATE_API_KEY: str = ""
+    GOOGLE_TRANSLATE_API_BASE: str = "https://translation.googleapis.com/language/translate/v2"
+    TRANSLATION_TIMEOUT: float = Field(5, gt=0)
+    TRANSLATION_CACHE_PATH: str = str(DATA_DIR / "translation_cache.db")
+    # Extra phrase pairs for the offline translation memory (JSON lines, optional)
+    TRANSLATION_MEMORY_PATH: str = str(DATA_DIR / "translation_memory.jsonl")
+    TRANSLATION_CACHE_SIZE: int = Field(10000, ge=1)
+    # Strings per upstream request, and how long (ms) to wait for a batch to fill
+    TRANSLATION_BATCH_SIZE: int = Field(100, ge=1)
+    TRANSLATION_BATCH_WINDOW_MS: float = Field(10, ge=0)
+
+    # Google Maps / reverse geocoding (cached per geohash cell)
+    GOOGLE_MAPS_API_KEY: str = ""
+    GOOGLE_GEOCODE_API_BASE: str = "https://maps.googleapis.com/maps/api/geocode/json"
+    GEOCODE_TIMEOUT: float = Field(5, gt=0)
+    GEOCODE_PRECISION: int = Field(7, ge=1, le=12)  # ~150m cells
+    GEOCODE_CACHE_PATH: str = str(DATA_DIR / "geocode_cache.db")
+    GEOCODE_CACHE_SIZE: int = Field(20000, ge=1)
+    GEOCODE_CACHE_TTL_DAYS: int = Field(30, ge=0)
+
+    # Precomputed safety-score raster (directory of .npy files) and its cell size in degrees
+    SAFETY_RASTER_PATH: str = str(DATA_DIR / "safety_raster")
+    SAFETY_RASTER_RESOLUTION: float = Field(0.0005, gt=0)  # ~55m
+
+    # Service-area polygons: extra areas (GeoJSON, optional) and the index grid cell size in degrees
+    SERVICE_AREAS_PATH: str = str(DATA_DIR / "service_areas.geojson")
+    SERVICE_AREA_CELL_DEG: float = Field(0.002, gt=0)  # ~200m
+
+    # Precomputed travel-time matrix over meeting points and landmarks (.npz)
+    TRAVEL_MATRIX_PATH: str = str(DATA_DIR / "travel_matrix.npz")
+
+    # Grid cell size (degrees) of the landmark / meeting point index for nearest-neighbour queries
+    SPATIAL_INDEX_CELL_DEG: float = Field(0.01, gt=0)  # ~1.1km
+
+    # Itinerary map clusters: deepest clustered zoom and grid cells per tile side (8: 32px cells on 256px tiles)
+    CLUSTER_MAX_ZOOM: int = Field(16, ge=0, le=22)
+    CLUSTER_CELLS_PER_TILE: int = Field(8, ge=1)
+
+    # Nearby-itinerary cache: geohash precision of the origin cell, max entries, entry lifetime (seconds)
+    # and the most candidates an entry may hold (busier areas are queried directly)
+    NEARBY_CACHE_PRECISION: int = Field(6, ge=1, le=12)  # ~1.2km x 0.6km cells
+    NEARBY_CACHE_SIZE: int = Field(2000, ge=1)
+    NEARBY_CACHE_TTL: float = Field(300, ge=0)
+    NEARBY_CACHE_MAX_CANDIDATES: int = Field(1000, ge=0)
+
+    # Offline road routing: OpenStreetMap extract (.osm/.osm.gz/.osm.bz2), the contracted graph built
+    # from it (.npz) and how far a coordinate may be from the nearest road node
+    ROUTING_OSM_PATH: str = str(DATA_DIR / "guwahati.osm.bz2")
+    ROUTING_GRAPH_PATH: str = str(DATA_DIR / "routing_graph.npz")
+    ROUTING_MAX_SNAP_KM: float = Field(0.5, gt=0)
+
+    # Payment reconciliation job checkpoint (JSON file)
+    RECONCILE_CHECKPOINT_PATH: str = str(DATA_DIR / "reconcile_checkpoint.json")
+
+    # HTTP caching for public catalogue endpoints (seconds)
+    HTTP_CACHE_MAX_AGE: int = Field(60, ge=0)
+
+    # Responses smaller than this (bytes) are not compressed
+    COMPRESSION_MIN_SIZE: int = Field(500, ge=0)
+
+    # Debug mode: only the string "true" (any case) turns it on, as before
+    DEBUG: bool = True
+
+    @field_validator("DEBUG", mode="before")
+    @classmethod
+    def _debug_flag(cls, value):
+        return value.lower() == "true" if isinstance(value, str) else value
+
 
-    # Debug mode
-    DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
+@lru_cache()
+def get_settings() -> Settings:
+    """Process-wide settings, read and validated on first use"""
+    return Settings()
 
 
-settings = Settings()
\ No newline at end of file
+settings = get_settings()
@@ -0,0 +1,61 @@
+"""
+Feature probes for optional integrations.
+
+A probe says whether an integration can be used here (its package is
+installed, its credentials are configured) without importing it, so modules
+import optional packages inside the functions that use them and importing
+the app does not pay for integrations that are never called.
+"""
+
+import importlib.util
+from functools import lru_cache
+from typing import Callable, Dict
+from backend.app.core.config import settings
+
+
+@lru_cache()
+def module_available(name: str) -> bool:
+    """Whether a top-level module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+def geopy_available() -> bool:
+    """geopy installed (geodesic distances in calculate_distance)"""
+    return module_available("geopy")
+
+
+def google_maps_enabled() -> bool:
+    """Google Maps key set (embedded maps, reverse geocoding)"""
+    return bool(settings.GOOGLE_MAPS_API_KEY)
+
+
+def google_translate_enabled() -> bool:
+    """Google Translate key set (otherwise only the offline translation memory answers)"""
+    return bool(settings.GOOGLE_TRANSLATE_API_KEY)
+
+
+def razorpay_enabled() -> bool:
+    """Razorpay API credentials set"""
+    return bool(settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET)
+
+
+def razorpay_webhooks_enabled() -> bool:
+    """Razorpay webhook secret set (webhooks can be verified)"""
+    return bool(settings.RAZORPAY_WEBHOOK_SECRET)
+
+
+FEATURES: Dict[str, Callable[[], bool]] = {
+    "geopy": geopy_available,
+    "google_maps": google_maps_enabled,
+    "google_translate": google_translate_enabled,
+    "razorpay": razorpay_enabled,
+    "razorpay_webhooks": razorpay_webhooks_enabled
+}
+
+
+def enabled_features() -> Dict[str, bool]:
+    """Every probe's current answer"""
+    return {name: probe() for name, probe in FEATURES.items()}
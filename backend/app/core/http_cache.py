@@ -0,0 +1,164 @@
+"""
+HTTP caching for public catalogue endpoints.
+
+Responses carry a strong ETag hashed from the body as sent, so every worker
+computes the same tag for the same content and a write seen by any worker
+changes it everywhere. A matching If-None-Match is answered with 304 Not
+Modified and the body is not sent. Compression is deterministic, so each
+content-coded representation has its own stable tag.
+
+Pre-encoded bodies (PreEncodedJSON) bring their tag, computed once when the
+body is first served, so a revalidation is answered from the response
+headers without serializing, hashing or buffering anything. Other bodies
+are buffered and hashed, which saves bandwidth but not the endpoint's work.
+
+Only routes that never answer errors with 200 belong here: a 200 error body
+would be cached publicly.
+"""
+
+import hashlib
+import re
+from typing import Iterable, List, Optional, Tuple
+from backend.app.core.config import settings
+
+# Public GET routes whose bodies only change on writes; anything else (e.g. per-user routes) is never cached
+CACHEABLE_ROUTES = (
+    f"{settings.API_V1_STR}/itineraries/",
+    f"{settings.API_V1_STR}/itineraries/featured",
+    f"{settings.API_V1_STR}/itineraries/categories",
+    f"{settings.API_V1_STR}/itineraries/clusters/{{z}}/{{x}}/{{y}}",
+    f"{settings.API_V1_STR}/support/phrasebook",
+)
+
+
+def route_pattern(routes: Iterable[str]) -> re.Pattern:
+    """Regex matching exactly the given route templates ({param} matches one path segment)"""
+    alternatives = [
+        re.sub(r"\\{\w+\\}", "[^/]+", re.escape(route))
+        for route in routes
+    ]
+    return re.compile("|".join(f"(?:{alternative})" for alternative in alternatives))
+
+
+def compute_etag(body: bytes, content_encoding: Optional[str] = None) -> str:
+    """Strong ETag of a representation (its bytes and content coding)"""
+    digest = hashlib.blake2b(digest_size=12)
+    digest.update((content_encoding or "identity").encode("latin-1") + b"\n")
+    digest.update(body)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether If-None-Match lists etag (weak comparison, as RFC 9110 requires for If-None-Match)"""
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        tag = candidate[2:] if candidate.startswith("W/") else candidate
+        if tag == etag:
+            return True
+    return False
+
+
+class HTTPCacheMiddleware:
+    """ASGI middleware adding ETag, Cache-Control and Vary to cacheable GETs"""
+
+    def __init__(
+            self,
+            app,
+            routes: Iterable[str] = CACHEABLE_ROUTES,
+            max_age: int = settings.HTTP_CACHE_MAX_AGE
+    ):
+        self.app = app
+        self.routes = route_pattern(routes)
+        self.cache_control = f"public, max-age={max_age}, stale-while-revalidate={max_age * 5}".encode("latin-1")
+
+    def _cache_headers(self, etag: str, vary: bytes = b"Accept-Encoding") -> List[Tuple[bytes, bytes]]:
+        return [
+            (b"etag", etag.encode("latin-1")),
+            (b"cache-control", self.cache_control),
+            (b"vary", vary),
+        ]
+
+    @staticmethod
+    def _vary(headers: Iterable[Tuple[bytes, bytes]]) -> bytes:
+        """The response's Vary, always including Accept-Encoding"""
+        vary = [value for key, value in headers if key == b"vary"]
+        if not any(b"accept-encoding" in value.lower() for value in vary):
+            vary.append(b"Accept-Encoding")
+        return b", ".join(vary)
+
+    @staticmethod
+    def _without_cache_headers(headers: Iterable[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+        return [(key, value) for key, value in headers if key not in (b"etag", b"cache-control", b"vary")]
+
+    @staticmethod
+    def _header(headers: Iterable[Tuple[bytes, bytes]], name: bytes) -> Optional[str]:
+        for key, value in headers:
+            if key == name:
+                return value.decode("latin-1")
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") \
+                or not self.routes.fullmatch(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        head = scope["method"] == "HEAD"
+        if_none_match = self._header(scope["headers"], b"if-none-match")
+        start_message = None
+        # "pass": send as is, "tagged": the endpoint set the ETag, "done": 304 sent, drop the body
+        mode = None
+        chunks: List[bytes] = []
+
+        async def send_with_cache_headers(message):
+            nonlocal start_message, mode
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                etag = self._header(headers, b"etag")
+                if message["status"] != 200:
+                    mode = "pass"
+                    await send(message)
+                elif etag is not None:
+                    cache_headers = self._cache_headers(etag, self._vary(headers))
+                    if if_none_match and etag_matches(if_none_match, etag):
+                        mode = "done"
+                        await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+                        await send({"type": "http.response.body", "body": b""})
+                    else:
+                        mode = "tagged"
+                        await send({**message, "headers": self._without_cache_headers(headers) + cache_headers})
+                else:
+                    # Hold the response until the whole body is known
+                    start_message = message
+                return
+            if mode == "done":
+                return
+            if mode == "tagged" and head and message["type"] == "http.response.body":
+                await send({**message, "body": b""})
+                return
+            if mode is not None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+
+            body = b"".join(chunks)
+            headers = start_message.get("headers", [])
+            etag = compute_etag(body, self._header(headers, b"content-encoding"))
+            cache_headers = self._cache_headers(etag, self._vary(headers))
+
+            if if_none_match and etag_matches(if_none_match, etag):
+                await send({"type": "http.response.start", "status": 304, "headers": cache_headers})
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send({**start_message, "headers": self._without_cache_headers(headers) + cache_headers})
+            await send({"type": "http.response.body", "body": b"" if head else body})
+
+        # HEAD runs as GET so the tag is computed from the body a GET would return
+        inner_scope = {**scope, "method": "GET"} if head else scope
+        await self.app(inner_scope, receive, send_with_cache_headers)
@@ -0,0 +1,51 @@
+from typing import Any, Dict, Optional
+from fastapi.responses import Response
+from backend.app.core.compression import compress, negotiate_encoding
+from backend.app.core.config import settings
+from backend.app.core.http_cache import compute_etag
+from backend.app.utils.helpers import to_json_bytes
+
+
+class PreEncodedJSON:
+    """Immutable JSON payload that is serialized once and served as raw bytes"""
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any):
+        self.content = content
+        self.body = to_json_bytes(content)
+        self._compressed: Dict[str, bytes] = {}
+        self._etags: Dict[Optional[str], str] = {}
+
+    def __len__(self) -> int:
+        return len(self.body)
+
+    def encoded(self, encoding: str) -> bytes:
+        """Compressed body, computed on first use and kept for the payload's lifetime"""
+        if encoding not in self._compressed:
+            self._compressed[encoding] = compress(self.body, encoding, best=True)
+        return self._compressed[encoding]
+
+    def etag(self, encoding: Optional[str] = None) -> str:
+        """Strong ETag of the body as sent with `encoding`, computed once"""
+        if encoding not in self._etags:
+            self._etags[encoding] = compute_etag(self.body if encoding is None else self.encoded(encoding), encoding)
+        return self._etags[encoding]
+
+    def response(self, accept_encoding: Optional[str] = None, status_code: int = 200) -> Response:
+        """Build a response around the pre-encoded body and its ETag (no re-serialization or re-compression)"""
+        encoding = negotiate_encoding(accept_encoding) if len(self.body) >= settings.COMPRESSION_MIN_SIZE else None
+        if encoding is None:
+            return Response(
+                content=self.body,
+                status_code=status_code,
+                media_type=self.media_type,
+                headers={"ETag": self.etag()}
+            )
+
+        return Response(
+            content=self.encoded(encoding),
+            status_code=status_code,
+            media_type=self.media_type,
+            headers={"Content-Encoding": encoding, "Vary": "Accept-Encoding", "ETag": self.etag(encoding)}
+        )
@@ -1,17 +1,35 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from backend.app.core.config import settings
+from backend.app.core.features import enabled_features
+from backend.app.core.http_cache import HTTPCacheMiddleware
+from backend.app.core.compression import CompressionMiddleware
 from backend.app.api.v1.api import api_router
+from backend.app.services.payment_gateway import get_payment_gateway
+from backend.app.services.translation_service import get_translation_service
+from backend.app.services.geocoding_service import get_geocoding_service
+from backend.app.services.webhook_queue import WebhookProcessor, get_webhook_queue
+from backend.app.utils.safety_raster import get_safety_raster
+from backend.app.api.v1.endpoints.transactions import transaction_service
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS
+# gzip/brotli negotiated by Accept-Encoding
+app.add_middleware(CompressionMiddleware)
+
+# ETag / Cache-Control for catalogue endpoints (outside compression, so it sees the final encoding)
+app.add_middleware(HTTPCacheMiddleware)
+
+# Configure CORS (outermost, so 304s from the HTTP cache carry CORS headers too)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -23,6 +41,28 @@ app.add_middleware(
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
+@app.on_event("startup")
+async def start_background_workers():
+    """Start the payment webhook workers"""
+    app.state.webhook_processor = WebhookProcessor(get_webhook_queue(), transaction_service)
+    app.state.webhook_processor.start()
+
+
+@app.on_event("startup")
+async def load_safety_raster():
+    """Load (or build and save) the safety raster before serving, off the event loop"""
+    await run_in_threadpool(get_safety_raster)
+
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Stop background workers and release pooled connections to external services"""
+    await app.state.webhook_processor.stop()
+    await get_payment_gateway().aclose()
+    await get_translation_service().aclose()
+    await get_geocoding_service().aclose()
+
+
 @app.get("/")
 async def root():
     return {
@@ -34,4 +74,4 @@ async def root():
 
 @app.get("/health")
 async def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy", "features": enabled_features()}
\ No newline at end of file
@@ -1,8 +1,29 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
 
 
+# Fields selectable through the `fields=` sparse fieldset parameter on list endpoints
+ITINERARY_LIST_FIELDS = (
+    "id",
+    "title",
+    "description",
+    "duration_minutes",
+    "category",
+    "difficulty",
+    "price_per_person",
+    "max_group_size",
+    "meeting_point",
+    "meeting_address",
+    "highlights",
+    "vendor_id",
+    "vendor",
+    "is_active",
+    "created_at",
+    "image_url",
+)
+
+
 class ItineraryStopBase(BaseModel):
     stop_order: int
     title: str
@@ -57,6 +78,27 @@ class ItineraryUpdate(BaseModel):
     meeting_address: Optional[str] = None
 
 
+class ItineraryListItem(BaseModel):
+    """Itinerary as returned by list endpoints; only the requested fields are present"""
+    id: str
+    title: Optional[str] = None
+    description: Optional[str] = None
+    duration_minutes: Optional[int] = None
+    category: Optional[str] = None
+    difficulty: Optional[str] = None
+    # Union keeps the stored type (800 stays 800), matching the pre-encoded unfiltered listing
+    price_per_person: Optional[Union[int, float]] = None
+    max_group_size: Optional[int] = None
+    meeting_point: Optional[Any] = None
+    meeting_address: Optional[str] = None
+    highlights: Optional[List[str]] = None
+    vendor_id: Optional[str] = None
+    vendor: Optional[Dict[str, Any]] = None
+    is_active: Optional[bool] = None
+    created_at: Optional[datetime] = None
+    image_url: Optional[str] = None
+
+
 class Itinerary(ItineraryBase):
     id: str
     vendor_id: str
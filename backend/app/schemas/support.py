@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+
+class Coordinates(BaseModel):
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+
+
+class NearbyBatchRequest(BaseModel):
+    origins: List[Coordinates] = Field(..., min_length=1, max_length=200)
+    kind: str = "meeting_point"
+    k: int = Field(3, ge=1, le=50)
+    radius_km: Optional[float] = Field(None, gt=0, le=50)
+    types: Optional[List[str]] = None
+
+
+class RouteAnalysisRequest(BaseModel):
+    stops: List[Coordinates] = Field(..., min_length=2, max_length=200)
+    modes: Optional[List[str]] = None
+    time_of_day: str = "day"
+    sample_km: float = Field(0.05, ge=0.01, le=1)
@@ -27,6 +27,7 @@ class Transaction(TransactionBase):
     razorpay_order_id: Optional[str] = None
     razorpay_payment_id: Optional[str] = None
     razorpay_signature: Optional[str] = None
+    idempotency_key: Optional[str] = None
     created_at: datetime
     booking: Optional[dict] = None
 
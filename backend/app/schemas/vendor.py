@@ -3,6 +3,25 @@ from typing import Optional, List
 from datetime import datetime
 
 
+# Fields selectable through the `fields=` sparse fieldset parameter on list endpoints
+VENDOR_LIST_FIELDS = (
+    "id",
+    "user_id",
+    "business_name",
+    "description",
+    "expertise",
+    "languages",
+    "experience_years",
+    "hourly_rate",
+    "verification_status",
+    "rating",
+    "total_reviews",
+    "is_available",
+    "avatar_url",
+    "created_at",
+)
+
+
 class VendorBase(BaseModel):
     business_name: str
     description: Optional[str] = None
@@ -40,6 +59,24 @@ class Vendor(VendorBase):
         from_attributes = True
 
 
+class VendorListItem(BaseModel):
+    """Vendor as returned by list endpoints; only the requested fields are present"""
+    id: str
+    user_id: Optional[str] = None
+    business_name: Optional[str] = None
+    description: Optional[str] = None
+    expertise: Optional[List[str]] = None
+    languages: Optional[List[str]] = None
+    experience_years: Optional[int] = None
+    hourly_rate: Optional[float] = None
+    verification_status: Optional[str] = None
+    rating: Optional[float] = None
+    total_reviews: Optional[int] = None
+    is_available: Optional[bool] = None
+    avatar_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
 class VendorWithStats(Vendor):
     total_bookings: int = 0
     total_revenue: float = 0.0
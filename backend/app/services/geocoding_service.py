@@ -0,0 +1,100 @@
+"""
+Cached reverse geocoding.
+
+Coordinates are quantized to a geohash cell (precision 7 is ~150m), and each
+cell is geocoded once at its center: the address is cached in memory and on
+disk, and concurrent lookups in the same cell share one upstream call. GPS
+jitter and crowds at the same landmark therefore cost one Google call.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, Optional
+import httpx
+from backend.app.core.config import settings
+from backend.app.utils.cache import MISSING, TieredCache
+from backend.app.utils.geolocation import geohash_decode, geohash_encode, mock_address, parse_geocode_result
+from backend.app.utils.singleflight import SingleFlight
+
+
+class GeocodingService:
+    """Reverse geocoding through the Google Geocoding API, cached per geohash cell"""
+
+    def __init__(
+            self,
+            api_key: str = settings.GOOGLE_MAPS_API_KEY,
+            base_url: str = settings.GOOGLE_GEOCODE_API_BASE,
+            timeout: float = settings.GEOCODE_TIMEOUT,
+            precision: int = settings.GEOCODE_PRECISION,
+            cache: Optional[TieredCache] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.precision = precision
+        self.cache = cache or TieredCache(
+            settings.GEOCODE_CACHE_PATH,
+            maxsize=settings.GEOCODE_CACHE_SIZE,
+            ttl=settings.GEOCODE_CACHE_TTL_DAYS * 24 * 3600,
+            table="reverse_geocode"
+        )
+        self._flights = SingleFlight()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created on first use inside the running loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 3.0)),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def reverse_geocode(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """Address for coordinates, or None when it can't be resolved"""
+        if not self.api_key:
+            # Return mock address for development
+            return mock_address(lat, lng)
+
+        cell = geohash_encode(lat, lng, self.precision)
+        cached = self.cache.get(cell)
+        if cached is not MISSING:
+            return cached
+
+        return await self._flights.do(cell, lambda: self._fetch_address(cell))
+
+    async def _fetch_address(self, cell: str) -> Optional[Dict[str, Any]]:
+        lat, lng = geohash_decode(cell)
+        try:
+            response = await self.client.get(
+                self.base_url,
+                params={"latlng": f"{lat:.6f},{lng:.6f}", "key": self.api_key}
+            )
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            print(f"Error reverse geocoding: {e}")
+            return None
+
+        if data.get("status") == "OK" and data.get("results"):
+            address = parse_geocode_result(data["results"][0])
+        elif data.get("status") == "ZERO_RESULTS":
+            # Nothing there (e.g. mid-river): remembered, so the cell isn't asked again
+            address = None
+        else:
+            print(f"Error reverse geocoding: {data.get('status')} {data.get('error_message', '')}")
+            return None
+
+        self.cache.set(cell, address)
+        return address
+
+
+@lru_cache()
+def get_geocoding_service() -> GeocodingService:
+    """Process-wide geocoder, so callers share the connection pool and cache"""
+    return GeocodingService()
@@ -0,0 +1,63 @@
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from backend.app.core.responses import PreEncodedJSON
+from backend.app.services.map_clusters import PinClusterer
+from backend.app.utils.helpers import project_fields
+
+
+class ItineraryCatalogue:
+    """In-memory itinerary catalogue with O(1) id/category lookups and pre-encoded bodies"""
+
+    MAX_CACHED_PAGES = 128
+
+    def __init__(self, itineraries: Iterable[Dict[str, Any]] = ()):
+        # Map clusters of meeting points, updated in place (only changed pins) on every load
+        self.clusters = PinClusterer()
+        self.load(itineraries)
+
+    def load(self, itineraries: Iterable[Dict[str, Any]]):
+        """Replace the data source and rebuild every index derived from it"""
+        self.itineraries: List[Dict[str, Any]] = list(itineraries)
+        self.by_id: Dict[str, Dict[str, Any]] = {i["id"]: i for i in self.itineraries}
+
+        self.by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for itinerary in self.itineraries:
+            self.by_category.setdefault(itinerary["category"], []).append(itinerary)
+        self.categories: List[str] = sorted(self.by_category)
+
+        self.bodies: Dict[str, PreEncodedJSON] = {i["id"]: PreEncodedJSON(i) for i in self.itineraries}
+        self.categories_body = PreEncodedJSON({"categories": self.categories})
+        self._pages: Dict[Tuple[int, int, Optional[Tuple[str, ...]]], PreEncodedJSON] = {}
+        self.clusters.sync(self.itineraries)
+
+    def __len__(self) -> int:
+        return len(self.itineraries)
+
+    def get(self, itinerary_id: str) -> Optional[Dict[str, Any]]:
+        return self.by_id.get(itinerary_id)
+
+    def body(self, itinerary_id: str) -> Optional[PreEncodedJSON]:
+        return self.bodies.get(itinerary_id)
+
+    def page(self, offset: int, limit: int, fields: Optional[Tuple[str, ...]] = None) -> PreEncodedJSON:
+        """Pre-encoded unfiltered page, built once per (offset, limit, fields)"""
+        key = (offset, limit, fields)
+        page = self._pages.get(key)
+        if page is None:
+            if len(self._pages) >= self.MAX_CACHED_PAGES:
+                self._pages.clear()
+            page = PreEncodedJSON([project_fields(i, fields) for i in self.itineraries[offset:offset + limit]])
+            self._pages[key] = page
+        return page
+
+    def filter(self, category: Optional[str] = None, search: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Itineraries in a category and/or matching a title/description search"""
+        filtered = self.by_category.get(category, []) if category else self.itineraries
+
+        if search:
+            search_lower = search.lower()
+            filtered = [
+                i for i in filtered
+                if search_lower in i["title"].lower() or search_lower in i["description"].lower()
+            ]
+
+        return filtered
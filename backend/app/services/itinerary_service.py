@@ -1,13 +1,83 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import datetime
+import base64
+import binascii
 from supabase import create_client
 from backend.app.core.config import settings
 import json
 
-# In itinerary_service.py
-from backend.app.utils.geolocation import calculate_distance, get_safe_meeting_points
-
-
+from backend.app.services.nearby_cache import get_nearby_cache
+
+# Rows per search_itineraries call when loading every itinerary in a circle
+NEARBY_PAGE_SIZE = 200
+
+
+def encode_search_cursor(row: Dict[str, Any], geo: bool) -> str:
+    """Opaque keyset cursor after a search_itineraries row (distance for radius searches, else created_at)"""
+    position = {"geo": geo, "id": row["id"]}
+    if geo:
+        position["distance_m"] = row["distance_m"]
+    else:
+        position["created_at"] = row["created_at"]
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str, geo: bool) -> Dict[str, Any]:
+    """
+    RPC parameters of a cursor from encode_search_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or from a different kind of search
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if position["geo"] != geo:
+            raise ValueError("Cursor belongs to a search with a different location filter")
+        if geo:
+            return {"p_after_distance_m": float(position["distance_m"]), "p_after_id": str(position["id"])}
+        return {"p_after_created_at": str(position["created_at"]), "p_after_id": str(position["id"])}
+    except (KeyError, TypeError, json.JSONDecodeError, UnicodeDecodeError, binascii.Error) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def search_params(
+        category: Optional[str] = None,
+        duration_min: Optional[int] = None,
+        duration_max: Optional[int] = None,
+        price_max: Optional[float] = None,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        radius_km: float = 5,
+        search: Optional[str] = None,
+        limit: int = 10,
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        fields: Optional[Tuple[str, ...]] = None
+) -> Dict[str, Any]:
+    """
+    Parameters of the search_itineraries RPC (sql/search_itineraries.sql)
+
+    Only filters that are set are sent; the function emits a predicate for
+    each of them, so 0 is a real value and not "unset".
+    """
+    geo = latitude is not None and longitude is not None
+    params: Dict[str, Any] = {"p_limit": limit, "p_offset": offset}
+    optional = {
+        "p_category": category,
+        "p_duration_min": duration_min,
+        "p_duration_max": duration_max,
+        "p_price_max": price_max,
+        "p_search": search,
+        "p_fields": list(fields) if fields else None
+    }
+    params.update({name: value for name, value in optional.items() if value is not None})
+    if geo:
+        params.update({"p_lat": latitude, "p_lng": longitude, "p_radius_m": radius_km * 1000})
+    if cursor is not None:
+        params.update(decode_search_cursor(cursor, geo))
+        # Keyset pages replace offsets
+        params["p_offset"] = 0
+    return params
 
 
 class ItineraryService:
@@ -17,22 +87,101 @@ class ItineraryService:
             settings.SUPABASE_KEY
         )
 
-    def get_nearby_itineraries(self, lat: float, lng: float, radius_km: float = 5):
-        """Get itineraries within radius"""
-        nearby = []
-        for itinerary in self.itineraries:
-            distance = calculate_distance(
-                (lat, lng),
-                (itinerary["meeting_point"]["lat"], itinerary["meeting_point"]["lng"])
+    async def get_nearby_itineraries(
+            self,
+            lat: float,
+            lng: float,
+            radius_km: float = 5,
+            category: Optional[str] = None,
+            duration_min: Optional[int] = None,
+            duration_max: Optional[int] = None,
+            price_max: Optional[float] = None,
+            search: Optional[str] = None,
+            fields: Optional[Tuple[str, ...]] = None,
+            limit: int = 10,
+            cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Itineraries within radius, nearest first, one keyset page at a time
+
+        A first page that holds the whole answer is served from the nearby
+        cache for hot locations; anything else is one search_itineraries page.
+
+        Returns:
+            Dictionary with "items" and "next_cursor" (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        filters = {
+            "category": category,
+            "duration_min": duration_min,
+            "duration_max": duration_max,
+            "price_max": price_max,
+            "search": search,
+            "fields": fields
+        }
+        if cursor is None:
+            nearby = await self._cached_nearby(lat, lng, radius_km, filters)
+            if nearby is not None and len(nearby) <= limit:
+                return {"items": nearby, "next_cursor": None}
+        return await self.search_itineraries(
+            latitude=lat, longitude=lng, radius_km=radius_km, limit=limit, cursor=cursor, **filters
+        )
+
+    async def _cached_nearby(
+            self,
+            lat: float,
+            lng: float,
+            radius_km: float,
+            filters: Dict[str, Any]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Nearby itineraries from the cache, or None if they can't be cached"""
+        fields = filters.get("fields")
+        # Candidates must carry their location (and id) for the per-request refinement
+        extra = tuple(name for name in ("id", "meeting_point") if fields and name not in fields)
+        candidate_filters = dict(filters, fields=tuple(fields) + extra if fields else None)
+
+        async def fetch(center_lat: float, center_lng: float, candidate_radius_km: float,
+                        fetch_filters: Dict[str, Any]):
+            return await self._all_nearby(
+                center_lat, center_lng, candidate_radius_km, fetch_filters,
+                max_items=settings.NEARBY_CACHE_MAX_CANDIDATES
             )
-            if distance <= radius_km:
-                itinerary["distance_km"] = round(distance, 2)
-                nearby.append(itinerary)
 
-        return sorted(nearby, key=lambda x: x["distance_km"])
+        nearby = await get_nearby_cache().nearby(lat, lng, radius_km, candidate_filters, fetch)
+        if nearby is not None and extra:
+            nearby = [{name: value for name, value in item.items() if name not in extra} for item in nearby]
+        return nearby
 
+    async def _all_nearby(
+            self,
+            lat: float,
+            lng: float,
+            radius_km: float,
+            filters: Dict[str, Any],
+            max_items: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Every matching itinerary within radius (None if there are more than max_items or the query fails)"""
+        items, cursor = [], None
+        try:
+            while True:
+                params = search_params(
+                    latitude=lat, longitude=lng, radius_km=radius_km, limit=NEARBY_PAGE_SIZE, cursor=cursor, **filters
+                )
+                result = self._search_page(params, True, NEARBY_PAGE_SIZE)
+                items.extend(result["items"])
+                cursor = result["next_cursor"]
+                if cursor is None:
+                    return items
+                if len(items) >= max_items:
+                    return None
+        except Exception as e:
+            # Nothing is cached; the request falls back to one search_itineraries page
+            print(f"Error loading nearby itineraries: {e}")
+            return None
 
-    async def get_itineraries(
+    async def search_itineraries(
             self,
             category: Optional[str] = None,
             duration_min: Optional[int] = None,
@@ -43,54 +192,90 @@ class ItineraryService:
             radius_km: float = 5,
             search: Optional[str] = None,
             limit: int = 10,
-            offset: int = 0
-    ) -> List[Dict[str, Any]]:
-        """Get filtered itineraries"""
-        query = self.supabase.table("itineraries").select("*")
-
-        # Apply filters
-        query = query.eq("is_active", True)
-
-        if category:
-            query = query.eq("category", category)
-        if duration_min:
-            query = query.gte("duration_minutes", duration_min)
-        if duration_max:
-            query = query.lte("duration_minutes", duration_max)
-        if price_max:
-            query = query.lte("price_per_person", price_max)
-        if search:
-            query = query.ilike("title", f"%{search}%")
-
-        # Apply location filter if coordinates provided
-        if latitude and longitude:
-            # Use PostGIS for location-based search
-            location_query = f"""
-            SELECT *, 
-                ST_Distance(
-                    meeting_point::geography,
-                    ST_SetSRID(ST_MakePoint({longitude}, {latitude}), 4326)::geography
-                ) / 1000 as distance_km
-            FROM itineraries
-            WHERE ST_DWithin(
-                meeting_point::geography,
-                ST_SetSRID(ST_MakePoint({longitude}, {latitude}), 4326)::geography,
-                {radius_km * 1000}
-            )
-            AND is_active = true
-            ORDER BY distance_km
-            LIMIT {limit} OFFSET {offset};
-            """
+            offset: int = 0,
+            cursor: Optional[str] = None,
+            fields: Optional[Tuple[str, ...]] = None
+    ) -> Dict[str, Any]:
+        """
+        Filtered itineraries in one database statement, with keyset pagination
 
-            response = self.supabase.rpc('exec_sql', {'query': location_query}).execute()
-            return response.data if hasattr(response, 'data') else []
+        Nearest first when latitude and longitude are given (within radius_km),
+        otherwise newest first. Pass the returned next_cursor to get the next page.
+
+        Returns:
+            Dictionary with "items" and "next_cursor" (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        geo = latitude is not None and longitude is not None
+        params = search_params(
+            category, duration_min, duration_max, price_max, latitude, longitude,
+            radius_km, search, limit, offset, cursor, fields
+        )
+        try:
+            return self._search_page(params, geo, limit)
+        except Exception as e:
+            print(f"Error searching itineraries: {e}")
+            return {"items": [], "next_cursor": None}
 
-        # Apply pagination
-        query = query.order("created_at", desc=True)
-        query = query.range(offset, offset + limit - 1)
+    def _search_page(self, params: Dict[str, Any], geo: bool, limit: int) -> Dict[str, Any]:
+        """One search_itineraries RPC call, as a page of items"""
+        response = self.supabase.rpc("search_itineraries", params).execute()
+        rows = response.data or []
 
-        response = query.execute()
-        return response.data
+        items = []
+        for row in rows:
+            item = row["item"]
+            if geo:
+                item["distance_km"] = round(row["distance_m"] / 1000, 2)
+            items.append(item)
+
+        next_cursor = encode_search_cursor(rows[-1], geo) if len(rows) == limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    async def get_itineraries(
+            self,
+            category: Optional[str] = None,
+            duration_min: Optional[int] = None,
+            duration_max: Optional[int] = None,
+            price_max: Optional[float] = None,
+            latitude: Optional[float] = None,
+            longitude: Optional[float] = None,
+            radius_km: float = 5,
+            search: Optional[str] = None,
+            limit: int = 10,
+            offset: int = 0,
+            fields: Optional[Tuple[str, ...]] = None
+    ) -> List[Dict[str, Any]]:
+        """Get filtered itineraries (only `fields` are read when a sparse fieldset is given)"""
+        if latitude is not None and longitude is not None:
+            filters = {
+                "category": category,
+                "duration_min": duration_min,
+                "duration_max": duration_max,
+                "price_max": price_max,
+                "search": search,
+                "fields": fields
+            }
+            nearby = await self._cached_nearby(latitude, longitude, radius_km, filters)
+            if nearby is not None:
+                return nearby[offset:offset + limit]
+
+        result = await self.search_itineraries(
+            category=category,
+            duration_min=duration_min,
+            duration_max=duration_max,
+            price_max=price_max,
+            latitude=latitude,
+            longitude=longitude,
+            radius_km=radius_km,
+            search=search,
+            limit=limit,
+            offset=offset,
+            fields=fields
+        )
+        return result["items"]
 
     async def get_itinerary_by_id(self, itinerary_id: str) -> Optional[Dict[str, Any]]:
         """Get itinerary by ID with stops and vendor details"""
@@ -140,6 +325,11 @@ class ItineraryService:
                 .insert(itinerary_data) \
                 .execute()
 
+            if response.data:
+                created = response.data[0]
+                get_nearby_cache().invalidate_itinerary(
+                    created["id"], itinerary_data.get("meeting_point") or created.get("meeting_point")
+                )
             return response.data[0] if response.data else None
         except Exception as e:
             print(f"Error creating itinerary: {e}")
@@ -157,6 +347,11 @@ class ItineraryService:
                 .eq("id", itinerary_id) \
                 .execute()
 
+            if response.data:
+                # Entries that held it (old location) and entries covering where it is now
+                get_nearby_cache().invalidate_itinerary(
+                    itinerary_id, update_data.get("meeting_point") or response.data[0].get("meeting_point")
+                )
             return response.data[0] if response.data else None
         except Exception as e:
             print(f"Error updating itinerary: {e}")
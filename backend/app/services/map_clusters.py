@@ -0,0 +1,183 @@
+"""
+Grid clustering of itinerary meeting points for z/x/y map tiles.
+
+Every zoom level up to CLUSTER_MAX_ZOOM splits each tile into a grid of
+CLUSTER_CELLS_PER_TILE x CLUSTER_CELLS_PER_TILE cells (Web Mercator) and keeps,
+per occupied cell, the pin count, the sum of positions (for the centroid) and
+the member ids. Adding, moving or removing a pin touches one cell per zoom
+and drops only the cached tiles containing those cells, so catalogue changes
+never trigger a full rebuild. A tile is then a read of its own cells.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from backend.app.core.config import settings
+from backend.app.core.responses import PreEncodedJSON
+from backend.app.utils.geolocation import mercator_project, mercator_unproject
+
+# Fields of an itinerary shown on a single pin
+PIN_FIELDS = ("title", "category")
+
+
+class _Cell:
+    __slots__ = ("count", "sum_x", "sum_y", "ids")
+
+    def __init__(self):
+        self.count = 0
+        self.sum_x = 0.0
+        self.sum_y = 0.0
+        self.ids: Dict[str, None] = {}  # Insertion-ordered set
+
+
+class PinClusterer:
+    """Per-zoom grid clusters of map pins, served per z/x/y tile"""
+
+    MAX_CACHED_TILES = 4096
+
+    def __init__(self, max_zoom: int = settings.CLUSTER_MAX_ZOOM,
+                 cells_per_tile: int = settings.CLUSTER_CELLS_PER_TILE):
+        self.max_zoom = max_zoom
+        self.cells_per_tile = cells_per_tile
+        self.levels: List[Dict[Tuple[int, int], _Cell]] = [{} for _ in range(max_zoom + 1)]
+        self.pins: Dict[str, Dict[str, Any]] = {}
+        self._positions: Dict[str, Tuple[float, float]] = {}
+        self._tiles: Dict[Tuple[int, int, int], PreEncodedJSON] = {}
+
+    def __len__(self) -> int:
+        return len(self.pins)
+
+    def _cell_key(self, x: float, y: float, zoom: int) -> Tuple[int, int]:
+        scale = (1 << zoom) * self.cells_per_tile
+        return min(int(x * scale), scale - 1), min(int(y * scale), scale - 1)
+
+    def _update(self, pin_id: str, x: float, y: float, sign: int):
+        for zoom, level in enumerate(self.levels):
+            key = self._cell_key(x, y, zoom)
+            cell = level.get(key)
+            if cell is None:
+                cell = level[key] = _Cell()
+            cell.count += sign
+            cell.sum_x += sign * x
+            cell.sum_y += sign * y
+            if sign > 0:
+                cell.ids[pin_id] = None
+            else:
+                cell.ids.pop(pin_id, None)
+                if not cell.count:
+                    del level[key]
+            self._tiles.pop((zoom, key[0] // self.cells_per_tile, key[1] // self.cells_per_tile), None)
+
+    # Updates
+
+    def add(self, pin_id: str, lat: float, lng: float, **details):
+        """Add a pin, or move and update it if the id is already present"""
+        if pin_id in self.pins:
+            self.remove(pin_id)
+        x, y = mercator_project(lat, lng)
+        self.pins[pin_id] = {"id": pin_id, "lat": lat, "lng": lng, **details}
+        self._positions[pin_id] = (x, y)
+        self._update(pin_id, x, y, 1)
+
+    def remove(self, pin_id: str) -> bool:
+        if pin_id not in self.pins:
+            return False
+        x, y = self._positions.pop(pin_id)
+        del self.pins[pin_id]
+        self._update(pin_id, x, y, -1)
+        return True
+
+    def sync(self, itineraries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Match the pins to the itineraries' meeting points, touching only what changed
+
+        Returns:
+            Number of pins added, moved, updated or removed
+        """
+        wanted = {}
+        for itinerary in itineraries:
+            point = itinerary.get("meeting_point")
+            if not isinstance(point, dict) or point.get("lat") is None or point.get("lng") is None:
+                continue
+            wanted[itinerary["id"]] = {
+                "id": itinerary["id"], "lat": point["lat"], "lng": point["lng"],
+                **{name: itinerary.get(name) for name in PIN_FIELDS}
+            }
+
+        changes = 0
+        for pin_id in [pin_id for pin_id in self.pins if pin_id not in wanted]:
+            self.remove(pin_id)
+            changes += 1
+        for pin_id, pin in wanted.items():
+            if self.pins.get(pin_id) != pin:
+                details = {name: pin[name] for name in PIN_FIELDS}
+                self.add(pin_id, pin["lat"], pin["lng"], **details)
+                changes += 1
+        return changes
+
+    # Queries
+
+    def _expansion_zoom(self, zoom: int, key: Tuple[int, int]) -> Optional[int]:
+        """Zoom at which a cluster first splits (None if it never does up to max_zoom)"""
+        cx, cy = key
+        for child_zoom in range(zoom + 1, self.max_zoom + 1):
+            level = self.levels[child_zoom]
+            children = [
+                (x, y) for x in (2 * cx, 2 * cx + 1) for y in (2 * cy, 2 * cy + 1) if (x, y) in level
+            ]
+            if len(children) > 1:
+                return child_zoom
+            cx, cy = children[0]
+        return None
+
+    def tile(self, zoom: int, x: int, y: int) -> Dict[str, Any]:
+        """
+        Clusters and single pins in a map tile
+
+        Returns:
+            Dictionary with "clusters" (lat, lng, count and the zoom at which
+            the cluster splits) and "pins" (single itineraries)
+        """
+        clusters, pins = [], []
+        if zoom > self.max_zoom:
+            # Past the deepest level every pin is shown: filter the pins of the covering cells
+            shift = zoom - self.max_zoom
+            scale = 1 << zoom
+            for _, cell in self._cells_in_tile(self.max_zoom, x >> shift, y >> shift):
+                for pin_id in cell.ids:
+                    px, py = self._positions[pin_id]
+                    if int(px * scale) == x and int(py * scale) == y:
+                        pins.append(self.pins[pin_id])
+            return {"z": zoom, "x": x, "y": y, "clusters": clusters, "pins": pins}
+
+        for key, cell in self._cells_in_tile(zoom, x, y):
+            if cell.count == 1:
+                pins.append(self.pins[next(iter(cell.ids))])
+                continue
+            lat, lng = mercator_unproject(cell.sum_x / cell.count, cell.sum_y / cell.count)
+            clusters.append({
+                "lat": round(lat, 6),
+                "lng": round(lng, 6),
+                "count": cell.count,
+                "expansion_zoom": self._expansion_zoom(zoom, key)
+            })
+        return {"z": zoom, "x": x, "y": y, "clusters": clusters, "pins": pins}
+
+    def _cells_in_tile(self, zoom: int, x: int, y: int) -> Iterable[Tuple[Tuple[int, int], _Cell]]:
+        level = self.levels[zoom]
+        start_x, start_y = x * self.cells_per_tile, y * self.cells_per_tile
+        for cx in range(start_x, start_x + self.cells_per_tile):
+            for cy in range(start_y, start_y + self.cells_per_tile):
+                cell = level.get((cx, cy))
+                if cell is not None:
+                    yield (cx, cy), cell
+
+    def tile_body(self, zoom: int, x: int, y: int) -> PreEncodedJSON:
+        """Pre-encoded tile, kept until a pin inside it changes (zooms up to max_zoom)"""
+        key = (zoom, x, y)
+        body = self._tiles.get(key)
+        if body is None:
+            body = PreEncodedJSON(self.tile(zoom, x, y))
+            if zoom <= self.max_zoom:
+                if len(self._tiles) >= self.MAX_CACHED_TILES:
+                    self._tiles.clear()
+                self._tiles[key] = body
+        return body
@@ -0,0 +1,282 @@
+"""
+Cache of nearby-itinerary results for hot locations.
+
+Nearby requests cluster around a few hotspots (Kamakhya gate, Kachari Ghat,
+Pan Bazaar, the railway station), each asked from slightly different
+coordinates. Entries are keyed by (geohash cell of the origin, radius bucket,
+filters) and hold every itinerary within the bucket radius of anywhere in
+the cell, so each request is answered by filtering that candidate set by its
+exact distance. Itinerary writes drop only the entries whose candidate
+circle contains the written meeting point (or that held the itinerary).
+
+Entries live in process memory; NEARBY_CACHE_TTL bounds how long a write
+made through another process can go unseen.
+"""
+
+import re
+import struct
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.utils.geolocation import geohash_bounds, geohash_decode, geohash_encode, haversine_array, \
+    haversine_distance
+from backend.app.utils.singleflight import SingleFlight
+
+# Requested radii are rounded up to one of these (km); larger radii are not cached
+RADIUS_BUCKETS_KM = (1, 2, 3, 5, 10, 25)
+
+WKT_POINT = re.compile(r"POINT\s*\(\s*(-?[\d.]+)\s+(-?[\d.]+)\s*\)", re.IGNORECASE)
+HEX_DIGITS = re.compile(r"[0-9a-fA-F]+")
+
+# (E)WKB geometry type of a point, and the flag marking an embedded SRID
+WKB_POINT = 1
+EWKB_SRID_FLAG = 0x20000000
+
+# fetch(lat, lng, radius_km, filters) -> every matching itinerary in the circle, or None if too many
+Fetch = Callable[[float, float, float, Dict[str, Any]], Awaitable[Optional[List[Dict[str, Any]]]]]
+
+
+def radius_bucket(radius_km: float) -> Optional[float]:
+    """Smallest bucket covering radius_km, or None if it is larger than every bucket"""
+    for bucket in RADIUS_BUCKETS_KM:
+        if radius_km <= bucket:
+            return bucket
+    return None
+
+
+def meeting_point_coordinates(value: Any) -> Optional[Tuple[float, float]]:
+    """
+    (lat, lng) of a meeting point as stored or returned by the database
+
+    Accepts {"lat", "lng"} dicts, GeoJSON points, WKT/EWKT "POINT(lng lat)"
+    strings and hex (E)WKB (how PostgREST returns geometry columns); None for
+    anything else.
+    """
+    if isinstance(value, dict):
+        if value.get("lat") is not None and value.get("lng") is not None:
+            return float(value["lat"]), float(value["lng"])
+        if value.get("type") == "Point" and len(value.get("coordinates") or ()) >= 2:
+            lng, lat = value["coordinates"][:2]
+            return float(lat), float(lng)
+    elif isinstance(value, str):
+        match = WKT_POINT.search(value)
+        if match:
+            return float(match.group(2)), float(match.group(1))
+        if HEX_DIGITS.fullmatch(value) and len(value) >= 42:
+            return _wkb_point(bytes.fromhex(value))
+    return None
+
+
+def _wkb_point(wkb: bytes) -> Optional[Tuple[float, float]]:
+    order = "<" if wkb[0] == 1 else ">"
+    geometry_type = struct.unpack_from(order + "I", wkb, 1)[0]
+    offset = 9 if geometry_type & EWKB_SRID_FLAG else 5
+    if geometry_type & 0xFF != WKB_POINT or len(wkb) < offset + 16:
+        return None
+    lng, lat = struct.unpack_from(order + "dd", wkb, offset)
+    return lat, lng
+
+
+@dataclass
+class _Entry:
+    cell: str
+    center: Tuple[float, float]
+    radius_km: float  # Bucket radius plus the cell's half-diagonal
+    coords: np.ndarray  # (n, 2) lat, lng of the candidates
+    items: List[Dict[str, Any]]
+    ids: Set[str]
+    expires_at: float
+
+
+class NearbyCache:
+    """Nearby results per (geohash cell, radius bucket, filters), refined per request"""
+
+    def __init__(
+            self,
+            precision: int = settings.NEARBY_CACHE_PRECISION,
+            maxsize: int = settings.NEARBY_CACHE_SIZE,
+            ttl: float = settings.NEARBY_CACHE_TTL
+    ):
+        self.precision = precision
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._by_cell: Dict[str, Set[Hashable]] = {}
+        self._by_id: Dict[str, Set[Hashable]] = {}
+        self._flights = SingleFlight()
+        # Bumped by every invalidation, so a fetch that raced a write is not stored
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def key(self, lat: float, lng: float, radius_km: float, filters: Dict[str, Any]) -> Optional[Hashable]:
+        bucket = radius_bucket(radius_km)
+        if bucket is None:
+            return None
+        filter_key = tuple(sorted(
+            (name, tuple(value) if isinstance(value, (list, tuple)) else value)
+            for name, value in filters.items() if value is not None
+        ))
+        return geohash_encode(lat, lng, self.precision), bucket, filter_key
+
+    async def nearby(
+            self,
+            lat: float,
+            lng: float,
+            radius_km: float,
+            filters: Dict[str, Any],
+            fetch: Fetch
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Itineraries within radius_km of (lat, lng), nearest first, with distance_km
+
+        Args:
+            filters: Other search filters (part of the cache key, passed to fetch)
+            fetch: Loads the candidates of a missing entry
+
+        Returns:
+            The results, or None when they can't come from the cache (radius
+            beyond the largest bucket, or too many candidates); query directly then
+        """
+        key = self.key(lat, lng, radius_km, filters)
+        if key is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(key)
+            self.hits += 1
+        else:
+            self.misses += 1
+            entry = await self._flights.do(key, lambda: self._load(key, filters, fetch))
+            if entry is None:
+                return None
+        return self._refine(entry, lat, lng, radius_km)
+
+    async def _load(self, key: Hashable, filters: Dict[str, Any], fetch: Fetch) -> Optional[_Entry]:
+        cell, bucket, _ = key
+        bounds = geohash_bounds(cell)
+        center = geohash_decode(cell)
+        half_diagonal = max(
+            haversine_distance(center[0], center[1], lat, lng)
+            for lat in (bounds["north"], bounds["south"]) for lng in (bounds["east"], bounds["west"])
+        )
+        radius_km = bucket + half_diagonal
+
+        generation = self._generation
+        items = await fetch(center[0], center[1], radius_km, filters)
+        if items is None:
+            return None
+
+        coords, kept = [], []
+        for item in items:
+            point = meeting_point_coordinates(item.get("meeting_point"))
+            if point is not None:
+                coords.append(point)
+                kept.append(item)
+        entry = _Entry(
+            cell=cell,
+            center=center,
+            radius_km=radius_km,
+            coords=np.asarray(coords, dtype=np.float64).reshape(-1, 2),
+            items=kept,
+            ids={str(item["id"]) for item in kept},
+            expires_at=time.monotonic() + self.ttl
+        )
+        if generation == self._generation:
+            self._store(key, entry)
+        return entry
+
+    def _store(self, key: Hashable, entry: _Entry):
+        if key in self._entries:
+            self._drop(key)
+        while len(self._entries) >= self.maxsize:
+            self._drop(next(iter(self._entries)))
+        self._entries[key] = entry
+        self._by_cell.setdefault(entry.cell, set()).add(key)
+        for itinerary_id in entry.ids:
+            self._by_id.setdefault(itinerary_id, set()).add(key)
+
+    def _drop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._by_cell.get(entry.cell)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_cell[entry.cell]
+        for itinerary_id in entry.ids:
+            keys = self._by_id.get(itinerary_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_id[itinerary_id]
+
+    @staticmethod
+    def _refine(entry: _Entry, lat: float, lng: float, radius_km: float) -> List[Dict[str, Any]]:
+        if not entry.items:
+            return []
+        distances = haversine_array(lat, lng, entry.coords[:, 0], entry.coords[:, 1])
+        inside = np.flatnonzero(distances <= radius_km)
+        order = inside[np.argsort(distances[inside], kind="stable")]
+        return [{**entry.items[i], "distance_km": round(float(distances[i]), 2)} for i in order.tolist()]
+
+    # Invalidation
+
+    def invalidate_point(self, lat: float, lng: float) -> int:
+        """
+        Drop the entries whose candidate circle contains a meeting point
+
+        Returns:
+            Number of entries dropped
+        """
+        self._generation += 1
+        dropped = 0
+        for cell in list(self._by_cell):
+            keys = self._by_cell.get(cell, set())
+            if not keys:
+                continue
+            center = self._entries[next(iter(keys))].center
+            distance = haversine_distance(lat, lng, center[0], center[1])
+            for key in list(keys):
+                if distance <= self._entries[key].radius_km:
+                    self._drop(key)
+                    dropped += 1
+        return dropped
+
+    def invalidate_itinerary(self, itinerary_id: str, meeting_point: Any = None) -> int:
+        """
+        Drop the entries holding an itinerary, and those covering its (new) meeting point
+
+        Returns:
+            Number of entries dropped
+        """
+        self._generation += 1
+        keys = self._by_id.get(str(itinerary_id), set())
+        dropped = len(keys)
+        for key in list(keys):
+            self._drop(key)
+        point = meeting_point_coordinates(meeting_point)
+        if point is not None:
+            dropped += self.invalidate_point(*point)
+        return dropped
+
+    def clear(self):
+        self._generation += 1
+        self._entries.clear()
+        self._by_cell.clear()
+        self._by_id.clear()
+
+
+@lru_cache()
+def get_nearby_cache() -> NearbyCache:
+    """Process-wide nearby cache"""
+    return NearbyCache()
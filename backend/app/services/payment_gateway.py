@@ -0,0 +1,226 @@
+"""
+Async Razorpay gateway adapter.
+
+Talks to the Razorpay REST API through one pooled httpx.AsyncClient so payment
+calls never block the event loop. Every call has a timeout, transient failures
+are retried with jittered exponential backoff, and a circuit breaker stops
+hammering the gateway while it is down.
+"""
+
+import asyncio
+import random
+import time
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+import httpx
+from backend.app.core.config import settings
+
+
+class PaymentGatewayError(Exception):
+    """Gateway call failed (after retries, if the call was retryable)"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        self.status_code = status_code
+        super().__init__(message)
+
+
+class CircuitOpenError(PaymentGatewayError):
+    """Gateway calls are short-circuited until the breaker's reset timeout passes"""
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker (closed -> open -> half-open)"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        # When the half-open trial call was admitted (None: no trial in flight)
+        self.probe_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        """
+        Closed lets every call through; half-open admits exactly one trial call
+        and rejects the rest until it succeeds or fails
+
+        A trial that never reports back (e.g. cancelled) is written off after
+        reset_timeout, so another one can be admitted.
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open":
+            return False
+        now = time.monotonic()
+        if self.probe_started_at is not None and now - self.probe_started_at < self.reset_timeout:
+            return False
+        self.probe_started_at = now
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.probe_started_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self.probe_started_at = None
+
+
+class RazorpayGateway:
+    """Non-blocking Razorpay API client"""
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+            self,
+            key_id: str = settings.RAZORPAY_KEY_ID,
+            key_secret: str = settings.RAZORPAY_KEY_SECRET,
+            base_url: str = settings.RAZORPAY_API_BASE,
+            timeout: float = settings.PAYMENT_GATEWAY_TIMEOUT,
+            max_retries: int = settings.PAYMENT_GATEWAY_MAX_RETRIES,
+            backoff_base: float = 0.2,
+            breaker: Optional[CircuitBreaker] = None
+    ):
+        self.key_id = key_id
+        self.key_secret = key_secret
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.breaker = breaker or CircuitBreaker()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created on first use inside the running loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                auth=(self.key_id, self.key_secret),
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 3.0)),
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, self.backoff_base * (2 ** attempt))
+
+    async def _request(
+            self,
+            method: str,
+            path: str,
+            idempotent: bool = True,
+            timeout: Optional[float] = None,
+            **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Send a request with retries and circuit breaking
+
+        Non-idempotent calls (e.g. order creation) are only retried when the
+        request provably never reached the gateway (connection failures).
+        """
+        if not self.breaker.allow():
+            raise CircuitOpenError("Payment gateway circuit is open")
+
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        last_error: Optional[PaymentGatewayError] = None
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout) as e:
+                last_error = PaymentGatewayError(f"Gateway unreachable: {e}")
+            except httpx.TransportError as e:
+                last_error = PaymentGatewayError(f"Gateway transport error: {e}")
+                if not idempotent:
+                    self.breaker.record_failure()
+                    raise last_error
+            else:
+                if response.status_code < 400:
+                    self.breaker.record_success()
+                    return response.json()
+
+                detail = response.text[:200]
+                if response.status_code not in self.RETRY_STATUSES:
+                    # Client errors are our fault, not the gateway's: don't trip the breaker
+                    self.breaker.record_success()
+                    raise PaymentGatewayError(f"Gateway error {response.status_code}: {detail}",
+                                              response.status_code)
+
+                last_error = PaymentGatewayError(f"Gateway error {response.status_code}: {detail}",
+                                                 response.status_code)
+                if not idempotent:
+                    self.breaker.record_failure()
+                    raise last_error
+
+            if attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt))
+
+        self.breaker.record_failure()
+        raise last_error
+
+    async def create_order(self, order_data: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self._request("POST", "/orders", idempotent=False, json=order_data, timeout=timeout)
+
+    async def fetch_order(self, order_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        return await self._request("GET", f"/orders/{order_id}", timeout=timeout)
+
+    async def list_orders(
+            self,
+            count: int = 100,
+            skip: int = 0,
+            created_from: Optional[int] = None,
+            created_to: Optional[int] = None,
+            expand_payments: bool = False,
+            timeout: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """One page of orders, newest first (Razorpay caps count at 100), optionally with their payments"""
+        params = {"count": min(count, 100), "skip": skip}
+        if created_from is not None:
+            params["from"] = created_from
+        if created_to is not None:
+            params["to"] = created_to
+        if expand_payments:
+            params["expand[]"] = "payments"
+        response = await self._request("GET", "/orders", params=params, timeout=timeout)
+        return response.get("items", [])
+
+    async def capture_payment(
+            self,
+            payment_id: str,
+            amount_paise: int,
+            currency: str = "INR",
+            timeout: Optional[float] = None
+    ) -> Dict[str, Any]:
+        # Capturing an already-captured payment is rejected with a 400, so retries are safe
+        return await self._request(
+            "POST",
+            f"/payments/{payment_id}/capture",
+            json={"amount": amount_paise, "currency": currency},
+            timeout=timeout
+        )
+
+
+@lru_cache()
+def get_payment_gateway() -> RazorpayGateway:
+    """Process-wide gateway, so every PaymentService shares one connection pool"""
+    return RazorpayGateway()
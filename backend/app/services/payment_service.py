@@ -1,16 +1,41 @@
 from typing import Optional, Dict, Any
-import razorpay
 from backend.app.core.config import settings
+from backend.app.core.features import razorpay_webhooks_enabled
+from backend.app.services.payment_gateway import RazorpayGateway, PaymentGatewayError, get_payment_gateway
+import hashlib
+import hmac
 import uuid
 
 
+def compute_payment_signature(order_id: str, payment_id: str, secret: str) -> str:
+    """Razorpay checkout signature: hex HMAC-SHA256 of "order_id|payment_id" keyed by the key secret"""
+    return hmac.new(
+        secret.encode("utf-8"),
+        f"{order_id}|{payment_id}".encode("utf-8"),
+        hashlib.sha256
+    ).hexdigest()
+
+
+def signature_matches(expected: str, signature: str) -> bool:
+    """
+    Constant-time comparison of a hex signature with untrusted input
+
+    Compared as bytes: compare_digest rejects str with non-ASCII characters
+    (TypeError), which would turn a malformed signature into a 500.
+    """
+    return hmac.compare_digest(expected.encode("utf-8"), signature.encode("utf-8", "surrogatepass"))
+
+
 class PaymentService:
-    def __init__(self):
-        self.client = razorpay.Client(
-            auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET)
-        )
+    def __init__(self, gateway: Optional[RazorpayGateway] = None):
+        self.gateway = gateway or get_payment_gateway()
+
+    @property
+    def key_id(self) -> str:
+        """Public Razorpay key ID handed to the checkout widget"""
+        return self.gateway.key_id
 
-    def create_order(
+    async def create_order(
             self,
             amount: float,
             currency: str = "INR",
@@ -28,9 +53,9 @@ class PaymentService:
                 "payment_capture": 1  # Auto-capture payment
             }
 
-            order = self.client.order.create(data=order_data)
+            order = await self.gateway.create_order(order_data)
             return order
-        except Exception as e:
+        except PaymentGatewayError as e:
             print(f"Error creating order: {e}")
             return None
 
@@ -40,34 +65,41 @@ class PaymentService:
             razorpay_payment_id: str,
             razorpay_signature: str
     ) -> bool:
-        """Verify Razorpay payment signature"""
-        try:
-            params_dict = {
-                'razorpay_order_id': razorpay_order_id,
-                'razorpay_payment_id': razorpay_payment_id,
-                'razorpay_signature': razorpay_signature
-            }
-
-            self.client.utility.verify_payment_signature(params_dict)
-            return True
-        except razorpay.errors.SignatureVerificationError:
+        """Verify Razorpay payment signature locally (constant-time comparison, no gateway call)"""
+        if not (settings.RAZORPAY_KEY_SECRET and razorpay_signature):
             return False
-        except Exception as e:
-            print(f"Error verifying signature: {e}")
+
+        expected = compute_payment_signature(
+            razorpay_order_id,
+            razorpay_payment_id,
+            settings.RAZORPAY_KEY_SECRET
+        )
+        return signature_matches(expected, razorpay_signature)
+
+    def verify_webhook_signature(self, body: bytes, signature: Optional[str]) -> bool:
+        """Verify X-Razorpay-Signature: hex HMAC-SHA256 of the raw body keyed by the webhook secret"""
+        if not (razorpay_webhooks_enabled() and signature):
             return False
 
-    def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
+        expected = hmac.new(
+            settings.RAZORPAY_WEBHOOK_SECRET.encode("utf-8"),
+            body,
+            hashlib.sha256
+        ).hexdigest()
+        return signature_matches(expected, signature)
+
+    async def get_order(self, order_id: str) -> Optional[Dict[str, Any]]:
         """Get order details"""
         try:
-            return self.client.order.fetch(order_id)
-        except Exception as e:
+            return await self.gateway.fetch_order(order_id)
+        except PaymentGatewayError as e:
             print(f"Error fetching order: {e}")
             return None
 
-    def capture_payment(self, payment_id: str, amount: float) -> Optional[Dict[str, Any]]:
+    async def capture_payment(self, payment_id: str, amount: float) -> Optional[Dict[str, Any]]:
         """Capture payment (for manual capture)"""
         try:
-            return self.client.payment.capture(payment_id, amount * 100)
-        except Exception as e:
+            return await self.gateway.capture_payment(payment_id, int(amount * 100))
+        except PaymentGatewayError as e:
             print(f"Error capturing payment: {e}")
             return None
\ No newline at end of file
@@ -0,0 +1,241 @@
+"""
+Multilingual phrasebook store.
+
+Phrases are parsed once into structured records and indexed by id, category,
+language and English text. A sorted term list answers prefix searches with
+bisect over English and phonetic forms; fuzzy searches correct each query word
+against the vocabulary with a trigram index. Unfiltered responses are sanitized and serialized once per
+(language, category).
+"""
+
+import re
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from backend.app.core.responses import PreEncodedJSON
+from backend.app.services.translation_service import TranslationService, split_phrase
+from backend.app.utils.validation import sanitize_input
+
+# Response field holding the translation, per language ("assamese" is what the frontend reads)
+LANGUAGE_FIELDS = {"as": "assamese", "hi": "hindi", "bn": "bengali"}
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation, collapse whitespace"""
+    return " ".join(_NON_WORD.sub(" ", text.lower()).split())
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class Phrasebook:
+    """
+    Indexed phrase records
+
+    A record is {"id", "category", "english", "translations": {lang: {"text", "phonetic"}}}.
+    """
+
+    FUZZY_THRESHOLD = 0.35
+
+    def __init__(self, records: Iterable[Dict[str, Any]]):
+        self.records: List[Dict[str, Any]] = list(records)
+        self.by_id: Dict[str, int] = {}
+        self.by_english: Dict[str, int] = {}
+        self.by_category: Dict[str, List[int]] = {}
+        self.by_language: Dict[str, List[int]] = {}
+
+        for idx, record in enumerate(self.records):
+            self.by_id[record["id"]] = idx
+            self.by_english.setdefault(normalize(record["english"]), idx)
+            self.by_category.setdefault(record["category"], []).append(idx)
+            for lang in record["translations"]:
+                self.by_language.setdefault(lang, []).append(idx)
+
+        self.categories: List[str] = sorted(self.by_category)
+        self.languages: List[str] = sorted(self.by_language)
+
+        self._build_search_index()
+        self._build_payloads()
+
+    # Indexes
+
+    def _search_forms(self, record: Dict[str, Any]) -> List[str]:
+        forms = [record["english"]]
+        forms.extend(t["phonetic"] for t in record["translations"].values() if t.get("phonetic"))
+        return [form for form in (normalize(form) for form in forms) if form]
+
+    def _build_search_index(self):
+        terms = set()
+        self._word_records: Dict[str, set] = {}
+        for idx, record in enumerate(self.records):
+            for form in self._search_forms(record):
+                # Whole form and each word, so "left" finds "Turn Left"
+                terms.add((form, idx))
+                for word in form.split():
+                    terms.add((word, idx))
+                    self._word_records.setdefault(word, set()).add(idx)
+
+        sorted_terms = sorted(terms)
+        self._prefix_keys = [term for term, _ in sorted_terms]
+        self._prefix_records = [idx for _, idx in sorted_terms]
+
+        # Fuzzy matching corrects query words against the (much smaller) vocabulary
+        self._vocabulary = sorted(self._word_records)
+        self._word_grams = [trigrams(word) for word in self._vocabulary]
+        self._gram_index: Dict[str, List[int]] = {}
+        for word_idx, grams in enumerate(self._word_grams):
+            for gram in grams:
+                self._gram_index.setdefault(gram, []).append(word_idx)
+
+    def _build_payloads(self):
+        self._payloads: Dict[str, Dict[int, Dict[str, str]]] = {}
+        self._bodies: Dict[Tuple[str, Optional[str]], PreEncodedJSON] = {}
+
+        for lang, indexes in self.by_language.items():
+            payloads = {idx: sanitize_input(self._payload(self.records[idx], lang)) for idx in indexes}
+            self._payloads[lang] = payloads
+            self._bodies[(lang, None)] = self._body(list(payloads.values()))
+            for category in self.categories:
+                self._bodies[(lang, category)] = self._body(
+                    [payloads[idx] for idx in self.by_category[category] if idx in payloads]
+                )
+
+        self.empty_body = self._body([])
+
+    @staticmethod
+    def _payload(record: Dict[str, Any], lang: str) -> Dict[str, str]:
+        translation = record["translations"][lang]
+        return {
+            "id": record["id"],
+            "english": record["english"],
+            LANGUAGE_FIELDS.get(lang, "translation"): translation["text"],
+            "phonetic": translation.get("phonetic", ""),
+            "category": record["category"],
+            "language": lang
+        }
+
+    @staticmethod
+    def _body(payloads: List[Dict[str, str]]) -> PreEncodedJSON:
+        return PreEncodedJSON({"phrases": payloads, "total": len(payloads)})
+
+    # Queries
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def body(self, lang: str = "as", category: Optional[str] = None) -> PreEncodedJSON:
+        """Pre-encoded phrase list for a language, optionally one category"""
+        return self._bodies.get((lang, category), self.empty_body)
+
+    def lookup(self, english: str, lang: str) -> Optional[Dict[str, str]]:
+        """Exact (normalized) English match -> {"text", "phonetic"} in lang"""
+        idx = self.by_english.get(normalize(english))
+        if idx is None:
+            return None
+        return self.records[idx]["translations"].get(lang)
+
+    def search(
+            self,
+            query: str,
+            lang: str = "as",
+            category: Optional[str] = None,
+            limit: int = 20
+    ) -> List[Dict[str, str]]:
+        """Prefix matches first, then fuzzy (trigram) matches, over English and phonetic forms"""
+        query = normalize(query)
+        payloads = self._payloads.get(lang, {})
+        if not query or not payloads:
+            return []
+
+        def wanted(idx: int) -> bool:
+            return idx in payloads and (category is None or self.records[idx]["category"] == category)
+
+        found: Dict[int, None] = {}
+        position = bisect_left(self._prefix_keys, query)
+        while (len(found) < limit and position < len(self._prefix_keys)
+               and self._prefix_keys[position].startswith(query)):
+            idx = self._prefix_records[position]
+            if wanted(idx):
+                found.setdefault(idx)
+            position += 1
+
+        if len(found) < limit:
+            for idx in self._fuzzy(query):
+                if len(found) >= limit:
+                    break
+                if wanted(idx):
+                    found.setdefault(idx)
+
+        return [payloads[idx] for idx in found]
+
+    def _similar_words(self, word: str) -> Dict[str, float]:
+        """Vocabulary words starting with `word`, else those within the trigram threshold"""
+        position = bisect_left(self._vocabulary, word)
+        if position < len(self._vocabulary) and self._vocabulary[position].startswith(word):
+            similar = {}
+            while position < len(self._vocabulary) and self._vocabulary[position].startswith(word):
+                similar[self._vocabulary[position]] = 1.0
+                position += 1
+            return similar
+
+        word_grams = trigrams(word)
+        shared = Counter()
+        for gram in word_grams:
+            shared.update(self._gram_index.get(gram, ()))
+
+        similar = {}
+        for word_idx, count in shared.items():
+            score = 2 * count / (len(word_grams) + len(self._word_grams[word_idx]))
+            if score >= self.FUZZY_THRESHOLD:
+                similar[self._vocabulary[word_idx]] = score
+        return similar
+
+    def _fuzzy(self, query: str) -> List[int]:
+        """
+        Record indexes ranked by how well their words match the query's words
+
+        Each query word is matched to similar vocabulary words (typos included);
+        a record needs at least half of the query words to match.
+        """
+        words = query.split()
+        scores: Dict[int, float] = {}
+        for word in words:
+            best_for_word: Dict[int, float] = {}
+            for similar, score in self._similar_words(word).items():
+                for idx in self._word_records[similar]:
+                    if score > best_for_word.get(idx, 0.0):
+                        best_for_word[idx] = score
+            for idx, score in best_for_word.items():
+                scores[idx] = scores.get(idx, 0.0) + score
+
+        required = len(words) / 2
+        matches = [idx for idx, score in scores.items() if score >= required * self.FUZZY_THRESHOLD * 2]
+        return sorted(matches, key=scores.get, reverse=True)
+
+
+def records_from_phrases(phrases_by_language: Dict[str, Dict[str, Dict[str, str]]]) -> List[Dict[str, Any]]:
+    """Merge {lang: {category: {key: "text (phonetic)"}}} into one record per phrase key"""
+    records: Dict[str, Dict[str, Any]] = {}
+    for lang, categories in phrases_by_language.items():
+        for category, phrases in categories.items():
+            for key, value in phrases.items():
+                record = records.setdefault(f"{category}_{key}", {
+                    "id": f"{category}_{key}",
+                    "category": category,
+                    "english": key.replace("_", " ").title(),
+                    "translations": {}
+                })
+                text, phonetic = split_phrase(value)
+                record["translations"][lang] = {"text": text, "phonetic": phonetic}
+    return list(records.values())
+
+
+@lru_cache()
+def get_phrasebook() -> Phrasebook:
+    """Built once per process from TranslationService's phrase tables"""
+    return Phrasebook(records_from_phrases(TranslationService.PHRASES_BY_LANGUAGE))
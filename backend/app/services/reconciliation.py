@@ -0,0 +1,169 @@
+"""
+Batch reconciliation of Razorpay orders against the transactions ledger.
+
+Pages through gateway orders with their payments (several pages in flight at
+a time), hash-joins each window against transactions and bookings with
+batched reads, and writes corrections with conditional updates that never
+touch a row /verify has already paid. Progress is checkpointed after every window,
+so an interrupted run resumes where it stopped.
+
+Paging is pinned to the order snapshot at job start (created_to), so orders
+created while the job runs don't shift the skip offsets.
+"""
+
+import asyncio
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from backend.app.core.config import settings
+from backend.app.services.payment_gateway import RazorpayGateway, get_payment_gateway
+
+# Mismatch samples kept in the checkpoint for manual review
+MAX_FLAGGED_SAMPLES = 100
+
+
+def captured_payment_id(order: Dict[str, Any]) -> Optional[str]:
+    """ID of the captured payment embedded in an order listed with expand_payments, if any"""
+    for payment in (order.get("payments") or {}).get("items", []):
+        if payment.get("status") == "captured":
+            return payment.get("id")
+    return None
+
+
+def new_stats() -> Dict[str, Any]:
+    return {
+        "orders_scanned": 0,
+        "unmatched_orders": 0,
+        "transactions_marked_paid": 0,
+        "bookings_marked_paid": 0,
+        "flagged": 0,
+        "flagged_samples": []
+    }
+
+
+class PaymentReconciler:
+    """Resumable gateway -> ledger reconciliation job"""
+
+    def __init__(
+            self,
+            transaction_service,
+            gateway: Optional[RazorpayGateway] = None,
+            checkpoint_path: str = settings.RECONCILE_CHECKPOINT_PATH,
+            page_size: int = 100,
+            concurrency: int = 8
+    ):
+        self.transaction_service = transaction_service
+        self.gateway = gateway or get_payment_gateway()
+        self.checkpoint_path = Path(checkpoint_path)
+        self.page_size = page_size
+        self.concurrency = concurrency
+
+    # Checkpoints
+
+    def load_checkpoint(self) -> Optional[Dict[str, Any]]:
+        if not self.checkpoint_path.exists():
+            return None
+        with open(self.checkpoint_path) as f:
+            return json.load(f)
+
+    def save_checkpoint(self, checkpoint: Dict[str, Any]):
+        """Write-then-rename, so a crash never leaves a torn checkpoint"""
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.checkpoint_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(checkpoint, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    # Job
+
+    async def run(self, fresh: bool = False, max_windows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Reconcile all orders created up to the start of the run
+
+        Resumes from the checkpoint unless fresh is set. max_windows stops early
+        (the checkpoint is kept), which is how a run is split across invocations.
+        """
+        checkpoint = None if fresh else self.load_checkpoint()
+        if not checkpoint or checkpoint.get("done"):
+            checkpoint = {"created_to": int(time.time()), "skip": 0, "done": False, "stats": new_stats()}
+
+        windows = 0
+        while not checkpoint["done"] and (max_windows is None or windows < max_windows):
+            orders, exhausted = await self._fetch_window(checkpoint["skip"], checkpoint["created_to"])
+            await self.reconcile_orders(orders, checkpoint["stats"])
+
+            checkpoint["skip"] += len(orders)
+            checkpoint["done"] = exhausted
+            self.save_checkpoint(checkpoint)
+            windows += 1
+
+        return checkpoint
+
+    async def _fetch_window(self, skip: int, created_to: int):
+        """Fetch `concurrency` consecutive pages at once; exhausted once a page comes back short"""
+        pages = await asyncio.gather(*(
+            self.gateway.list_orders(
+                count=self.page_size,
+                skip=skip + i * self.page_size,
+                created_to=created_to,
+                expand_payments=True
+            )
+            for i in range(self.concurrency)
+        ))
+
+        orders: List[Dict[str, Any]] = []
+        for page in pages:
+            orders.extend(page)
+            if len(page) < self.page_size:
+                return orders, True
+        return orders, False
+
+    async def reconcile_orders(self, orders: List[Dict[str, Any]], stats: Dict[str, Any]):
+        """Diff one window of gateway orders against the ledger and write the corrections"""
+        stats["orders_scanned"] += len(orders)
+        if not orders:
+            return
+
+        transactions = await self.transaction_service.get_by_order_ids(order["id"] for order in orders)
+
+        marked_paid, paid_bookings = 0, set()
+        for order in orders:
+            transaction = transactions.get(order["id"])
+            if not transaction:
+                # Created outside the ledger (or before it existed)
+                stats["unmatched_orders"] += 1
+                continue
+
+            gateway_paid = order.get("status") == "paid"
+            if gateway_paid and transaction["status"] != "paid":
+                # Only the status and the payment id; a /verify that got there first keeps its row
+                payment_id = captured_payment_id(order)
+                fields = {"razorpay_payment_id": payment_id, "transaction_id": payment_id} if payment_id else {}
+                if await self.transaction_service.mark_paid(transaction["id"], fields):
+                    marked_paid += 1
+            elif not gateway_paid and transaction["status"] == "paid":
+                self._flag(stats, order["id"], "paid in ledger, not at gateway")
+            if order.get("amount") != int(round(float(transaction["amount"]) * 100)):
+                self._flag(stats, order["id"], "amount mismatch")
+
+            if gateway_paid:
+                paid_bookings.add(transaction["booking_id"])
+
+        booking_statuses = await self.transaction_service.get_booking_payment_statuses(paid_bookings)
+        unpaid_bookings = [
+            booking_id for booking_id in paid_bookings
+            if booking_id in booking_statuses and booking_statuses[booking_id] != "paid"
+        ]
+
+        await self.transaction_service.mark_bookings_paid(unpaid_bookings)
+        stats["transactions_marked_paid"] += marked_paid
+        stats["bookings_marked_paid"] += len(unpaid_bookings)
+
+    @staticmethod
+    def _flag(stats: Dict[str, Any], order_id: str, reason: str):
+        """Mismatches that need a human are counted and sampled, never auto-corrected"""
+        stats["flagged"] += 1
+        if len(stats["flagged_samples"]) < MAX_FLAGGED_SAMPLES:
+            stats["flagged_samples"].append({"order_id": order_id, "reason": reason})
@@ -0,0 +1,449 @@
+"""
+Offline road routing with contraction hierarchies.
+
+Preprocessing contracts the nodes of each profile's road graph (walking,
+driving) one at a time, cheapest first, adding shortcut edges wherever the
+shortest path through a contracted node has no witness path around it. A
+query is then two small Dijkstra searches that only climb to higher-ranked
+nodes (with stall-on-demand), meeting at the top, which keeps lookups well
+under a millisecond on a city graph.
+
+The graph is built from a local OpenStreetMap extract by
+scripts/build_routing_graph.py and saved to ROUTING_GRAPH_PATH; nothing is
+fetched at runtime. Without that file, callers fall back to straight-line
+estimates.
+"""
+
+import heapq
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.utils.geolocation import TRAVEL_SPEEDS_KMH, haversine_distance
+from backend.app.utils.osm_loader import RoadGraph
+
+INF = float("inf")
+
+# Travel mode -> (graph profile, travel time multiplier on that graph)
+MODE_PROFILES = {
+    "walking": ("walking", 1.0),
+    "driving": ("driving", 1.0),
+    "auto": ("driving", TRAVEL_SPEEDS_KMH["driving"] / TRAVEL_SPEEDS_KMH["auto"]),
+    "bicycling": ("driving", TRAVEL_SPEEDS_KMH["driving"] / TRAVEL_SPEEDS_KMH["bicycling"])
+}
+
+# Array names of one direction of the hierarchy
+_EDGE_ARRAYS = ("offsets", "targets", "seconds", "metres", "middle")
+
+
+class ContractionHierarchy:
+    """Upward forward and backward graphs (CSR) of a contracted road graph"""
+
+    def __init__(self, coords: np.ndarray, rank: np.ndarray, forward: Dict[str, np.ndarray],
+                 backward: Dict[str, np.ndarray]):
+        self.coords = coords
+        self.rank = rank
+        self.forward = forward
+        self.backward = backward
+        # Python lists: the query loop reads single elements, which NumPy makes slow
+        self._fwd = [forward[name].tolist() for name in _EDGE_ARRAYS]
+        self._bwd = [backward[name].tolist() for name in _EDGE_ARRAYS]
+
+    @property
+    def node_count(self) -> int:
+        return len(self.coords)
+
+    # Preprocessing
+
+    @classmethod
+    def build(cls, graph: RoadGraph, settle_limit: int = 50,
+              progress: Optional[Callable[[int, int], None]] = None) -> "ContractionHierarchy":
+        """
+        Contract every node of `graph`
+
+        Args:
+            settle_limit: Nodes a witness search may settle; lower is faster to
+                build but adds shortcuts (never wrong answers)
+            progress: Called as progress(contracted, total) every 10000 nodes
+        """
+        n = graph.node_count
+        # Live graph as dicts: node -> {neighbour: (seconds, metres, middle)}
+        out: List[Dict[int, Tuple[float, float, int]]] = [{} for _ in range(n)]
+        inc: List[Dict[int, Tuple[float, float, int]]] = [{} for _ in range(n)]
+        offsets, targets = graph.offsets.tolist(), graph.targets.tolist()
+        seconds, metres = graph.seconds.tolist(), graph.metres.tolist()
+        for u in range(n):
+            for k in range(offsets[u], offsets[u + 1]):
+                out[u][targets[k]] = inc[targets[k]][u] = (seconds[k], metres[k], -1)
+
+        def witness_distances(source: int, skip: int, wanted: set, limit: float) -> Dict[int, float]:
+            dist = {source: 0.0}
+            heap = [(0.0, source)]
+            settled = 0
+            while heap and wanted:
+                d, x = heapq.heappop(heap)
+                if d > dist[x]:
+                    continue
+                wanted.discard(x)
+                settled += 1
+                if d > limit or settled > settle_limit:
+                    break
+                for y, (w, _, _) in out[x].items():
+                    nd = d + w
+                    if y != skip and nd < dist.get(y, INF):
+                        dist[y] = nd
+                        heapq.heappush(heap, (nd, y))
+            return dist
+
+        def shortcuts_for(v: int) -> List[Tuple[int, int, float, float]]:
+            shortcuts = []
+            outs = out[v]
+            if not outs:
+                return shortcuts
+            longest_out = max(w for w, _, _ in outs.values())
+            for u, (wu, lu, _) in inc[v].items():
+                wanted = {w for w in outs if w != u}
+                if not wanted:
+                    continue
+                dist = witness_distances(u, v, set(wanted), wu + longest_out)
+                for w in wanted:
+                    wv, lv, _ = outs[w]
+                    # Any path found avoiding v is real, so a tentative distance is a valid witness
+                    if dist.get(w, INF) > wu + wv:
+                        shortcuts.append((u, w, wu + wv, lu + lv))
+            return shortcuts
+
+        deleted = [0] * n
+
+        def priority(v: int, shortcuts: List[Tuple[int, int, float, float]]) -> int:
+            # Edge difference, plus contracted neighbours to spread contraction evenly. (A hierarchy-depth
+            # term here multiplied the shortcuts on uniform street grids.)
+            return 2 * (len(shortcuts) - len(inc[v]) - len(out[v])) + deleted[v]
+
+        priorities = [priority(v, shortcuts_for(v)) for v in range(n)]
+        heap = [(p, v) for v, p in enumerate(priorities)]
+        heapq.heapify(heap)
+        done = [False] * n
+
+        rank = np.zeros(n, dtype=np.int32)
+        fwd_edges: List[List[Tuple[int, float, float, int]]] = [[] for _ in range(n)]
+        bwd_edges: List[List[Tuple[int, float, float, int]]] = [[] for _ in range(n)]
+        contracted = 0
+        while heap:
+            p, v = heapq.heappop(heap)
+            if done[v] or p != priorities[v]:
+                continue
+            shortcuts = shortcuts_for(v)
+            # Lazy update: contract only if v is still (one of) the cheapest
+            current = priority(v, shortcuts)
+            if heap and current > heap[0][0]:
+                priorities[v] = current
+                heapq.heappush(heap, (current, v))
+                continue
+            done[v] = True
+            neighbours = set(inc[v]) | set(out[v])
+
+            rank[v] = contracted
+            contracted += 1
+            if progress and contracted % 10000 == 0:
+                progress(contracted, n)
+
+            # Everything still attached to v leads to higher-ranked nodes
+            fwd_edges[v] = [(w, s, m, mid) for w, (s, m, mid) in out[v].items()]
+            bwd_edges[v] = [(u, s, m, mid) for u, (s, m, mid) in inc[v].items()]
+            for u in inc[v]:
+                del out[u][v]
+                deleted[u] += 1
+            for w in out[v]:
+                del inc[w][v]
+                deleted[w] += 1
+            for u, w, s, m in shortcuts:
+                if s < out[u].get(w, (INF,))[0]:
+                    out[u][w] = inc[w][u] = (s, m, v)
+            out[v], inc[v] = {}, {}
+
+            # Contracting v changed its neighbours' costs
+            for x in neighbours:
+                priorities[x] = priority(x, shortcuts_for(x))
+                heapq.heappush(heap, (priorities[x], x))
+
+        return cls(graph.coords, rank, _csr(fwd_edges), _csr(bwd_edges))
+
+    # Queries
+
+    def query(self, source: int, target: int) -> Optional[Tuple[float, float]]:
+        """(seconds, metres) of the fastest path, or None if target is unreachable"""
+        found = self._search(source, target)
+        return None if found is None else found[:2]
+
+    def _search(self, source: int, target: int):
+        if source == target:
+            return 0.0, 0.0, source, {source: None}, {target: None}
+
+        f_off, f_tgt, f_sec, f_met, _ = self._fwd
+        b_off, b_tgt, b_sec, b_met, _ = self._bwd
+        dist = ({source: 0.0}, {target: 0.0})
+        length = ({source: 0.0}, {target: 0.0})
+        parent = ({source: None}, {target: None})
+        heaps = ([(0.0, source)], [(0.0, target)])
+        # Forward climbs forward-upward edges; stalling checks edges coming down into x
+        graphs = ((f_off, f_tgt, f_sec, f_met, b_off, b_tgt, b_sec),
+                  (b_off, b_tgt, b_sec, b_met, f_off, f_tgt, f_sec))
+        best, meeting = INF, -1
+
+        side = 0
+        while heaps[0] or heaps[1]:
+            if not heaps[side] or (heaps[1 - side] and heaps[1 - side][0][0] < heaps[side][0][0]):
+                side = 1 - side
+            heap = heaps[side]
+            d, x = heapq.heappop(heap)
+            if d >= best:
+                # Both frontiers are at least as far as the best meeting point
+                if not heaps[1 - side] or heaps[1 - side][0][0] >= best:
+                    break
+                heap.clear()
+                continue
+            my_dist = dist[side]
+            if d > my_dist[x]:
+                continue
+
+            other = dist[1 - side].get(x)
+            if other is not None and d + other < best:
+                best, meeting = d + other, x
+
+            off, tgt, sec, met, s_off, s_tgt, s_sec = graphs[side]
+            # Stall-on-demand: a higher node reaches x more cheaply, so x isn't on a shortest up-path
+            stalled = False
+            for k in range(s_off[x], s_off[x + 1]):
+                y = s_tgt[k]
+                dy = my_dist.get(y)
+                if dy is not None and dy + s_sec[k] < d:
+                    stalled = True
+                    break
+            if stalled:
+                continue
+
+            my_length, my_parent = length[side], parent[side]
+            for k in range(off[x], off[x + 1]):
+                y = tgt[k]
+                nd = d + sec[k]
+                if nd < my_dist.get(y, INF):
+                    my_dist[y] = nd
+                    my_length[y] = length[side][x] + met[k]
+                    my_parent[y] = (x, k)
+                    heapq.heappush(heap, (nd, y))
+
+        if meeting < 0:
+            return None
+        return best, length[0][meeting] + length[1][meeting], meeting, parent[0], parent[1]
+
+    def path(self, source: int, target: int) -> Optional[List[int]]:
+        """Nodes of the fastest path (shortcuts unpacked), or None if unreachable"""
+        found = self._search(source, target)
+        if found is None:
+            return None
+        _, _, meeting, forward_parent, backward_parent = found
+
+        # Edges of the up-path from source and of the up-path from target, both ending at the meeting node
+        edges = []
+        x = meeting
+        while forward_parent[x] is not None:
+            x, k = forward_parent[x]
+            edges.append((self._fwd, x, k))
+        edges.reverse()
+        nodes = [source]
+        for graph, x, k in edges:
+            nodes.extend(self._unpack(x, graph[1][k], graph[4][k]))
+
+        x = meeting
+        while backward_parent[x] is not None:
+            y, k = backward_parent[x]
+            # Backward edge k at y is the edge x -> y
+            nodes.extend(self._unpack(x, y, self._bwd[4][k]))
+            x = y
+        return nodes
+
+    def _edge_middle(self, u: int, v: int) -> int:
+        """Middle node of edge u -> v (-1 for an original edge)"""
+        if self.rank[v] > self.rank[u]:
+            off, tgt, _, _, mid = self._fwd
+            start, end, other = off[u], off[u + 1], v
+        else:
+            off, tgt, _, _, mid = self._bwd
+            start, end, other = off[v], off[v + 1], u
+        best = None
+        for k in range(start, end):
+            if tgt[k] == other:
+                best = mid[k]
+                break
+        return -1 if best is None else best
+
+    def _unpack(self, u: int, v: int, middle: int) -> List[int]:
+        """Nodes after u on edge u -> v, expanding shortcuts"""
+        stack = [(u, v, middle)]
+        nodes = []
+        while stack:
+            a, b, mid = stack.pop()
+            if mid < 0:
+                nodes.append(b)
+            else:
+                # Expand a -> mid before mid -> b (stack: push second half first)
+                stack.append((mid, b, self._edge_middle(mid, b)))
+                stack.append((a, mid, self._edge_middle(a, mid)))
+        return nodes
+
+
+def _csr(edges: List[List[Tuple[int, float, float, int]]]) -> Dict[str, np.ndarray]:
+    counts = np.fromiter((len(e) for e in edges), dtype=np.int64, count=len(edges))
+    flat = [edge for node_edges in edges for edge in node_edges]
+    return {
+        "offsets": np.concatenate(([0], np.cumsum(counts))).astype(np.int64),
+        "targets": np.fromiter((e[0] for e in flat), dtype=np.int32, count=len(flat)),
+        "seconds": np.fromiter((e[1] for e in flat), dtype=np.float64, count=len(flat)),
+        "metres": np.fromiter((e[2] for e in flat), dtype=np.float32, count=len(flat)),
+        "middle": np.fromiter((e[3] for e in flat), dtype=np.int32, count=len(flat))
+    }
+
+
+class NodeSnapper:
+    """Nearest graph node to a coordinate, via a uniform grid of buckets"""
+
+    def __init__(self, coords: np.ndarray, cell_deg: float = 0.005):
+        self.coords = coords
+        self.cell_deg = cell_deg
+        cells = np.floor(coords / cell_deg).astype(np.int64)
+        order = np.lexsort((cells[:, 1], cells[:, 0]))
+        keys = cells[order]
+        boundaries = np.flatnonzero(np.any(np.diff(keys, axis=0) != 0, axis=1)) + 1
+        self._buckets: Dict[Tuple[int, int], np.ndarray] = {}
+        for start, end in zip(np.concatenate(([0], boundaries)), np.concatenate((boundaries, [len(order)]))):
+            if end > start:
+                self._buckets[(int(keys[start, 0]), int(keys[start, 1]))] = order[start:end]
+
+    def nearest(self, lat: float, lng: float, max_km: float) -> Optional[Tuple[int, float]]:
+        """(node, distance km) of the nearest node within max_km, or None"""
+        row, col = int(np.floor(lat / self.cell_deg)), int(np.floor(lng / self.cell_deg))
+        reach = int(np.ceil(max_km / (111.0 * self.cell_deg))) + 1
+        best, best_km = None, INF
+        for ring in range(reach + 1):
+            # Nodes beyond this ring are at least (ring - 1) cells away
+            if best is not None and best_km < (ring - 1) * self.cell_deg * 100:
+                break
+            candidates = [
+                self._buckets[(row + dr, col + dc)]
+                for dr in range(-ring, ring + 1) for dc in range(-ring, ring + 1)
+                if max(abs(dr), abs(dc)) == ring and (row + dr, col + dc) in self._buckets
+            ]
+            if not candidates:
+                continue
+            nodes = np.concatenate(candidates)
+            points = self.coords[nodes]
+            # Equirectangular distance is plenty to pick the nearest at this scale
+            dy = (points[:, 0] - lat) * 110.57
+            dx = (points[:, 1] - lng) * 111.32 * np.cos(np.radians(lat))
+            distances = np.hypot(dx, dy)
+            i = int(distances.argmin())
+            if distances[i] < best_km:
+                best, best_km = int(nodes[i]), float(distances[i])
+        if best is None or best_km > max_km:
+            return None
+        return best, best_km
+
+
+class RoadRouter:
+    """Travel time and distance over the road network, per travel mode"""
+
+    def __init__(self, hierarchies: Dict[str, ContractionHierarchy], max_snap_km: float = settings.ROUTING_MAX_SNAP_KM):
+        self.hierarchies = hierarchies
+        self.snappers = {name: NodeSnapper(ch.coords) for name, ch in hierarchies.items()}
+        self.max_snap_km = max_snap_km
+
+    def supports(self, mode: str) -> bool:
+        return mode in MODE_PROFILES and MODE_PROFILES[mode][0] in self.hierarchies
+
+    def route(self, start: Tuple[float, float], end: Tuple[float, float], mode: str = "walking",
+              geometry: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Fastest route between two coordinates
+
+        The gaps between each coordinate and its nearest road node are added
+        as straight lines at the mode's speed.
+
+        Returns:
+            Dictionary with distance_km and duration_minutes (plus the path as
+            [lat, lng] pairs if geometry is set), or None when either end is
+            off the network or no route exists
+        """
+        if not self.supports(mode):
+            return None
+        profile, factor = MODE_PROFILES[mode]
+        ch, snapper = self.hierarchies[profile], self.snappers[profile]
+
+        origin = snapper.nearest(start[0], start[1], self.max_snap_km)
+        destination = snapper.nearest(end[0], end[1], self.max_snap_km)
+        if origin is None or destination is None:
+            return None
+
+        if geometry:
+            nodes = ch.path(origin[0], destination[0])
+            if nodes is None:
+                return None
+            seconds, metres = ch.query(origin[0], destination[0])
+        else:
+            found = ch.query(origin[0], destination[0])
+            if found is None:
+                return None
+            seconds, metres = found
+
+        access_km = origin[1] + destination[1]
+        if origin[0] == destination[0]:
+            # Same nearest node: the straight line is the better estimate
+            access_km = haversine_distance(start[0], start[1], end[0], end[1])
+        minutes = seconds * factor / 60 + access_km / TRAVEL_SPEEDS_KMH[mode] * 60
+
+        result = {"distance_km": metres / 1000 + access_km, "duration_minutes": minutes, "profile": profile}
+        if geometry:
+            result["path"] = ch.coords[nodes].round(6).tolist()
+        return result
+
+    # Persistence
+
+    def save(self, path: str):
+        arrays = {}
+        for name, ch in self.hierarchies.items():
+            arrays[f"{name}.coords"] = ch.coords
+            arrays[f"{name}.rank"] = ch.rank
+            for direction, edges in (("forward", ch.forward), ("backward", ch.backward)):
+                for array_name, values in edges.items():
+                    arrays[f"{name}.{direction}.{array_name}"] = values
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["RoadRouter"]:
+        try:
+            with np.load(path) as data:
+                arrays = {key: data[key] for key in data.files}
+        except (OSError, ValueError) as e:
+            print(f"Error loading routing graph: {e}")
+            return None
+
+        hierarchies = {}
+        for name in {key.split(".")[0] for key in arrays}:
+            hierarchies[name] = ContractionHierarchy(
+                arrays[f"{name}.coords"],
+                arrays[f"{name}.rank"],
+                {array_name: arrays[f"{name}.forward.{array_name}"] for array_name in _EDGE_ARRAYS},
+                {array_name: arrays[f"{name}.backward.{array_name}"] for array_name in _EDGE_ARRAYS}
+            )
+        return cls(hierarchies)
+
+
+@lru_cache()
+def get_road_router() -> Optional[RoadRouter]:
+    """Router for the graph at ROUTING_GRAPH_PATH, or None if it hasn't been built"""
+    if not Path(settings.ROUTING_GRAPH_PATH).exists():
+        return None
+    return RoadRouter.load(settings.ROUTING_GRAPH_PATH)
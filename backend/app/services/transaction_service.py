@@ -0,0 +1,366 @@
+"""
+Payment ledger on top of the transactions table.
+
+Order creation and payment verification are idempotent: a client retrying
+create-order with the same idempotency key gets the order that was already
+created (reusing a key for a different booking, amount or currency is
+refused), and re-verifying a paid order returns the stored result. Neither
+repeats the gateway call, so checkout retry storms are not passed on to
+Razorpay. Lookups go through the indexes in sql/transactions.sql.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from datetime import datetime, timedelta
+import hashlib
+from supabase import create_client
+from backend.app.core.config import settings
+from backend.app.services.payment_service import PaymentService
+from backend.app.utils.singleflight import SingleFlight
+import uuid
+
+# A pending claim older than this is assumed abandoned (the worker died mid-call)
+CLAIM_LEASE = timedelta(seconds=60)
+
+# PostgREST `in` filters go into the URL, so batch reads are chunked
+BATCH_SIZE = 200
+
+
+class TransactionConflict(Exception):
+    """The request conflicts with the ledger state (in-flight claim, different payment)"""
+
+
+class IdempotencyKeyReused(TransactionConflict):
+    """An idempotency key was replayed with a different booking, amount or currency"""
+
+
+def request_fingerprint(booking_id: str, amount: float, currency: str) -> str:
+    """Hash of what a create-order request asks for, stored with its idempotency key"""
+    request = f"{booking_id}|{int(round(amount * 100))}|{currency.upper()}"
+    return hashlib.sha256(request.encode("utf-8")).hexdigest()
+
+
+class TransactionService:
+    def __init__(self, payment_service: Optional[PaymentService] = None):
+        self.payment_service = payment_service or PaymentService()
+        self.supabase = create_client(
+            settings.SUPABASE_URL,
+            settings.SUPABASE_KEY
+        )
+        self._create_flights = SingleFlight()
+        self._verify_flights = SingleFlight()
+
+    # Indexed lookups
+
+    def _get_one(self, column: str, value: str) -> Optional[Dict[str, Any]]:
+        response = self.supabase.table("transactions") \
+            .select("*") \
+            .eq(column, value) \
+            .limit(1) \
+            .execute()
+        return response.data[0] if response.data else None
+
+    async def get_transaction(self, transaction_id: str) -> Optional[Dict[str, Any]]:
+        """Get transaction by ID"""
+        return self._get_one("id", transaction_id)
+
+    async def get_by_order_id(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Get transaction by Razorpay order ID"""
+        return self._get_one("razorpay_order_id", order_id)
+
+    async def get_by_payment_id(self, payment_id: str) -> Optional[Dict[str, Any]]:
+        """Get transaction by Razorpay payment ID"""
+        return self._get_one("razorpay_payment_id", payment_id)
+
+    async def get_by_idempotency_key(self, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        return self._get_one("idempotency_key", idempotency_key)
+
+    async def get_booking_transactions(self, booking_id: str) -> List[Dict[str, Any]]:
+        """All transactions for a booking, newest first"""
+        response = self.supabase.table("transactions") \
+            .select("*") \
+            .eq("booking_id", booking_id) \
+            .order("created_at", desc=True) \
+            .execute()
+        return response.data or []
+
+    async def get_by_order_ids(self, order_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Batched read for reconciliation: order ID -> transaction"""
+        order_ids = list(dict.fromkeys(order_ids))
+        transactions = {}
+        for start in range(0, len(order_ids), BATCH_SIZE):
+            chunk = order_ids[start:start + BATCH_SIZE]
+            response = self.supabase.table("transactions") \
+                .select("*") \
+                .in_("razorpay_order_id", chunk) \
+                .execute()
+            for transaction in response.data or []:
+                transactions[transaction["razorpay_order_id"]] = transaction
+        return transactions
+
+    async def get_booking_payment_statuses(self, booking_ids: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Batched read: booking ID -> payment_status"""
+        booking_ids = list(dict.fromkeys(booking_ids))
+        statuses = {}
+        for start in range(0, len(booking_ids), BATCH_SIZE):
+            response = self.supabase.table("bookings") \
+                .select("id, payment_status") \
+                .in_("id", booking_ids[start:start + BATCH_SIZE]) \
+                .execute()
+            for booking in response.data or []:
+                statuses[booking["id"]] = booking.get("payment_status")
+        return statuses
+
+    # Conditional writes: only the changed columns, and never to a row that is already paid,
+    # so a concurrent /verify (which writes the signature) is not overwritten
+
+    async def mark_paid(self, transaction_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Set status "paid" and fields unless the row is already paid; the updated row, or None if it was"""
+        response = self.supabase.table("transactions") \
+            .update({**fields, "status": "paid"}) \
+            .eq("id", transaction_id) \
+            .neq("status", "paid") \
+            .execute()
+        return response.data[0] if response.data else None
+
+    async def mark_failed(self, transaction_ids: Iterable[str]):
+        """Set status "failed" on the rows that are not paid (one request per chunk)"""
+        transaction_ids = list(transaction_ids)
+        for start in range(0, len(transaction_ids), BATCH_SIZE):
+            self.supabase.table("transactions") \
+                .update({"status": "failed"}) \
+                .in_("id", transaction_ids[start:start + BATCH_SIZE]) \
+                .neq("status", "paid") \
+                .execute()
+
+    async def mark_bookings_paid(self, booking_ids: Iterable[str]):
+        booking_ids = list(booking_ids)
+        for start in range(0, len(booking_ids), BATCH_SIZE):
+            self.supabase.table("bookings") \
+                .update({"payment_status": "paid"}) \
+                .in_("id", booking_ids[start:start + BATCH_SIZE]) \
+                .execute()
+
+    # Order creation
+
+    async def create_order(
+            self,
+            booking_id: str,
+            amount: float,
+            currency: str = "INR",
+            idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Create (or return the already created) gateway order for a booking
+
+        Without an explicit key, the same booking/amount/currency maps to the
+        same order, which Razorpay lets the customer retry until it is paid.
+
+        Raises:
+            IdempotencyKeyReused: If the key was used for a different request
+            TransactionConflict: If another request with the key is in flight
+        """
+        if not idempotency_key:
+            idempotency_key = f"order:{booking_id}:{int(round(amount * 100))}:{currency}"
+        fingerprint = request_fingerprint(booking_id, amount, currency)
+
+        # Concurrent retries of the same request in this process share one attempt
+        return await self._create_flights.do(
+            (idempotency_key, fingerprint),
+            lambda: self._create_order(booking_id, amount, currency, idempotency_key, fingerprint)
+        )
+
+    async def _create_order(
+            self,
+            booking_id: str,
+            amount: float,
+            currency: str,
+            idempotency_key: str,
+            fingerprint: str
+    ) -> Dict[str, Any]:
+        existing = await self.get_by_idempotency_key(idempotency_key)
+        if existing:
+            self._check_fingerprint(existing, fingerprint)
+            if existing.get("razorpay_order_id"):
+                return existing
+            if existing["status"] == "pending" and not self._claim_expired(existing):
+                raise TransactionConflict("Order creation already in progress, retry shortly")
+            # Abandoned or failed claim: release it and claim again
+            self.supabase.table("transactions").delete().eq("id", existing["id"]).execute()
+
+        # Claim the key first; the unique index makes concurrent workers lose here
+        transaction_id = str(uuid.uuid4())
+        try:
+            self.supabase.table("transactions").insert({
+                "id": transaction_id,
+                "booking_id": booking_id,
+                "amount": amount,
+                "currency": currency,
+                "payment_method": "razorpay",
+                "status": "pending",
+                "idempotency_key": idempotency_key,
+                "request_fingerprint": fingerprint,
+                "created_at": datetime.utcnow().isoformat()
+            }).execute()
+        except Exception:
+            existing = await self.get_by_idempotency_key(idempotency_key)
+            if existing:
+                self._check_fingerprint(existing, fingerprint)
+            if existing and existing.get("razorpay_order_id"):
+                return existing
+            raise TransactionConflict("Order creation already in progress, retry shortly")
+
+        order = await self.payment_service.create_order(
+            amount=amount,
+            currency=currency,
+            receipt=f"booking_{booking_id}"[:40]
+        )
+
+        if not order:
+            self.supabase.table("transactions").update({"status": "failed"}).eq("id", transaction_id).execute()
+            raise ValueError("Failed to create payment order")
+
+        response = self.supabase.table("transactions") \
+            .update({
+                "status": "created",
+                "razorpay_order_id": order["id"],
+                "amount": order["amount"] / 100  # Stored in rupees
+            }) \
+            .eq("id", transaction_id) \
+            .execute()
+
+        if response.data:
+            return response.data[0]
+        # The update returned no row: read back what was stored
+        transaction = self._get_one("id", transaction_id)
+        if not transaction or not transaction.get("razorpay_order_id"):
+            raise ValueError("Failed to record payment order")
+        return transaction
+
+    @staticmethod
+    def _check_fingerprint(transaction: Dict[str, Any], fingerprint: str):
+        """Refuse a replayed key whose request differs (rows claimed before fingerprints were stored pass)"""
+        stored = transaction.get("request_fingerprint")
+        if stored and stored != fingerprint:
+            raise IdempotencyKeyReused("Idempotency-Key was already used for a different booking, amount or currency")
+
+    @staticmethod
+    def _claim_expired(transaction: Dict[str, Any]) -> bool:
+        created_at = datetime.fromisoformat(str(transaction["created_at"]).replace("Z", "+00:00"))
+        return datetime.utcnow() - created_at.replace(tzinfo=None) > CLAIM_LEASE
+
+    # Payment verification
+
+    async def verify_payment(
+            self,
+            booking_id: str,
+            razorpay_order_id: str,
+            razorpay_payment_id: str,
+            razorpay_signature: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record a verified payment against its order
+
+        Returns the paid transaction, or None if the order is unknown. The caller
+        is expected to have checked the signature already.
+        """
+        # Keyed on the whole request: a concurrent caller with another booking or
+        # payment must not be handed this one's result without its own checks
+        return await self._verify_flights.do(
+            (razorpay_order_id, booking_id, razorpay_payment_id),
+            lambda: self._verify_payment(booking_id, razorpay_order_id, razorpay_payment_id, razorpay_signature)
+        )
+
+    async def _verify_payment(
+            self,
+            booking_id: str,
+            razorpay_order_id: str,
+            razorpay_payment_id: str,
+            razorpay_signature: str
+    ) -> Optional[Dict[str, Any]]:
+        transaction = await self.get_by_order_id(razorpay_order_id)
+        if not transaction:
+            return None
+
+        if transaction.get("booking_id") != booking_id:
+            raise TransactionConflict("Order does not belong to this booking")
+
+        if transaction["status"] == "paid":
+            # Replayed verification (or paid by reconciliation): answer from the ledger
+            transaction = await self._record_payment(transaction, razorpay_payment_id, razorpay_signature)
+            return self._check_paid(transaction, booking_id, razorpay_payment_id)
+
+        response = self.supabase.table("transactions") \
+            .update({
+                "status": "paid",
+                "razorpay_payment_id": razorpay_payment_id,
+                "razorpay_signature": razorpay_signature,
+                "transaction_id": razorpay_payment_id
+            }) \
+            .eq("id", transaction["id"]) \
+            .neq("status", "paid") \
+            .execute()
+
+        if not response.data:
+            # Lost a race with another worker; its write is the truth, checked like a replay
+            transaction = await self.get_by_order_id(razorpay_order_id)
+            if transaction:
+                transaction = await self._record_payment(transaction, razorpay_payment_id, razorpay_signature)
+            return self._check_paid(transaction, booking_id, razorpay_payment_id)
+
+        self.supabase.table("bookings") \
+            .update({"payment_status": "paid"}) \
+            .eq("id", booking_id) \
+            .execute()
+
+        return response.data[0]
+
+    async def _record_payment(
+            self,
+            transaction: Dict[str, Any],
+            razorpay_payment_id: str,
+            razorpay_signature: str
+    ) -> Dict[str, Any]:
+        """
+        Fill in the payment of a row marked paid without one (reconciliation can
+        mark an order paid before its payment id is known)
+
+        Not yet recorded is not a conflict; a row that already has a payment id
+        is returned as is.
+        """
+        if transaction.get("razorpay_payment_id"):
+            return transaction
+
+        response = self.supabase.table("transactions") \
+            .update({
+                "razorpay_payment_id": razorpay_payment_id,
+                "razorpay_signature": razorpay_signature,
+                "transaction_id": razorpay_payment_id
+            }) \
+            .eq("id", transaction["id"]) \
+            .is_("razorpay_payment_id", "null") \
+            .execute()
+
+        if response.data:
+            return response.data[0]
+        # Filled in concurrently: read what was stored
+        return self._get_one("id", transaction["id"]) or transaction
+
+    @staticmethod
+    def _check_paid(
+            transaction: Optional[Dict[str, Any]],
+            booking_id: str,
+            razorpay_payment_id: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer a verification from the ledger (replay, or a race lost to another worker)
+
+        Raises:
+            TransactionConflict: If the order belongs to another booking or was paid by another payment
+        """
+        if not transaction:
+            return None
+        if transaction.get("booking_id") != booking_id:
+            raise TransactionConflict("Order does not belong to this booking")
+        if transaction.get("razorpay_payment_id") != razorpay_payment_id:
+            raise TransactionConflict("Order has already been paid by a different payment")
+        return transaction
@@ -0,0 +1,86 @@
+"""
+Micro-batching for upstream translation calls.
+
+Strings submitted for the same target language within a short window are
+sent as one multi-`q` request, and each caller gets its own result back.
+A batch is flushed early once it reaches the item or character limit.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+# fetch_many(texts, target_lang) -> one result per text (None where it failed)
+FetchMany = Callable[[List[str], str], Awaitable[List[Optional[str]]]]
+
+
+class TranslationBatcher:
+    """Collects pending strings per target language and sends them together"""
+
+    def __init__(
+            self,
+            fetch_many: FetchMany,
+            max_batch: int = 100,
+            max_chars: int = 5000,
+            max_delay: float = 0.01
+    ):
+        self.fetch_many = fetch_many
+        self.max_batch = max_batch
+        self.max_chars = max_chars
+        self.max_delay = max_delay
+        self._pending: Dict[str, Dict[str, asyncio.Future]] = {}
+        self._chars: Dict[str, int] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._sending: Set[asyncio.Task] = set()
+        self.batches_sent = 0
+
+    async def submit(self, text: str, target_lang: str) -> Optional[str]:
+        """Translate one string as part of the next batch for its language"""
+        pending = self._pending.setdefault(target_lang, {})
+        future = pending.get(text)
+        if future is None:
+            future = asyncio.get_running_loop().create_future()
+            pending[text] = future
+            self._chars[target_lang] = self._chars.get(target_lang, 0) + len(text)
+
+            if len(pending) >= self.max_batch or self._chars[target_lang] >= self.max_chars:
+                self._flush(target_lang)
+            elif target_lang not in self._timers:
+                self._timers[target_lang] = asyncio.get_running_loop().call_later(
+                    self.max_delay, self._flush, target_lang
+                )
+
+        # shield: one cancelled caller must not cancel the batch for the others
+        return await asyncio.shield(future)
+
+    async def submit_many(self, texts: List[str], target_lang: str) -> List[Optional[str]]:
+        return list(await asyncio.gather(*(self.submit(text, target_lang) for text in texts)))
+
+    def _flush(self, target_lang: str):
+        timer = self._timers.pop(target_lang, None)
+        if timer is not None:
+            timer.cancel()
+        self._chars.pop(target_lang, None)
+        batch = self._pending.pop(target_lang, None)
+        if not batch:
+            return
+
+        task = asyncio.ensure_future(self._send(batch, target_lang))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: Dict[str, asyncio.Future], target_lang: str):
+        texts = list(batch)
+        self.batches_sent += 1
+        try:
+            results = await self.fetch_many(texts, target_lang)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark retrieved so an unobserved failure doesn't log a warning
+                    future.exception()
+            return
+
+        for text, result in zip(texts, results):
+            if not batch[text].done():
+                batch[text].set_result(result)
@@ -0,0 +1,191 @@
+"""
+Offline translation memory.
+
+Holds English -> {language: translation} pairs and answers lookups locally:
+exact matches through a hash of normalized sources, prefix matches through a
+sorted key array (bisect narrows it to the prefix's subtree, like walking a
+trie but without a node per character), and fuzzy matches through a trigram
+index scored by Dice similarity. Only misses need the upstream translator.
+
+The memory holds curated pairs only (the phrasebook and the corpus at
+TRANSLATION_MEMORY_PATH). Upstream results live in the translation service's
+bounded cache, so request traffic cannot grow this index.
+"""
+
+import json
+from bisect import bisect_left, insort
+from collections import Counter
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from backend.app.core.config import settings
+from backend.app.services.phrasebook import get_phrasebook, normalize, trigrams
+
+
+def _numbers(key: str) -> List[str]:
+    return [token for token in key.split() if any(c.isdigit() for c in token)]
+
+
+class TranslationMemory:
+    """Phrase-pair index with exact, prefix and fuzzy lookup"""
+
+    # Fuzzy matches below this score would risk answering with the wrong sentence
+    FUZZY_THRESHOLD = 0.75
+
+    def __init__(self, pairs: Iterable[Tuple[str, str, str, str]] = ()):
+        """pairs: (english, lang, translation, phonetic)"""
+        self._sources: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._keys_by_id: List[str] = []
+        self._translations: List[Dict[str, Tuple[str, str]]] = []
+        self._grams: List[int] = []
+        self._gram_index: Dict[str, List[int]] = {}
+        self._keys: List[str] = []
+        self._number_index: Dict[str, set] = {}
+        self.add_many(pairs)
+
+    def __len__(self) -> int:
+        return len(self._sources)
+
+    def add(self, english: str, lang: str, translation: str, phonetic: str = ""):
+        key = self._add(english, lang, translation, phonetic)
+        if key:
+            insort(self._keys, key)
+
+    def add_many(self, pairs: Iterable[Tuple[str, ...]]):
+        """
+        Bulk load (english, lang, translation[, phonetic]) pairs
+
+        New keys are appended and the prefix array is sorted once at the end,
+        instead of an O(N) insort per new source.
+        """
+        added = [key for key in (self._add(*pair) for pair in pairs) if key]
+        if added:
+            self._keys.extend(added)
+            self._keys.sort()
+
+    def _add(self, english: str, lang: str, translation: str, phonetic: str = "") -> Optional[str]:
+        """Index a pair; returns the normalized key if it is a new source (not yet in _keys)"""
+        key = normalize(english)
+        if not key:
+            return None
+
+        source_id = self._ids.get(key)
+        new_key = None
+        if source_id is None:
+            source_id = len(self._sources)
+            self._ids[key] = source_id
+            self._sources.append(english)
+            self._keys_by_id.append(key)
+            self._translations.append({})
+            new_key = key
+
+            grams = trigrams(key)
+            self._grams.append(len(grams))
+            for gram in grams:
+                self._gram_index.setdefault(gram, []).append(source_id)
+            for number in _numbers(key):
+                self._number_index.setdefault(number, set()).add(source_id)
+
+        self._translations[source_id][lang] = (translation, phonetic)
+        return new_key
+
+    def _match(self, source_id: int, lang: str, match: str, score: float) -> Dict[str, Any]:
+        translation, phonetic = self._translations[source_id][lang]
+        return {
+            "source": self._sources[source_id],
+            "translated": translation,
+            "phonetic": phonetic,
+            "match": match,
+            "score": score
+        }
+
+    def exact(self, text: str, lang: str) -> Optional[Dict[str, Any]]:
+        source_id = self._ids.get(normalize(text))
+        if source_id is None or lang not in self._translations[source_id]:
+            return None
+        return self._match(source_id, lang, "exact", 1.0)
+
+    def prefix(self, text: str, lang: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Stored sources starting with text (autocomplete)"""
+        key = normalize(text)
+        matches = []
+        position = bisect_left(self._keys, key)
+        while len(matches) < limit and position < len(self._keys) and self._keys[position].startswith(key):
+            source_id = self._ids[self._keys[position]]
+            if lang in self._translations[source_id]:
+                matches.append(self._match(source_id, lang, "prefix", 1.0))
+            position += 1
+        return matches
+
+    def fuzzy(self, text: str, lang: str) -> Optional[Dict[str, Any]]:
+        """Most similar stored source above FUZZY_THRESHOLD"""
+        key = normalize(text)
+        query_grams = trigrams(key)
+        if not query_grams:
+            return None
+
+        # A near-identical sentence with different numbers is a different sentence
+        numbers = _numbers(key)
+        if numbers:
+            with_numbers = set.intersection(*(self._number_index.get(n, set()) for n in numbers))
+            if not with_numbers:
+                return None
+
+        # Dice >= t needs at least `required` shared grams, so every match contains
+        # one of the query's rarest len - required + 1 grams: only those are probed
+        t = self.FUZZY_THRESHOLD
+        required = max(1, int(t * len(query_grams) / (2 - t)))
+        rarest = sorted(query_grams, key=lambda gram: len(self._gram_index.get(gram, ())))
+        probed = len(rarest) - required + 1
+        shared = Counter()
+        for gram in rarest[:probed]:
+            shared.update(self._gram_index.get(gram, ()))
+
+        unprobed = len(query_grams) - probed
+        best_id, best_score = None, t
+        for source_id, count in shared.items():
+            # Upper bound: every unprobed gram matches too
+            total = len(query_grams) + self._grams[source_id]
+            if 2 * (count + unprobed) / total < best_score or lang not in self._translations[source_id]:
+                continue
+            if numbers and source_id not in with_numbers:
+                continue
+            source_key = self._keys_by_id[source_id]
+            score = 2 * len(query_grams & trigrams(source_key)) / total
+            if score >= best_score and _numbers(source_key) == numbers:
+                best_id, best_score = source_id, score
+
+        if best_id is None:
+            return None
+        return self._match(best_id, lang, "fuzzy", round(best_score, 3))
+
+    def lookup(self, text: str, lang: str) -> Optional[Dict[str, Any]]:
+        """Exact match, else the best fuzzy match, else None"""
+        return self.exact(text, lang) or self.fuzzy(text, lang)
+
+
+def load_pairs(path: str) -> List[Tuple[str, str, str, str]]:
+    """JSON lines of {"english", "lang", "text", "phonetic"}; a missing file is an empty corpus"""
+    if not Path(path).exists():
+        return []
+
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                pair = json.loads(line)
+                pairs.append((pair["english"], pair["lang"], pair["text"], pair.get("phonetic", "")))
+    return pairs
+
+
+@lru_cache()
+def get_translation_memory() -> TranslationMemory:
+    """Phrasebook pairs plus the optional corpus at TRANSLATION_MEMORY_PATH"""
+    memory = TranslationMemory(
+        (record["english"], lang, translation["text"], translation["phonetic"])
+        for record in get_phrasebook().records
+        for lang, translation in record["translations"].items()
+    )
+    memory.add_many(load_pairs(settings.TRANSLATION_MEMORY_PATH))
+    return memory
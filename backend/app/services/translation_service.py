@@ -1,6 +1,35 @@
-from typing import Dict, List, Optional
-import requests
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
 from backend.app.core.config import settings
+from backend.app.services.translation_batcher import TranslationBatcher
+from backend.app.utils.cache import MISSING, TieredCache
+from backend.app.utils.singleflight import SingleFlight
+
+# Languages the catalogue is translated into (English is the source)
+TRANSLATION_LANGUAGES = ("as", "hi", "bn")
+
+# User-facing itinerary text; the rest (ids, prices, coordinates) is never translated
+ITINERARY_TEXT_FIELDS = ("title", "description", "meeting_address")
+ITINERARY_LIST_TEXT_FIELDS = ("highlights", "safety_notes")
+
+
+def translation_key(text: str, target_lang: str) -> str:
+    return f"{target_lang}:{text}"
+
+
+def split_phrase(value: str) -> Tuple[str, str]:
+    """"নমস্কাৰ (Nomoskar)" -> ("নমস্কাৰ", "Nomoskar")"""
+    text, _, phonetic = value.partition(" (")
+    return text, phonetic.rstrip(")")
+
+
+def itinerary_strings(itinerary: Dict[str, Any]) -> List[str]:
+    """All translatable strings of an itinerary"""
+    strings = [itinerary[field] for field in ITINERARY_TEXT_FIELDS if itinerary.get(field)]
+    for field in ITINERARY_LIST_TEXT_FIELDS:
+        strings.extend(item for item in itinerary.get(field) or [] if item)
+    return strings
 
 
 class TranslationService:
@@ -10,7 +39,8 @@ class TranslationService:
         "greetings": {
             "hello": "নমস্কাৰ (Nomoskar)",
             "thank_you": "ধন্যবাদ (Dhonnobad)",
-            "welcome": "স্বাগতম (Swagotom)"
+            "welcome": "স্বাগতম (Swagotom)",
+            "how_are_you": "আপুনি কেনে আছে? (Aponi kene ase?)"
         },
         "directions": {
             "where_is": "ক'ত আছে? (Kot ase?)",
@@ -21,68 +51,212 @@ class TranslationService:
         "emergency": {
             "help": "সাহায্য কৰক (Xahayyo korok)",
             "police": "পুলিচ (Police)",
-            "hospital": "হস্পিতাল (Hospitol)"
+            "hospital": "হস্পিতাল (Hospitol)",
+            "call_police": "পুলিচক মাতক (Policek matok)",
+            "i_need_a_doctor": "মোৰ ডাক্তৰ লাগে (Mur doktor lage)"
         },
         "shopping": {
             "how_much": "কিমান দাম? (Kiman dam?)",
             "too_expensive": "বহুত দামী (Bohut dami)",
             "can_you_reduce": "কমাব পাৰিবনে? (Komab paribone?)"
+        },
+        "food": {
+            "delicious": "স্বাদযুক্ত (Swadyukt)",
+            "water_please": "পানী দিয়ক (Pani diok)"
         }
     }
 
-    @staticmethod
-    async def translate_text(text: str, target_lang: str = "as") -> Optional[str]:
-        """Translate text using Google Translate API"""
-        if not settings.GOOGLE_TRANSLATE_API_KEY:
+    # Same keys as PHRASES, for visitors who are more at home in Hindi or Bengali
+    HINDI_PHRASES = {
+        "greetings": {
+            "hello": "नमस्ते (Namaste)",
+            "thank_you": "धन्यवाद (Dhanyavaad)",
+            "welcome": "स्वागत है (Swagat hai)",
+            "how_are_you": "आप कैसे हैं? (Aap kaise hain?)"
+        },
+        "directions": {
+            "where_is": "कहाँ है? (Kahan hai?)",
+            "go_straight": "सीधे जाइए (Seedhe jaiye)",
+            "turn_left": "बाएँ मुड़िए (Baayen mudiye)",
+            "turn_right": "दाएँ मुड़िए (Daayen mudiye)"
+        },
+        "emergency": {
+            "help": "मदद कीजिए (Madad kijiye)",
+            "police": "पुलिस (Police)",
+            "hospital": "अस्पताल (Aspataal)",
+            "call_police": "पुलिस को बुलाइए (Police ko bulaiye)",
+            "i_need_a_doctor": "मुझे डॉक्टर चाहिए (Mujhe doctor chahiye)"
+        },
+        "shopping": {
+            "how_much": "कितने का है? (Kitne ka hai?)",
+            "too_expensive": "बहुत महँगा है (Bahut mehenga hai)",
+            "can_you_reduce": "कुछ कम कीजिए? (Kuch kam kijiye?)"
+        },
+        "food": {
+            "delicious": "स्वादिष्ट (Swaadisht)",
+            "water_please": "पानी दीजिए (Paani dijiye)"
+        }
+    }
+
+    BENGALI_PHRASES = {
+        "greetings": {
+            "hello": "নমস্কার (Nomoshkar)",
+            "thank_you": "ধন্যবাদ (Dhonnobad)",
+            "welcome": "স্বাগতম (Shagotom)",
+            "how_are_you": "আপনি কেমন আছেন? (Apni kemon achhen?)"
+        },
+        "directions": {
+            "where_is": "কোথায়? (Kothay?)",
+            "go_straight": "সোজা যান (Shoja jan)",
+            "turn_left": "বাঁদিকে ঘুরুন (Bandike ghurun)",
+            "turn_right": "ডানদিকে ঘুরুন (Dandike ghurun)"
+        },
+        "emergency": {
+            "help": "সাহায্য করুন (Shahajjo korun)",
+            "police": "পুলিশ (Pulish)",
+            "hospital": "হাসপাতাল (Haspatal)",
+            "call_police": "পুলিশ ডাকুন (Pulish dakun)",
+            "i_need_a_doctor": "আমার ডাক্তার দরকার (Amar daktar dorkar)"
+        },
+        "shopping": {
+            "how_much": "কত দাম? (Koto dam?)",
+            "too_expensive": "খুব দামি (Khub dami)",
+            "can_you_reduce": "একটু কম করবেন? (Ektu kom korben?)"
+        },
+        "food": {
+            "delicious": "সুস্বাদু (Sushadu)",
+            "water_please": "জল দিন (Jol din)"
+        }
+    }
+
+    PHRASES_BY_LANGUAGE = {"as": PHRASES, "hi": HINDI_PHRASES, "bn": BENGALI_PHRASES}
+
+    def __init__(
+            self,
+            api_key: str = settings.GOOGLE_TRANSLATE_API_KEY,
+            base_url: str = settings.GOOGLE_TRANSLATE_API_BASE,
+            timeout: float = settings.TRANSLATION_TIMEOUT,
+            cache: Optional[TieredCache] = None
+    ):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache or TieredCache(
+            settings.TRANSLATION_CACHE_PATH,
+            maxsize=settings.TRANSLATION_CACHE_SIZE,
+            table="translations"
+        )
+        self._flights = SingleFlight()
+        self._client: Optional[httpx.AsyncClient] = None
+        self.batcher = TranslationBatcher(
+            self._fetch_translations,
+            max_batch=settings.TRANSLATION_BATCH_SIZE,
+            max_delay=settings.TRANSLATION_BATCH_WINDOW_MS / 1000
+        )
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared connection pool, created on first use inside the running loop"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 3.0)),
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10)
+            )
+        return self._client
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def translate_text(self, text: str, target_lang: str = "as") -> Optional[str]:
+        """
+        Translate text using Google Translate API
+
+        Results are cached in memory and on disk per (text, target_lang).
+        Misses are micro-batched with other pending strings into one upstream
+        request, and concurrent requests for the same text share one call.
+        """
+        text = text.strip()
+        if not text:
+            return text
+
+        key = translation_key(text, target_lang)
+        cached = self.cache.get(key)
+        if cached is not MISSING:
+            return cached
+
+        if not self.api_key:
             return None
 
+        return await self._flights.do(key, lambda: self.batcher.submit(text, target_lang))
+
+    async def translate_many(self, texts: List[str], target_lang: str = "as") -> List[Optional[str]]:
+        """Translate several strings: one cache lookup, then the misses go out together"""
+        texts = [text.strip() for text in texts]
+        cached = self.cache.get_many(translation_key(text, target_lang) for text in set(texts) if text)
+
+        misses = list(dict.fromkeys(
+            text for text in texts if text and translation_key(text, target_lang) not in cached
+        ))
+        fetched: Dict[str, Optional[str]] = {}
+        if misses and self.api_key:
+            fetched = dict(zip(misses, await self.batcher.submit_many(misses, target_lang)))
+
+        return [
+            text if not text else cached.get(translation_key(text, target_lang), fetched.get(text))
+            for text in texts
+        ]
+
+    async def translate_itinerary(self, itinerary: Dict[str, Any], target_lang: str) -> Dict[str, Any]:
+        """Copy of an itinerary with its text fields translated (untranslatable strings stay in English)"""
+        strings = itinerary_strings(itinerary)
+        translations = dict(zip(strings, await self.translate_many(strings, target_lang)))
+
+        translated = dict(itinerary)
+        for field in ITINERARY_TEXT_FIELDS:
+            if itinerary.get(field):
+                translated[field] = translations.get(itinerary[field]) or itinerary[field]
+        for field in ITINERARY_LIST_TEXT_FIELDS:
+            if itinerary.get(field):
+                translated[field] = [translations.get(item) or item for item in itinerary[field]]
+        return translated
+
+    async def _fetch_translations(self, texts: List[str], target_lang: str) -> List[Optional[str]]:
+        """One multi-q request; successful results are written to the cache"""
         try:
-            url = "https://translation.googleapis.com/language/translate/v2"
-            params = {
-                "q": text,
-                "target": target_lang,
-                "key": settings.GOOGLE_TRANSLATE_API_KEY,
-                "format": "text"
-            }
+            response = await self.client.post(
+                self.base_url,
+                params={"key": self.api_key},
+                json={"q": texts, "target": target_lang, "format": "text"}
+            )
+            response.raise_for_status()
+            results = [item["translatedText"] for item in response.json()["data"]["translations"]]
+        except (httpx.HTTPError, KeyError, IndexError, ValueError) as e:
+            print(f"Error translating text: {e}")
+            return [None] * len(texts)
 
-            response = requests.post(url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                return data["data"]["translations"][0]["translatedText"]
-        except Exception:
-            pass
+        if len(results) != len(texts):
+            print(f"Error translating text: expected {len(texts)} results, got {len(results)}")
+            return [None] * len(texts)
 
-        return None
+        self.cache.set_many({
+            translation_key(text, target_lang): result for text, result in zip(texts, results)
+        })
+        return results
 
     @staticmethod
     def get_phrase(category: str, phrase_key: str) -> Dict[str, str]:
         """Get phrase with translation and phonetic guide"""
-        if category in TranslationService.PHRASES and phrase_key in TranslationService.PHRASES[category]:
-            assamese_phrase = TranslationService.PHRASES[category][phrase_key]
-            english_phrase = phrase_key.replace("_", " ").title()
-
-            return {
-                "english": english_phrase,
-                "assamese": assamese_phrase.split(" (")[0],
-                "phonetic": assamese_phrase.split(" (")[1].rstrip(")") if "(" in assamese_phrase else "",
-                "category": category
-            }
-        return {}
+        phrase = _common_phrases_by_id().get(f"{category}_{phrase_key}")
+        if phrase is None:
+            return {}
+        return {name: phrase[name] for name in ("english", "assamese", "phonetic", "category")}
 
     @staticmethod
     def get_common_phrases() -> List[Dict[str, str]]:
-        """Get list of common phrases for phrasebook"""
-        phrases = []
-        for category, category_phrases in TranslationService.PHRASES.items():
-            for key, value in category_phrases.items():
-                phrases.append({
-                    "id": f"{category}_{key}",
-                    "english": key.replace("_", " ").title(),
-                    "assamese": value.split(" (")[0],
-                    "phonetic": value.split(" (")[1].rstrip(")") if "(" in value else "",
-                    "category": category
-                })
-        return phrases
+        """Get list of common phrases for phrasebook (parsed once)"""
+        return [dict(phrase) for phrase in _common_phrases_by_id().values()]
 
     @staticmethod
     def get_emergency_contacts() -> List[Dict[str, str]]:
@@ -118,4 +292,26 @@ class TranslationService:
                 "type": "hospital",
                 "language": "Assamese, English"
             }
-        ]
\ No newline at end of file
+        ]
+
+
+@lru_cache()
+def _common_phrases_by_id() -> Dict[str, Dict[str, str]]:
+    phrases = {}
+    for category, category_phrases in TranslationService.PHRASES.items():
+        for key, value in category_phrases.items():
+            assamese, phonetic = split_phrase(value)
+            phrases[f"{category}_{key}"] = {
+                "id": f"{category}_{key}",
+                "english": key.replace("_", " ").title(),
+                "assamese": assamese,
+                "phonetic": phonetic,
+                "category": category
+            }
+    return phrases
+
+
+@lru_cache()
+def get_translation_service() -> TranslationService:
+    """Process-wide translator, so callers share the connection pool and cache"""
+    return TranslationService()
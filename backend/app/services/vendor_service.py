@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from supabase import create_client
 from backend.app.core.config import settings
 
@@ -14,11 +14,18 @@ class VendorService:
             self,
             verified_only: bool = True,
             limit: int = 20,
-            offset: int = 0
-    ) -> List[Dict[str, Any]]:
-        """Get list of vendors"""
+            offset: int = 0,
+            fields: Optional[Tuple[str, ...]] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Get list of vendors (only `fields` are read when a sparse fieldset is given)
+
+        Returns:
+            The vendors, or None if the database could not be read (not an empty list,
+            which callers would pass on as "no vendors")
+        """
         try:
-            query = self.supabase.table("vendors").select("*")
+            query = self.supabase.table("vendors").select(",".join(fields) if fields else "*")
 
             if verified_only:
                 query = query.eq("verification_status", "verified")
@@ -30,7 +37,7 @@ class VendorService:
             return response.data
         except Exception as e:
             print(f"Error getting vendors: {e}")
-            return []
+            return None
 
     async def get_vendor_by_id(self, vendor_id: str) -> Optional[Dict[str, Any]]:
         """Get vendor by ID with user details"""
@@ -0,0 +1,227 @@
+"""
+Durable ingestion queue for Razorpay webhooks.
+
+The webhook endpoint only verifies the signature and appends the raw event to
+a local SQLite queue (WAL mode, one small insert), so bursts are acknowledged
+in milliseconds. A pool of background workers claims events in batches and
+applies them to transactions and bookings with one read and a couple of bulk
+writes per batch. SQLite and Supabase calls block, so the workers make them
+from the threadpool and the event loop keeps serving requests.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import orjson
+from fastapi.concurrency import run_in_threadpool
+from backend.app.core.config import settings
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS webhook_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    event_id TEXT UNIQUE,
+    event_type TEXT NOT NULL,
+    payload BLOB NOT NULL,
+    received_at REAL NOT NULL,
+    claimed_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    done INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS webhook_events_pending_idx ON webhook_events (done, claimed_at, id);
+"""
+
+# Events that change payment state; everything else is acknowledged and dropped
+PAID_EVENTS = {"payment.captured", "order.paid"}
+FAILED_EVENTS = {"payment.failed"}
+
+
+class WebhookQueue:
+    """SQLite-backed at-least-once queue"""
+
+    def __init__(self, path: str = settings.WEBHOOK_QUEUE_PATH, lease_seconds: float = 60.0,
+                 max_attempts: int = 5):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")  # durable across process crashes
+        self._conn.executescript(SCHEMA)
+
+    def enqueue(self, event_id: Optional[str], event_type: str, payload: bytes) -> bool:
+        """Append an event; returns False for a redelivery of an event already queued"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO webhook_events (event_id, event_type, payload, received_at) "
+                "VALUES (?, ?, ?, ?)",
+                (event_id, event_type, payload, time.time())
+            )
+            return cursor.rowcount == 1
+
+    def claim(self, batch_size: int) -> List[Dict[str, Any]]:
+        """Lease up to batch_size pending events (expired leases are reclaimed)"""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id, event_id, event_type, payload, attempts FROM webhook_events "
+                    "WHERE done = 0 AND attempts < ? AND (claimed_at IS NULL OR claimed_at < ?) "
+                    "ORDER BY id LIMIT ?",
+                    (self.max_attempts, now - self.lease_seconds, batch_size)
+                ).fetchall()
+                if rows:
+                    self._conn.executemany(
+                        "UPDATE webhook_events SET claimed_at = ?, attempts = attempts + 1 WHERE id = ?",
+                        [(now, row[0]) for row in rows]
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return [
+            {"id": row[0], "event_id": row[1], "event_type": row[2], "payload": row[3], "attempts": row[4] + 1}
+            for row in rows
+        ]
+
+    def ack(self, ids: List[int]):
+        with self._lock:
+            self._conn.executemany("UPDATE webhook_events SET done = 1 WHERE id = ?", [(i,) for i in ids])
+
+    def release(self, ids: List[int]):
+        """Give events back for a retry without waiting for the lease to expire"""
+        with self._lock:
+            self._conn.executemany("UPDATE webhook_events SET claimed_at = NULL WHERE id = ?", [(i,) for i in ids])
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM webhook_events WHERE done = 0").fetchone()[0]
+
+    def purge_done(self, older_than_seconds: float = 7 * 24 * 3600) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM webhook_events WHERE done = 1 AND received_at < ?",
+                (time.time() - older_than_seconds,)
+            )
+            return cursor.rowcount
+
+
+@lru_cache()
+def get_webhook_queue() -> WebhookQueue:
+    """Process-wide queue (the SQLite file is opened on first use)"""
+    return WebhookQueue()
+
+
+def payment_entity(event: Dict[str, Any]) -> Dict[str, Any]:
+    return event.get("payload", {}).get("payment", {}).get("entity", {})
+
+
+class WebhookProcessor:
+    """Worker pool draining the queue into the transactions ledger"""
+
+    def __init__(
+            self,
+            queue: WebhookQueue,
+            transaction_service,
+            workers: int = settings.WEBHOOK_WORKERS,
+            batch_size: int = settings.WEBHOOK_BATCH_SIZE,
+            idle_sleep: float = 0.2
+    ):
+        self.queue = queue
+        self.transaction_service = transaction_service
+        self.workers = workers
+        self.batch_size = batch_size
+        self.idle_sleep = idle_sleep
+        self._tasks: List[asyncio.Task] = []
+        self._stopping = False
+
+    def start(self):
+        self._stopping = False
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self):
+        while not self._stopping:
+            batch = await run_in_threadpool(self.queue.claim, self.batch_size)
+            if not batch:
+                await asyncio.sleep(self.idle_sleep)
+                continue
+            ids = [event["id"] for event in batch]
+            try:
+                await run_in_threadpool(self._apply_batch_blocking, batch)
+                await run_in_threadpool(self.queue.ack, ids)
+            except asyncio.CancelledError:
+                # Shutting down: release inline, the threadpool may already be gone
+                self.queue.release(ids)
+                raise
+            except Exception as e:
+                print(f"Error applying webhook batch: {e}")
+                await run_in_threadpool(self.queue.release, ids)
+                await asyncio.sleep(self.idle_sleep)
+
+    def _apply_batch_blocking(self, batch: List[Dict[str, Any]]):
+        """
+        Run apply_batch to completion in the calling worker thread
+
+        The ledger methods are coroutines around blocking Supabase calls, so
+        they get a private event loop here instead of stalling the server's.
+        """
+        asyncio.run(self.apply_batch(batch))
+
+    async def apply_batch(self, batch: List[Dict[str, Any]]):
+        """
+        Apply a batch with one ledger read, a conditional update per newly paid
+        order and bulk writes for failures and bookings
+
+        The writes are guarded in the database (never touching a paid row), so a
+        /verify landing between the read and the writes keeps its row as written.
+        """
+        paid: Dict[str, Dict[str, Any]] = {}
+        failed: Dict[str, Dict[str, Any]] = {}
+        for row in batch:
+            payment = payment_entity(orjson.loads(row["payload"]))
+            order_id = payment.get("order_id")
+            if not order_id:
+                continue
+            if row["event_type"] in PAID_EVENTS:
+                paid[order_id] = payment
+                failed.pop(order_id, None)
+            elif row["event_type"] in FAILED_EVENTS and order_id not in paid:
+                failed[order_id] = payment
+
+        if not paid and not failed:
+            return
+
+        transactions = await self.transaction_service.get_by_order_ids(list(paid) + list(failed))
+
+        paid_bookings = set()
+        for order_id, payment in paid.items():
+            transaction = transactions.get(order_id)
+            if not transaction or transaction["status"] == "paid":
+                continue
+            updated = await self.transaction_service.mark_paid(transaction["id"], {
+                "razorpay_payment_id": payment.get("id"),
+                "transaction_id": payment.get("id")
+            })
+            if updated:
+                paid_bookings.add(transaction["booking_id"])
+
+        failed_ids = [
+            transactions[order_id]["id"] for order_id in failed
+            if order_id in transactions and transactions[order_id]["status"] not in ("paid", "failed")
+        ]
+        await self.transaction_service.mark_failed(failed_ids)
+        await self.transaction_service.mark_bookings_paid(paid_bookings)
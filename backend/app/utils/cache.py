@@ -0,0 +1,193 @@
+"""
+Two-tier cache: an in-memory LRU in front of a persistent SQLite store.
+
+Hot keys are served from memory; everything written survives restarts on
+disk and is promoted back into memory on first use. Values must be
+JSON-serializable (they are stored with orjson).
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Hashable, Iterable, Optional
+import orjson
+
+# Returned by LRUCache.get on a miss, so None can be cached as a value
+MISSING = object()
+
+
+class LRUCache:
+    """Bounded in-memory cache with least-recently-used eviction"""
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = MISSING) -> Any:
+        try:
+            self._data.move_to_end(key)
+        except KeyError:
+            return default
+        return self._data[key]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = value
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+
+
+class DiskCache:
+    """SQLite key/value store with optional expiry"""
+
+    def __init__(self, path: str, table: str = "cache"):
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            f"(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL)"
+        )
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT value, expires_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return MISSING
+        return orjson.loads(row[0])
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, value, expires_at FROM {self.table} "
+                    f"WHERE key IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+            for key, value, expires_at in rows:
+                if expires_at is None or expires_at >= now:
+                    found[key] = orjson.loads(value)
+        return found
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None):
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, expires_at) VALUES (?, ?, ?)",
+                [(key, orjson.dumps(value), expires_at) for key, value in items.items()]
+            )
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute(
+                f"DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),)
+            )
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+
+class TieredCache:
+    """LRU in memory, SQLite on disk (the TTL applies to both tiers)"""
+
+    def __init__(self, path: str, maxsize: int = 10000, ttl: Optional[float] = None, table: str = "cache"):
+        self.memory = LRUCache(maxsize)
+        self.disk = DiskCache(path, table)
+        self.ttl = ttl
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    def _from_memory(self, key: str) -> Any:
+        entry = self.memory.get(key)
+        if entry is MISSING:
+            return MISSING
+        value, expires_at = entry
+        if expires_at is not None and expires_at < time.time():
+            self.memory.pop(key)
+            return MISSING
+        return value
+
+    def _to_memory(self, key: str, value: Any):
+        self.memory.set(key, (value, time.time() + self.ttl if self.ttl else None))
+
+    def get(self, key: str) -> Any:
+        """Cached value, or MISSING"""
+        value = self._from_memory(key)
+        if value is not MISSING:
+            self.stats["memory_hits"] += 1
+            return value
+
+        value = self.disk.get(key)
+        if value is MISSING:
+            self.stats["misses"] += 1
+            return MISSING
+
+        self.stats["disk_hits"] += 1
+        self._to_memory(key, value)
+        return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Cached values for the keys that are present (one disk query for the memory misses)"""
+        found, disk_keys = {}, []
+        for key in keys:
+            value = self._from_memory(key)
+            if value is MISSING:
+                disk_keys.append(key)
+            else:
+                found[key] = value
+        self.stats["memory_hits"] += len(found)
+
+        if disk_keys:
+            from_disk = self.disk.get_many(disk_keys)
+            for key, value in from_disk.items():
+                self._to_memory(key, value)
+            found.update(from_disk)
+            self.stats["disk_hits"] += len(from_disk)
+            self.stats["misses"] += len(disk_keys) - len(from_disk)
+        return found
+
+    def set(self, key: str, value: Any):
+        self._to_memory(key, value)
+        self.disk.set(key, value, self.ttl)
+
+    def set_many(self, items: Dict[str, Any]):
+        for key, value in items.items():
+            self._to_memory(key, value)
+        self.disk.set_many(items, self.ttl)
+
+    def delete(self, key: str):
+        self.memory.pop(key)
+        self.disk.delete(key)
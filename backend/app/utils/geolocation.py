@@ -5,9 +5,9 @@ Handles location calculations, distance, and mapping
 
 import math
 from typing import Dict, List, Tuple, Optional, Any
-from geopy.distance import geodesic
-import requests
+import numpy as np
 from backend.app.core.config import settings
+from backend.app.core.features import geopy_available, google_maps_enabled
 
 # Guwahati bounding coordinates (approx)
 GUWAHATI_BOUNDS = {
@@ -17,18 +17,18 @@ GUWAHATI_BOUNDS = {
     "west": 91.65  # Min longitude
 }
 
-# Key landmarks in Guwahati with coordinates
+# Key landmarks in Guwahati with coordinates and type
 GUWAHATI_LANDMARKS = {
-    "kamakhya_temple": {"name": "Kamakhya Temple", "lat": 26.1664, "lng": 91.7065},
-    "umananda_island": {"name": "Umananda Island", "lat": 26.1897, "lng": 91.7436},
-    "brahmaputra_riverfront": {"name": "Brahmaputra Riverfront", "lat": 26.1839, "lng": 91.7464},
-    "sualkuchi": {"name": "Sualkuchi Silk Village", "lat": 26.1700, "lng": 91.7500},
-    "pan_bazaar": {"name": "Pan Bazaar", "lat": 26.1864, "lng": 91.7432},
-    "dighalipukhuri": {"name": "Dighalipukhuri Park", "lat": 26.1864, "lng": 91.7432},
-    "kaziranga": {"name": "Kaziranga National Park", "lat": 26.5727, "lng": 93.1720},  # Nearby attraction
-    "assam_state_museum": {"name": "Assam State Museum", "lat": 26.1872, "lng": 91.7461},
-    "guwahati_railway_station": {"name": "Guwahati Railway Station", "lat": 26.1852, "lng": 91.7511},
-    "lokpriya_gopinath_bordoloi_airport": {"name": "LGBI Airport", "lat": 26.1065, "lng": 91.5859}
+    "kamakhya_temple": {"name": "Kamakhya Temple", "lat": 26.1664, "lng": 91.7065, "type": "temple"},
+    "umananda_island": {"name": "Umananda Island", "lat": 26.1897, "lng": 91.7436, "type": "temple"},
+    "brahmaputra_riverfront": {"name": "Brahmaputra Riverfront", "lat": 26.1839, "lng": 91.7464, "type": "riverfront"},
+    "sualkuchi": {"name": "Sualkuchi Silk Village", "lat": 26.1700, "lng": 91.7500, "type": "craft_village"},
+    "pan_bazaar": {"name": "Pan Bazaar", "lat": 26.1864, "lng": 91.7432, "type": "market"},
+    "dighalipukhuri": {"name": "Dighalipukhuri Park", "lat": 26.1864, "lng": 91.7432, "type": "park"},
+    "kaziranga": {"name": "Kaziranga National Park", "lat": 26.5727, "lng": 93.1720, "type": "national_park"},  # Nearby attraction
+    "assam_state_museum": {"name": "Assam State Museum", "lat": 26.1872, "lng": 91.7461, "type": "museum"},
+    "guwahati_railway_station": {"name": "Guwahati Railway Station", "lat": 26.1852, "lng": 91.7511, "type": "transport"},
+    "lokpriya_gopinath_bordoloi_airport": {"name": "LGBI Airport", "lat": 26.1065, "lng": 91.5859, "type": "transport"}
 }
 
 # Meeting points for itineraries
@@ -67,6 +67,153 @@ MEETING_POINTS = {
     }
 }
 
+# Safety model inputs (mock data; the safety raster is built from these)
+POLICE_STATIONS = [
+    {"name": "Pan Bazaar Police Station", "lat": 26.1870, "lng": 91.7440},
+    {"name": "Paltan Bazaar Police Station", "lat": 26.1840, "lng": 91.7480}
+]
+
+TOURIST_AREAS = [
+    {"name": "Kamakhya Temple Area", "lat": 26.1664, "lng": 91.7065},
+    {"name": "Riverfront Area", "lat": 26.1839, "lng": 91.7464}
+]
+
+# Street-lit corridors as (lat, lng) polylines
+LIT_ROADS = {
+    "gs_road": [(26.1852, 91.7511), (26.1766, 91.7597), (26.1627, 91.7718), (26.1447, 91.7868)],
+    "at_road": [(26.1852, 91.7511), (26.1866, 91.7386), (26.1840, 91.7250), (26.1776, 91.7114)],
+    "mg_road_riverfront": [(26.1897, 91.7330), (26.1878, 91.7420), (26.1839, 91.7464), (26.1830, 91.7560)],
+    "kamakhya_approach": [(26.1776, 91.7114), (26.1720, 91.7085), (26.1665, 91.7065)],
+    "pan_bazaar": [(26.1864, 91.7432), (26.1872, 91.7461), (26.1852, 91.7511)]
+}
+LIT_ROAD_WIDTH_KM = 0.15  # Cells this close to a lit corridor count as lit
+
+# Average speeds in km/h
+TRAVEL_SPEEDS_KMH = {
+    "walking": 4,
+    "bicycling": 15,
+    "driving": 30,
+    "auto": 20  # Auto-rickshaw
+}
+
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+GEOHASH_INDEX = {c: i for i, c in enumerate(GEOHASH_ALPHABET)}
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 7) -> str:
+    """
+    Encode coordinates as a geohash
+
+    Args:
+        lat, lng: Coordinates
+        precision: Number of characters (7 is a ~150m x 150m cell)
+
+    Returns:
+        Geohash string
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True  # Bits alternate longitude, latitude
+
+    while len(chars) < precision:
+        rng, coord = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if coord >= mid:
+            value = (value << 1) | 1
+            rng[0] = mid
+        else:
+            value <<= 1
+            rng[1] = mid
+        even = not even
+
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Dict[str, float]:
+    """
+    Bounding box of a geohash cell
+
+    Returns:
+        Dictionary with north, south, east and west
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        value = GEOHASH_INDEX[char]
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (value >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+
+    return {"north": lat_range[1], "south": lat_range[0], "east": lng_range[1], "west": lng_range[0]}
+
+
+def geohash_decode(geohash: str) -> Tuple[float, float]:
+    """Center (lat, lng) of a geohash cell"""
+    bounds = geohash_bounds(geohash)
+    return (bounds["north"] + bounds["south"]) / 2, (bounds["east"] + bounds["west"]) / 2
+
+
+# Web Mercator (slippy map tiles): latitudes beyond this don't fit the square world
+MERCATOR_MAX_LAT = 85.05112878
+
+
+def mercator_project(lat: float, lng: float) -> Tuple[float, float]:
+    """
+    Web Mercator position in the unit square
+
+    Returns:
+        (x, y) with x growing east and y growing south, both in [0, 1]
+    """
+    lat = max(-MERCATOR_MAX_LAT, min(MERCATOR_MAX_LAT, lat))
+    sin_lat = math.sin(math.radians(lat))
+    x = (lng + 180) / 360
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return x, y
+
+
+def mercator_unproject(x: float, y: float) -> Tuple[float, float]:
+    """Inverse of mercator_project: (lat, lng) of a unit-square position"""
+    lng = x * 360 - 180
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return lat, lng
+
+
+def tile_for_point(lat: float, lng: float, zoom: int) -> Tuple[int, int]:
+    """(x, y) of the z/x/y map tile containing a point"""
+    x, y = mercator_project(lat, lng)
+    n = 1 << zoom
+    return min(int(x * n), n - 1), min(int(y * n), n - 1)
+
+
+def tile_bounds(zoom: int, x: int, y: int) -> Dict[str, float]:
+    """
+    Bounding box of a z/x/y map tile
+
+    Returns:
+        Dictionary with north, south, east and west
+    """
+    n = 1 << zoom
+    north, west = mercator_unproject(x / n, y / n)
+    south, east = mercator_unproject((x + 1) / n, (y + 1) / n)
+    return {"north": north, "south": south, "east": east, "west": west}
+
 
 def haversine_distance(
         lat1: float,
@@ -104,6 +251,22 @@ def haversine_distance(
     return c * r
 
 
+def haversine_array(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """
+    Haversine distance in kilometers over NumPy arrays (broadcasting)
+
+    Args:
+        lat1, lng1: Latitudes and longitudes of the first points (in degrees)
+        lat2, lng2: Latitudes and longitudes of the second points (in degrees)
+
+    Returns:
+        Array of distances in kilometers
+    """
+    lat1, lng1, lat2, lng2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lng1, lat2, lng2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
 def calculate_distance(
         point1: Tuple[float, float],
         point2: Tuple[float, float],
@@ -115,7 +278,7 @@ def calculate_distance(
     Args:
         point1: Tuple of (latitude, longitude)
         point2: Tuple of (latitude, longitude)
-        method: "haversine" (default) or "geopy" if installed
+        method: "haversine" (default) or "geopy" (geodesic, if geopy is installed)
 
     Returns:
         Distance in kilometers
@@ -123,78 +286,83 @@ def calculate_distance(
     lat1, lon1 = point1
     lat2, lon2 = point2
 
-    if method == "geopy" and 'geopy' in globals():
+    if method == "geopy" and geopy_available():
+        # Imported on use: geopy (and requests, which it loads) is not needed for anything else
+        from geopy.distance import geodesic
         return geodesic(point1, point2).kilometers
     else:
         return haversine_distance(lat1, lon1, lat2, lon2)
 
 
-def is_within_guwahati(lat: float, lng: float, buffer_km: float = 5.0) -> bool:
+def is_within_guwahati(lat: float, lng: float, area_id: str = "guwahati") -> bool:
     """
-    Check if coordinates are within Guwahati area (with buffer)
+    Check if coordinates are within the Guwahati service area
 
     Args:
         lat: Latitude
         lng: Longitude
-        buffer_km: Buffer distance in kilometers
+        area_id: Service area polygon to check (see service_areas)
 
     Returns:
-        True if within Guwahati area
+        True if within the service area
     """
-    # Simple bounding box check
-    if not (GUWAHATI_BOUNDS["south"] <= lat <= GUWAHATI_BOUNDS["north"]):
-        return False
-    if not (GUWAHATI_BOUNDS["west"] <= lng <= GUWAHATI_BOUNDS["east"]):
-        return False
-
-    # Optional: Check distance from city center
-    city_center = (26.1839, 91.7464)  # Brahmaputra riverfront
-    distance = calculate_distance((lat, lng), city_center)
+    from backend.app.utils.service_areas import get_service_areas
 
-    return distance <= (20 + buffer_km)  # Within ~20km of city center
+    return get_service_areas().contains(area_id, lat, lng)
 
 
-def find_nearest_landmark(lat: float, lng: float) -> Dict[str, Any]:
+def find_nearest_landmark(lat: float, lng: float, types: Optional[List[str]] = None) -> Dict[str, Any]:
     """
     Find the nearest landmark to given coordinates
 
     Args:
         lat: Latitude
         lng: Longitude
+        types: Only landmarks of these types (e.g. ["temple", "market"])
 
     Returns:
         Dictionary with landmark info and distance
     """
-    nearest = None
-    min_distance = float('inf')
-
-    for landmark_id, landmark in GUWAHATI_LANDMARKS.items():
-        distance = calculate_distance(
-            (lat, lng),
-            (landmark["lat"], landmark["lng"])
-        )
-
-        if distance < min_distance:
-            min_distance = distance
-            nearest = {
-                "id": landmark_id,
-                "name": landmark["name"],
-                "distance_km": round(distance, 2),
-                "coordinates": {"lat": landmark["lat"], "lng": landmark["lng"]}
-            }
-
-    return nearest if nearest else {
-        "id": "unknown",
-        "name": "Unknown Location",
-        "distance_km": 0,
-        "coordinates": {"lat": lat, "lng": lng}
+    from backend.app.utils.spatial_index import get_point_index
+
+    nearest = get_point_index("landmark").nearest(lat, lng, k=1, types=types)
+    if not nearest:
+        return {
+            "id": "unknown",
+            "name": "Unknown Location",
+            "distance_km": 0,
+            "coordinates": {"lat": lat, "lng": lng}
+        }
+
+    landmark = nearest[0]
+    return {
+        "id": landmark["id"],
+        "name": landmark["name"],
+        "type": landmark["type"],
+        "distance_km": landmark["distance_km"],
+        "coordinates": {"lat": landmark["lat"], "lng": landmark["lng"]}
+    }
+
+
+def meeting_point_result(point: Dict[str, Any]) -> Dict[str, Any]:
+    """Meeting point as returned by get_safe_meeting_points, from a spatial index result"""
+    return {
+        "id": point["id"],
+        "name": point["name"],
+        "address": point["address"],
+        "type": point["type"],
+        "distance_km": point["distance_km"],
+        "coordinates": {"lat": point["lat"], "lng": point["lng"]},
+        "walking_time_minutes": int(point["distance_km"] * 15)  # Approx 4km/h walking speed
     }
 
 
 def get_safe_meeting_points(
         lat: float,
         lng: float,
-        max_distance_km: float = 3.0
+        max_distance_km: float = 3.0,
+        types: Optional[List[str]] = None,
+        limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """
     Get safe meeting points near given coordinates
@@ -203,33 +371,41 @@ def get_safe_meeting_points(
         lat: User's latitude
         lng: User's longitude
         max_distance_km: Maximum distance in kilometers
+        types: Only meeting points of these types (e.g. ["temple", "riverfront"])
+        limit: Maximum number of meeting points (nearest first)
 
     Returns:
-        List of safe meeting points with distances
+        List of safe meeting points with distances, nearest first
     """
-    safe_points = []
+    from backend.app.utils.spatial_index import get_point_index
 
-    for point_id, point in MEETING_POINTS.items():
-        distance = calculate_distance(
-            (lat, lng),
-            (point["lat"], point["lng"])
-        )
+    points = get_point_index("meeting_point").within(lat, lng, max_distance_km, types, limit)
+    return [meeting_point_result(point) for point in points]
 
-        if distance <= max_distance_km:
-            safe_points.append({
-                "id": point_id,
-                "name": point["name"],
-                "address": point["address"],
-                "type": point["type"],
-                "distance_km": round(distance, 2),
-                "coordinates": {"lat": point["lat"], "lng": point["lng"]},
-                "walking_time_minutes": int(distance * 15)  # Approx 4km/h walking speed
-            })
 
-    # Sort by distance
-    safe_points.sort(key=lambda x: x["distance_km"])
+def travel_estimate(
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        mode: str = "walking"
+) -> Tuple[float, float, str]:
+    """
+    Distance and travel time between two points, over the road network when available
 
-    return safe_points
+    Returns:
+        (distance_km, minutes, source) where source is "road_network" or
+        "straight_line" (no routing graph, unsupported mode or off the network)
+    """
+    from backend.app.services.routing_engine import get_road_router
+
+    router = get_road_router()
+    if router is not None:
+        route = router.route(start, end, mode)
+        if route is not None:
+            return route["distance_km"], route["duration_minutes"], "road_network"
+
+    distance_km = calculate_distance(start, end)
+    speed = TRAVEL_SPEEDS_KMH.get(mode, 4)  # Default to walking
+    return distance_km, distance_km / speed * 60, "straight_line"
 
 
 def calculate_travel_time(
@@ -245,40 +421,88 @@ def calculate_travel_time(
     Args:
         start_lat, start_lng: Starting coordinates
         end_lat, end_lng: Ending coordinates
-        mode: "walking", "driving", or "bicycling"
+        mode: "walking", "driving", "auto" or "bicycling"
 
     Returns:
-        Dictionary with distance and estimated time
+        Dictionary with distance, estimated time and whether they follow
+        roads or a straight line
     """
-    distance_km = calculate_distance(
+    distance_km, travel_time_minutes, source = travel_estimate(
         (start_lat, start_lng),
-        (end_lat, end_lng)
+        (end_lat, end_lng),
+        mode
     )
 
-    # Average speeds in km/h
-    speeds = {
-        "walking": 4,
-        "bicycling": 15,
-        "driving": 30,
-        "auto": 20  # Auto-rickshaw
-    }
-
-    speed = speeds.get(mode, 4)  # Default to walking
-    travel_time_hours = distance_km / speed
-    travel_time_minutes = travel_time_hours * 60
+    if source == "road_network" and travel_time_minutes > 0:
+        speed = round(distance_km / travel_time_minutes * 60, 1)
+    else:
+        speed = TRAVEL_SPEEDS_KMH.get(mode, 4)
 
     return {
         "distance_km": round(distance_km, 2),
         "estimated_time_minutes": int(travel_time_minutes),
         "mode": mode,
-        "speed_kmh": speed
+        "speed_kmh": speed,
+        "route_source": source
+    }
+
+
+def mock_address(lat: float, lng: float) -> Dict[str, Any]:
+    """Development address (no Google Maps key): the nearest landmark"""
+    landmark = find_nearest_landmark(lat, lng)
+    return {
+        "formatted_address": f"Near {landmark['name']}, Guwahati, Assam",
+        "landmark": landmark["name"],
+        "city": "Guwahati",
+        "state": "Assam",
+        "country": "India"
     }
 
 
-def get_address_from_coordinates(lat: float, lng: float) -> Optional[Dict[str, Any]]:
+def parse_geocode_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract address fields from a Google geocode result
+
+    Args:
+        result: One entry of the geocode response's "results"
+
+    Returns:
+        Address information
+    """
+    address_info = {
+        "formatted_address": result.get("formatted_address", ""),
+        "street": "",
+        "area": "",
+        "city": "",
+        "state": "",
+        "country": "",
+        "postal_code": ""
+    }
+
+    for component in result.get("address_components", []):
+        types = component.get("types", [])
+        if "route" in types:
+            address_info["street"] = component.get("long_name", "")
+        elif "sublocality" in types or "neighborhood" in types:
+            address_info["area"] = component.get("long_name", "")
+        elif "locality" in types:
+            address_info["city"] = component.get("long_name", "")
+        elif "administrative_area_level_1" in types:
+            address_info["state"] = component.get("long_name", "")
+        elif "country" in types:
+            address_info["country"] = component.get("long_name", "")
+        elif "postal_code" in types:
+            address_info["postal_code"] = component.get("long_name", "")
+
+    return address_info
+
+
+async def get_address_from_coordinates(lat: float, lng: float) -> Optional[Dict[str, Any]]:
     """
     Reverse geocode coordinates to get address (using Google Maps API if available)
 
+    Lookups are cached per geohash cell (GEOCODE_PRECISION), see GeocodingService.
+
     Args:
         lat: Latitude
         lng: Longitude
@@ -286,62 +510,9 @@ def get_address_from_coordinates(lat: float, lng: float) -> Optional[Dict[str, A
     Returns:
         Address information or None
     """
-    if not settings.GOOGLE_MAPS_API_KEY:
-        # Return mock address for development
-        landmark = find_nearest_landmark(lat, lng)
-        return {
-            "formatted_address": f"Near {landmark['name']}, Guwahati, Assam",
-            "landmark": landmark["name"],
-            "city": "Guwahati",
-            "state": "Assam",
-            "country": "India"
-        }
-
-    try:
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
-        params = {
-            "latlng": f"{lat},{lng}",
-            "key": settings.GOOGLE_MAPS_API_KEY
-        }
+    from backend.app.services.geocoding_service import get_geocoding_service
 
-        response = requests.get(url, params=params)
-        data = response.json()
-
-        if data["status"] == "OK" and data["results"]:
-            result = data["results"][0]
-            address_components = result.get("address_components", [])
-
-            # Extract address components
-            address_info = {
-                "formatted_address": result.get("formatted_address", ""),
-                "street": "",
-                "area": "",
-                "city": "",
-                "state": "",
-                "country": "",
-                "postal_code": ""
-            }
-
-            for component in address_components:
-                types = component.get("types", [])
-                if "route" in types:
-                    address_info["street"] = component.get("long_name", "")
-                elif "sublocality" in types or "neighborhood" in types:
-                    address_info["area"] = component.get("long_name", "")
-                elif "locality" in types:
-                    address_info["city"] = component.get("long_name", "")
-                elif "administrative_area_level_1" in types:
-                    address_info["state"] = component.get("long_name", "")
-                elif "country" in types:
-                    address_info["country"] = component.get("long_name", "")
-                elif "postal_code" in types:
-                    address_info["postal_code"] = component.get("long_name", "")
-
-            return address_info
-    except Exception as e:
-        print(f"Error reverse geocoding: {e}")
-
-    return None
+    return await get_geocoding_service().reverse_geocode(lat, lng)
 
 
 def suggest_itinerary_route(
@@ -376,17 +547,19 @@ def suggest_itinerary_route(
     total_time = 0
 
     while unvisited:
-        # Find nearest unvisited stop
+        # Find the unvisited stop quickest to walk to (over roads when the routing graph is built)
         nearest = None
-        min_distance = float('inf')
+        min_time = float('inf')
+        min_distance = 0
 
         for stop in unvisited:
-            distance = calculate_distance(
+            distance, minutes, _ = travel_estimate(
                 (current_point["coordinates"]["lat"], current_point["coordinates"]["lng"]),
                 (stop["coordinates"]["lat"], stop["coordinates"]["lng"])
             )
 
-            if distance < min_distance:
+            if minutes < min_time:
+                min_time = minutes
                 min_distance = distance
                 nearest = stop
 
@@ -395,8 +568,7 @@ def suggest_itinerary_route(
             unvisited.remove(nearest)
 
             total_distance += min_distance
-            # Estimate 4km/h walking speed
-            total_time += (min_distance / 4) * 60
+            total_time += min_time
 
             current_point = nearest
 
@@ -504,8 +676,8 @@ def get_weather_at_location(lat: float, lng: float) -> Optional[Dict[str, Any]]:
         "condition": season_info["condition"],
         "season": season_info["season"],
         "humidity": "75%" if season_info["condition"] == "Humid" else "65%",
-        "recommendation": self._get_weather_recommendation(season_info["condition"]),
-        "icon": self._get_weather_icon(season_info["condition"])
+        "recommendation": _get_weather_recommendation(season_info["condition"]),
+        "icon": _get_weather_icon(season_info["condition"])
     }
 
 
@@ -531,63 +703,34 @@ def _get_weather_icon(condition: str) -> str:
     return icons.get(condition, "🌤️")
 
 
-def calculate_safety_score(
-        lat: float,
-        lng: float,
-        time_of_day: str = "day"
-) -> Dict[str, Any]:
+def safety_factors(police_distance_km: float, in_tourist_area: bool, is_lit: bool,
+                   time_of_day: str = "day") -> Tuple[int, List[Dict[str, str]]]:
     """
-    Calculate safety score for a location
+    Score a location from its safety inputs
 
     Args:
-        lat, lng: Coordinates
+        police_distance_km: Distance to the nearest police station
+        in_tourist_area: Within 2km of a tourist area
+        is_lit: On a street-lit corridor (only counts at night)
         time_of_day: "day" or "night"
 
     Returns:
-        Safety score and recommendations
+        (unclamped score, factors)
     """
-    # Factors affecting safety score
     factors = []
     score = 10  # Start with perfect score
 
-    # Check if near police station (mock data)
-    police_stations = [
-        {"name": "Pan Bazaar Police Station", "lat": 26.1870, "lng": 91.7440},
-        {"name": "Paltan Bazaar Police Station", "lat": 26.1840, "lng": 91.7480}
-    ]
-
-    nearest_police = None
-    min_police_distance = float('inf')
-
-    for station in police_stations:
-        distance = calculate_distance((lat, lng), (station["lat"], station["lng"]))
-        if distance < min_police_distance:
-            min_police_distance = distance
-            nearest_police = station
-
-    if min_police_distance <= 1.0:  # Within 1km of police station
+    if police_distance_km <= 1.0:  # Within 1km of police station
         factors.append({"factor": "Police proximity", "impact": "+2", "note": "Close to police station"})
         score += 2
-    elif min_police_distance <= 3.0:
+    elif police_distance_km <= 3.0:
         factors.append({"factor": "Police proximity", "impact": "+1", "note": "Moderately close to police station"})
         score += 1
     else:
         factors.append({"factor": "Police proximity", "impact": "-1", "note": "Far from police station"})
         score -= 1
 
-    # Check if in tourist area
-    tourist_areas = [
-        {"name": "Kamakhya Temple Area", "lat": 26.1664, "lng": 91.7065},
-        {"name": "Riverfront Area", "lat": 26.1839, "lng": 91.7464}
-    ]
-
-    is_tourist_area = False
-    for area in tourist_areas:
-        if calculate_distance((lat, lng), (area["lat"], area["lng"])) <= 2.0:
-            is_tourist_area = True
-            break
-
-    if is_tourist_area:
+    if in_tourist_area:
         factors.append({"factor": "Tourist area", "impact": "+1", "note": "Popular tourist location"})
         score += 1
     else:
@@ -597,32 +740,72 @@ def calculate_safety_score(
     if time_of_day == "night":
         factors.append({"factor": "Time of day", "impact": "-2", "note": "Night time - extra caution needed"})
         score -= 2
+        if is_lit:
+            factors.append({"factor": "Street lighting", "impact": "+1", "note": "Well-lit main road"})
+            score += 1
+
+    return score, factors
+
 
-    # Calculate safety level
+def safety_level(score: int) -> Tuple[str, str]:
+    """(level, color) for a safety score"""
     if score >= 9:
-        safety_level = "Very Safe"
-        color = "green"
+        return "Very Safe", "green"
     elif score >= 7:
-        safety_level = "Safe"
-        color = "lightgreen"
+        return "Safe", "lightgreen"
     elif score >= 5:
-        safety_level = "Moderate"
-        color = "yellow"
+        return "Moderate", "yellow"
     elif score >= 3:
-        safety_level = "Caution"
-        color = "orange"
-    else:
-        safety_level = "Avoid"
-        color = "red"
+        return "Caution", "orange"
+    return "Avoid", "red"
+
+
+def calculate_safety_score(
+        lat: float,
+        lng: float,
+        time_of_day: str = "day"
+) -> Dict[str, Any]:
+    """
+    Calculate safety score for a location
+
+    Inside GUWAHATI_BOUNDS the inputs come from the precomputed safety raster
+    (one array lookup); elsewhere they are computed directly.
+
+    Args:
+        lat, lng: Coordinates
+        time_of_day: "day" or "night"
+
+    Returns:
+        Safety score and recommendations
+    """
+    from backend.app.utils.safety_raster import get_safety_raster
+
+    inputs = get_safety_raster().inputs_at(lat, lng)
+    if inputs is None:
+        distances = [calculate_distance((lat, lng), (s["lat"], s["lng"])) for s in POLICE_STATIONS]
+        police_index = distances.index(min(distances))
+        inputs = {
+            "police_index": police_index,
+            "police_distance_km": distances[police_index],
+            "tourist_area": any(
+                calculate_distance((lat, lng), (area["lat"], area["lng"])) <= 2.0 for area in TOURIST_AREAS
+            ),
+            "lit": False
+        }
+
+    score, factors = safety_factors(
+        inputs["police_distance_km"], inputs["tourist_area"], inputs["lit"], time_of_day
+    )
+    level, color = safety_level(score)
 
     return {
         "safety_score": max(1, min(10, score)),  # Clamp between 1-10
-        "safety_level": safety_level,
+        "safety_level": level,
         "color": color,
         "factors": factors,
-        "recommendations": self._get_safety_recommendations(score, time_of_day),
-        "nearest_police": nearest_police,
-        "police_distance_km": round(min_police_distance, 2) if nearest_police else None
+        "recommendations": _get_safety_recommendations(score, time_of_day),
+        "nearest_police": POLICE_STATIONS[inputs["police_index"]],
+        "police_distance_km": round(inputs["police_distance_km"], 2)
     }
 
 
@@ -666,7 +849,7 @@ def generate_map_url(
     Returns:
         Google Maps URL
     """
-    if settings.GOOGLE_MAPS_API_KEY:
+    if google_maps_enabled():
         # Embedded map with API key
         return f"https://www.google.com/maps/embed/v1/view?key={settings.GOOGLE_MAPS_API_KEY}&center={lat},{lng}&zoom={zoom}&maptype={map_type}"
     else:
@@ -689,20 +872,37 @@ def get_weather_icon(condition: str) -> str:
 
 # Export constants and functions
 __all__ = [
+    'geohash_encode',
+    'geohash_decode',
+    'geohash_bounds',
+    'mercator_project',
+    'mercator_unproject',
+    'tile_for_point',
+    'tile_bounds',
     'haversine_distance',
+    'haversine_array',
     'calculate_distance',
     'is_within_guwahati',
     'find_nearest_landmark',
     'get_safe_meeting_points',
+    'meeting_point_result',
+    'travel_estimate',
     'calculate_travel_time',
     'get_address_from_coordinates',
+    'parse_geocode_result',
     'suggest_itinerary_route',
     'validate_coordinates',
     'format_coordinates',
     'get_weather_at_location',
     'calculate_safety_score',
+    'safety_factors',
+    'safety_level',
     'generate_map_url',
     'GUWAHATI_LANDMARKS',
     'MEETING_POINTS',
-    'GUWAHATI_BOUNDS'
+    'GUWAHATI_BOUNDS',
+    'TRAVEL_SPEEDS_KMH',
+    'POLICE_STATIONS',
+    'TOURIST_AREAS',
+    'LIT_ROADS'
 ]
\ No newline at end of file
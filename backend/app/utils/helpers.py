@@ -1,18 +1,30 @@
-import json
-from typing import Any, Dict, List
-from datetime import datetime, date
+from typing import Any, Dict, Optional, Tuple
+from datetime import datetime, date, time
+import orjson
 
 
 def serialize_datetime(obj: Any) -> Any:
     """Serialize datetime objects for JSON"""
-    if isinstance(obj, (datetime, date)):
+    if isinstance(obj, (datetime, date, time)):
         return obj.isoformat()
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
+def to_json_bytes(data: Any) -> bytes:
+    """Convert data to UTF-8 JSON bytes (datetime, date and time are encoded natively)"""
+    return orjson.dumps(data, default=serialize_datetime, option=orjson.OPT_NON_STR_KEYS)
+
+
 def to_json(data: Any) -> str:
     """Convert data to JSON string with datetime support"""
-    return json.dumps(data, default=serialize_datetime)
+    return to_json_bytes(data).decode("utf-8")
+
+
+def project_fields(record: Dict[str, Any], fields: Optional[Tuple[str, ...]]) -> Dict[str, Any]:
+    """Keep only the requested fields of a record (all fields when fields is None)"""
+    if fields is None:
+        return record
+    return {name: record[name] for name in fields if name in record}
 
 
 def parse_geojson_point(lat: float, lng: float) -> str:
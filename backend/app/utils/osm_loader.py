@@ -0,0 +1,227 @@
+"""
+OpenStreetMap extract -> compact road graph (CSR arrays).
+
+Reads a local .osm XML file (optionally .gz or .bz2 compressed) with the
+standard library, keeps the highways usable by a routing profile and turns
+them into a directed graph in compressed sparse row form: for node u, its
+edges are targets[offsets[u]:offsets[u + 1]], with the travel time
+(seconds) and length (metres) of each edge alongside.
+"""
+
+import bz2
+import gzip
+import xml.etree.ElementTree as ET
+from abc import ABC, abstractmethod
+from array import array
+from dataclasses import dataclass
+from typing import Dict, IO, List, Optional, Tuple
+import numpy as np
+from backend.app.utils.geolocation import TRAVEL_SPEEDS_KMH
+
+# Car speeds (km/h) by highway class, allowing for city traffic
+CAR_SPEEDS_KMH = {
+    "motorway": 50, "motorway_link": 35,
+    "trunk": 40, "trunk_link": 30,
+    "primary": 30, "primary_link": 25,
+    "secondary": 25, "secondary_link": 20,
+    "tertiary": 22, "tertiary_link": 18,
+    "unclassified": 18, "residential": 18,
+    "living_street": 10, "service": 12
+}
+
+# Highways pedestrians can use (Indian trunk roads have no foot restriction)
+FOOT_HIGHWAYS = (set(CAR_SPEEDS_KMH) - {"motorway", "motorway_link"}) | {
+    "footway", "path", "pedestrian", "steps", "track", "corridor", "bridleway", "cycleway"
+}
+
+# Walking is slower on these (factor on the walking speed)
+FOOT_SLOWDOWN = {"steps": 0.5, "path": 0.8, "track": 0.8}
+
+NO_ACCESS = {"no", "private"}
+
+
+@dataclass
+class Profile(ABC):
+    name: str
+
+    @abstractmethod
+    def allows(self, tags: Dict[str, str]) -> bool:
+        """Whether the profile may use a way with these tags"""
+
+    @abstractmethod
+    def speed_kmh(self, tags: Dict[str, str]) -> float:
+        """Travel speed along a way with these tags"""
+
+    def directions(self, tags: Dict[str, str]) -> Tuple[bool, bool]:
+        """(forward, backward) along the way's node order"""
+        return True, True
+
+
+class FootProfile(Profile):
+    def allows(self, tags):
+        foot = tags.get("foot")
+        if foot in {"yes", "designated", "permissive"}:
+            return True
+        return tags.get("highway") in FOOT_HIGHWAYS and foot not in NO_ACCESS and tags.get("access") not in NO_ACCESS
+
+    def speed_kmh(self, tags):
+        return TRAVEL_SPEEDS_KMH["walking"] * FOOT_SLOWDOWN.get(tags.get("highway"), 1.0)
+
+
+class CarProfile(Profile):
+    def allows(self, tags):
+        return (tags.get("highway") in CAR_SPEEDS_KMH and tags.get("access") not in NO_ACCESS
+                and tags.get("motor_vehicle") not in NO_ACCESS and tags.get("motorcar") not in NO_ACCESS)
+
+    def speed_kmh(self, tags):
+        speed = CAR_SPEEDS_KMH[tags["highway"]]
+        maxspeed = tags.get("maxspeed", "").split(" ")[0]
+        return min(speed, float(maxspeed)) if maxspeed.isdigit() and float(maxspeed) > 0 else speed
+
+    def directions(self, tags):
+        oneway = tags.get("oneway", "no")
+        if oneway in {"yes", "true", "1"} or tags.get("junction") == "roundabout":
+            return True, False
+        if oneway == "-1":
+            return False, True
+        return True, True
+
+
+PROFILES = {"walking": FootProfile("walking"), "driving": CarProfile("driving")}
+
+
+@dataclass
+class RoadGraph:
+    """Directed graph in CSR form"""
+    coords: np.ndarray  # (n, 2) lat, lng
+    offsets: np.ndarray  # (n + 1,) int64
+    targets: np.ndarray  # (m,) int32
+    seconds: np.ndarray  # (m,) float32
+    metres: np.ndarray  # (m,) float32
+
+    @property
+    def node_count(self) -> int:
+        return len(self.coords)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+
+@dataclass
+class OsmExtract:
+    node_ids: np.ndarray  # sorted OSM ids
+    coords: np.ndarray  # (n, 2) aligned with node_ids
+    ways: List[Tuple[List[int], Dict[str, str]]]
+
+
+def _open(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    if path.endswith(".bz2"):
+        return bz2.open(path, "rb")
+    return open(path, "rb")
+
+
+def read_osm(path: str) -> OsmExtract:
+    """Nodes and highway ways of an .osm XML file (streamed, so large extracts fit in memory)"""
+    ids, lats, lngs = array("q"), array("d"), array("d")
+    ways = []
+    with _open(path) as f:
+        refs: List[int] = []
+        tags: Dict[str, str] = {}
+        for event, element in ET.iterparse(f, events=("start", "end")):
+            tag = element.tag
+            if event == "start":
+                if tag == "way":
+                    refs, tags = [], {}
+                continue
+
+            if tag == "node":
+                ids.append(int(element.get("id")))
+                lats.append(float(element.get("lat")))
+                lngs.append(float(element.get("lon")))
+            elif tag == "nd":
+                refs.append(int(element.get("ref")))
+            elif tag == "tag":
+                tags[element.get("k")] = element.get("v")
+            elif tag == "way" and "highway" in tags and len(refs) > 1:
+                ways.append((refs, tags))
+            if tag in ("node", "way", "relation"):
+                element.clear()
+
+    node_ids = np.frombuffer(ids, dtype=np.int64)
+    order = np.argsort(node_ids, kind="stable")
+    coords = np.column_stack([np.frombuffer(lats, dtype=np.float64), np.frombuffer(lngs, dtype=np.float64)])
+    return OsmExtract(node_ids[order], coords[order], ways)
+
+
+def build_graph(extract: OsmExtract, profile: Profile) -> RoadGraph:
+    """Routing graph of the ways a profile can use, over only the nodes they touch"""
+    sources, targets, speeds = array("q"), array("q"), array("d")
+    for refs, tags in extract.ways:
+        if not profile.allows(tags):
+            continue
+        forward, backward = profile.directions(tags)
+        speed_ms = profile.speed_kmh(tags) / 3.6
+        for a, b in zip(refs, refs[1:]):
+            if forward:
+                sources.append(a)
+                targets.append(b)
+                speeds.append(speed_ms)
+            if backward:
+                sources.append(b)
+                targets.append(a)
+                speeds.append(speed_ms)
+
+    sources = np.frombuffer(sources, dtype=np.int64)
+    targets = np.frombuffer(targets, dtype=np.int64)
+    speed_ms = np.frombuffer(speeds, dtype=np.float64)
+
+    # Drop edges whose nodes are missing from the extract (clipped ways)
+    position_s = np.searchsorted(extract.node_ids, sources)
+    position_t = np.searchsorted(extract.node_ids, targets)
+    size = len(extract.node_ids)
+    present = (position_s < size) & (position_t < size)
+    present &= extract.node_ids[np.minimum(position_s, size - 1)] == sources
+    present &= extract.node_ids[np.minimum(position_t, size - 1)] == targets
+    position_s, position_t, speed_ms = position_s[present], position_t[present], speed_ms[present]
+
+    # Renumber to the nodes actually used
+    used, inverse = np.unique(np.concatenate([position_s, position_t]), return_inverse=True)
+    u, v = inverse[:len(position_s)], inverse[len(position_s):]
+    coords = extract.coords[used]
+    metres = _haversine_m(coords[u], coords[v])
+    keep = u != v
+    return csr_graph(coords, u[keep], v[keep], metres[keep] / speed_ms[keep], metres[keep])
+
+
+def csr_graph(coords: np.ndarray, u: np.ndarray, v: np.ndarray, seconds: np.ndarray, metres: np.ndarray) -> RoadGraph:
+    """CSR graph from an edge list, keeping the fastest of parallel edges"""
+    order = np.lexsort((seconds, v, u))
+    u, v, seconds, metres = u[order], v[order], seconds[order], metres[order]
+    first = np.ones(len(u), dtype=bool)
+    first[1:] = (u[1:] != u[:-1]) | (v[1:] != v[:-1])
+    u, v, seconds, metres = u[first], v[first], seconds[first], metres[first]
+
+    offsets = np.zeros(len(coords) + 1, dtype=np.int64)
+    np.add.at(offsets, u + 1, 1)
+    return RoadGraph(
+        coords=np.asarray(coords, dtype=np.float64),
+        offsets=np.cumsum(offsets),
+        targets=v.astype(np.int32),
+        seconds=seconds.astype(np.float32),
+        metres=metres.astype(np.float32)
+    )
+
+
+def _haversine_m(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    lat1, lng1, lat2, lng2 = (np.radians(x) for x in (a[:, 0], a[:, 1], b[:, 0], b[:, 1]))
+    h = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    return 2 * 6371000 * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+
+def load_graphs(path: str, profiles: Optional[List[str]] = None) -> Dict[str, RoadGraph]:
+    """Parse an extract once and build a graph per profile"""
+    extract = read_osm(path)
+    return {name: build_graph(extract, PROFILES[name]) for name in (profiles or list(PROFILES))}
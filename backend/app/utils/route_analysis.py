@@ -0,0 +1,134 @@
+"""
+Route-level analysis of an itinerary's stop sequence.
+
+Per-leg distances, ETAs for every travel mode and safety sampled along each
+leg are computed over arrays in a single pass, instead of calling
+calculate_travel_time and calculate_safety_score per pair.
+
+When a routing graph is built, leg ETAs follow the road network the same way
+calculate_travel_time does (straight line at the mode's speed for legs off
+the network), and each leg reports which one was used per mode.
+"""
+
+from typing import Any, Dict, Iterable, Optional, Sequence
+import numpy as np
+from backend.app.services.routing_engine import RoadRouter, get_road_router
+from backend.app.utils.geolocation import TRAVEL_SPEEDS_KMH, haversine_array
+from backend.app.utils.safety_raster import SafetyRaster, get_safety_raster
+from backend.app.utils.travel_matrix import ROAD_NETWORK, ROUTE_SOURCES, STRAIGHT_LINE
+
+
+def stop_coordinates(stops: Iterable[Any]) -> np.ndarray:
+    """
+    (n, 2) array of lat/lng from stops
+
+    Stops may be (lat, lng) pairs, {"lat", "lng"} dicts or dicts with a
+    "coordinates" or "meeting_point" entry (as itinerary stops have).
+    """
+    coords = []
+    for stop in stops:
+        if isinstance(stop, dict):
+            point = stop.get("coordinates") or stop.get("meeting_point") or stop
+            coords.append((point["lat"], point["lng"]))
+        else:
+            lat, lng = stop
+            coords.append((lat, lng))
+    return np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+
+
+def analyze_route(
+        stops: Sequence[Any],
+        modes: Sequence[str] = tuple(TRAVEL_SPEEDS_KMH),
+        time_of_day: str = "day",
+        sample_km: float = 0.05,
+        raster: Optional[SafetyRaster] = None,
+        max_samples: Optional[int] = None,
+        router: Optional[RoadRouter] = None
+) -> Dict[str, Any]:
+    """
+    Distance, ETA and safety for every leg of a route
+
+    Args:
+        stops: Stops in visiting order (see stop_coordinates)
+        modes: Travel modes to estimate (keys of TRAVEL_SPEEDS_KMH)
+        time_of_day: "day" or "night"
+        sample_km: Spacing of safety samples along each leg
+        raster: Safety raster (defaults to the shared one)
+        max_samples: Widen the sample spacing so a long route takes at most
+            about this many safety samples
+        router: Road router for leg ETAs (defaults to the shared one, if a
+            routing graph is built)
+
+    Returns:
+        Dictionary with "legs" and "totals". A leg's distance_km is the
+        straight line its safety is sampled along; time_minutes and
+        route_source are per mode.
+    """
+    unknown = [mode for mode in modes if mode not in TRAVEL_SPEEDS_KMH]
+    if unknown:
+        raise ValueError(f"Unknown travel mode(s): {', '.join(unknown)}")
+
+    lat_lng = stop_coordinates(stops)
+    if len(lat_lng) < 2:
+        return {
+            "legs": [],
+            "totals": {
+                "distance_km": 0,
+                "time_minutes": {mode: 0 for mode in modes},
+                "min_safety_score": None,
+                "mean_safety_score": None,
+                "weakest_point": None,
+                "stops_count": len(lat_lng)
+            }
+        }
+
+    leg_km = haversine_array(lat_lng[:-1, 0], lat_lng[:-1, 1], lat_lng[1:, 0], lat_lng[1:, 1])
+    if max_samples is not None:
+        sample_km = max(sample_km, float(leg_km.sum()) / max_samples)
+    speeds = np.array([TRAVEL_SPEEDS_KMH[mode] for mode in modes], dtype=np.float64)
+    leg_minutes = leg_km[:, None] / speeds[None, :] * 60
+    sources = np.full(leg_minutes.shape, STRAIGHT_LINE, dtype=np.int8)
+    router = router or get_road_router()
+    if router is not None:
+        coords = lat_lng.tolist()
+        for m, mode in enumerate(modes):
+            if not router.supports(mode):
+                continue
+            for i in range(len(leg_km)):
+                route = router.route(coords[i], coords[i + 1], mode)
+                if route is not None:
+                    leg_minutes[i, m] = route["duration_minutes"]
+                    sources[i, m] = ROAD_NETWORK
+    safety = (raster or get_safety_raster()).leg_safety(lat_lng, leg_km, time_of_day, sample_km)
+
+    # One conversion to Python types per column, then zip into rows
+    distances = np.round(leg_km, 2).tolist()
+    minutes = leg_minutes.astype(np.int64).tolist()
+    leg_sources = [[ROUTE_SOURCES[code] for code in row] for row in sources.tolist()]
+    minimums = [None if np.isnan(value) else int(value) for value in safety["min"]]
+    means = [None if np.isnan(value) else round(float(value), 1) for value in safety["mean"]]
+    legs = [
+        {
+            "from_index": i,
+            "to_index": i + 1,
+            "distance_km": distances[i],
+            "time_minutes": dict(zip(modes, minutes[i])),
+            "route_source": dict(zip(modes, leg_sources[i])),
+            "min_safety_score": minimums[i],
+            "mean_safety_score": means[i]
+        }
+        for i in range(len(distances))
+    ]
+
+    total_minutes = leg_minutes.sum(axis=0).astype(np.int64).tolist()
+    return {
+        "legs": legs,
+        "totals": {
+            "distance_km": round(float(leg_km.sum()), 2),
+            "time_minutes": dict(zip(modes, total_minutes)),
+            "min_safety_score": safety["min_score"],
+            "mean_safety_score": safety["mean_score"],
+            "weakest_point": safety["weakest_point"],
+            "stops_count": len(lat_lng)
+        }
+    }
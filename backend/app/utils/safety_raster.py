@@ -0,0 +1,320 @@
+"""
+Precomputed safety-score raster over GUWAHATI_BOUNDS.
+
+Each grid cell stores its safety inputs (police distance bucket, tourist area,
+street lighting) as one byte, plus the distance to and index of the nearest
+police station. A score is a lookup into a small per-time-of-day table built
+from `safety_factors`, so points, whole routes and heatmap windows are scored
+with array indexing instead of distance loops. The raster is saved as .npy
+files and memory-mapped on load; it is rebuilt when its inputs change.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.utils.geolocation import (
+    GUWAHATI_BOUNDS, LIT_ROADS, LIT_ROAD_WIDTH_KM, POLICE_STATIONS, TOURIST_AREAS,
+    haversine_array, safety_factors
+)
+
+# Bump when the encoding below changes, so saved rasters are rebuilt
+FORMAT_VERSION = 1
+
+TIMES_OF_DAY = ("day", "night")
+
+# Cell code: police bucket * 4 + tourist area * 2 + lit
+POLICE_BUCKETS = (1.0, 3.0)  # <= 1km, <= 3km, further
+TOURIST_AREA_RADIUS_KM = 2.0
+
+# Outside the raster
+NO_SCORE = 0
+
+
+def _score_table(time_of_day: str) -> np.ndarray:
+    """Unclamped score for every cell code"""
+    representative_distance = (*POLICE_BUCKETS, float("inf"))
+    table = np.zeros(len(representative_distance) * 4, dtype=np.int8)
+    for code in range(len(table)):
+        bucket, tourist, lit = code // 4, bool(code & 2), bool(code & 1)
+        table[code], _ = safety_factors(representative_distance[bucket], tourist, lit, time_of_day)
+    return table
+
+
+def _segment_distance_km(lat: np.ndarray, lng: np.ndarray, a: Tuple[float, float], b: Tuple[float, float]) -> np.ndarray:
+    """Distance from points to segment a-b (equirectangular, fine at city scale)"""
+    kx = 111.32 * np.cos(np.radians(a[0]))
+    ky = 110.57
+    px, py = (lng - a[1]) * kx, (lat - a[0]) * ky
+    bx, by = (b[1] - a[1]) * kx, (b[0] - a[0]) * ky
+    length2 = bx * bx + by * by
+    t = np.clip((px * bx + py * by) / length2, 0.0, 1.0) if length2 else 0.0
+    return np.hypot(px - t * bx, py - t * by)
+
+
+def fingerprint(bounds: Dict[str, float], resolution: float, police: Sequence[Dict[str, Any]],
+                tourist_areas: Sequence[Dict[str, Any]], lit_roads: Dict[str, List[Tuple[float, float]]]) -> str:
+    """Hash of everything the raster is built from"""
+    payload = json.dumps(
+        [FORMAT_VERSION, bounds, resolution, police, tourist_areas, lit_roads, LIT_ROAD_WIDTH_KM],
+        sort_keys=True, default=list
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class SafetyRaster:
+    """Gridded safety inputs with O(1) point, route and window queries"""
+
+    ARRAYS = ("codes", "police_km", "police_index")
+
+    def __init__(self, arrays: Dict[str, np.ndarray], bounds: Dict[str, float], resolution: float, key: str):
+        # Plain ndarray views (still backed by the mapping) index faster than np.memmap
+        self.codes = np.asarray(arrays["codes"])
+        self.police_km = np.asarray(arrays["police_km"])
+        self.police_index = np.asarray(arrays["police_index"])
+        self.bounds = dict(bounds)
+        self.resolution = resolution
+        self.key = key
+        self.rows, self.cols = self.codes.shape
+        self.tables = {time_of_day: _score_table(time_of_day) for time_of_day in TIMES_OF_DAY}
+
+    # Build and persistence
+
+    @classmethod
+    def build(
+            cls,
+            bounds: Dict[str, float] = GUWAHATI_BOUNDS,
+            resolution: float = settings.SAFETY_RASTER_RESOLUTION,
+            police: Sequence[Dict[str, Any]] = POLICE_STATIONS,
+            tourist_areas: Sequence[Dict[str, Any]] = TOURIST_AREAS,
+            lit_roads: Dict[str, List[Tuple[float, float]]] = LIT_ROADS
+    ) -> "SafetyRaster":
+        rows = int(np.ceil((bounds["north"] - bounds["south"]) / resolution))
+        cols = int(np.ceil((bounds["east"] - bounds["west"]) / resolution))
+        lat = bounds["south"] + (np.arange(rows) + 0.5) * resolution
+        lng = bounds["west"] + (np.arange(cols) + 0.5) * resolution
+        lat, lng = np.meshgrid(lat, lng, indexing="ij")
+
+        police_distances = np.stack([haversine_array(lat, lng, s["lat"], s["lng"]) for s in police])
+        police_index = police_distances.argmin(axis=0).astype(np.int8)
+        police_km = police_distances.min(axis=0).astype(np.float32)
+        bucket = np.digitize(police_km, POLICE_BUCKETS, right=True).astype(np.uint8)
+
+        tourist = np.zeros((rows, cols), dtype=bool)
+        for area in tourist_areas:
+            tourist |= haversine_array(lat, lng, area["lat"], area["lng"]) <= TOURIST_AREA_RADIUS_KM
+
+        lit = np.zeros((rows, cols), dtype=bool)
+        for polyline in lit_roads.values():
+            for a, b in zip(polyline, polyline[1:]):
+                lit |= _segment_distance_km(lat, lng, a, b) <= LIT_ROAD_WIDTH_KM
+
+        codes = (bucket * 4 + tourist * 2 + lit).astype(np.uint8)
+        key = fingerprint(bounds, resolution, police, tourist_areas, lit_roads)
+        return cls({"codes": codes, "police_km": police_km, "police_index": police_index}, bounds, resolution, key)
+
+    def save(self, path: str):
+        """
+        Write the raster to `path`, replacing any raster already there
+
+        The files are written to a temporary sibling directory that is then
+        renamed into place, so a reader never loads a half-written raster and
+        workers that have the old files memory-mapped keep reading them.
+        """
+        directory = Path(path)
+        directory.parent.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{directory.name}.", dir=directory.parent))
+        try:
+            for name in self.ARRAYS:
+                np.save(staging / f"{name}.npy", getattr(self, name))
+            meta = {"bounds": self.bounds, "resolution": self.resolution, "key": self.key}
+            (staging / "meta.json").write_text(json.dumps(meta))
+            # mkdtemp creates the directory 0700; the published raster must be readable by other users
+            os.chmod(staging, 0o755)
+
+            # os.replace only renames a directory over an empty one, so move the old raster aside first
+            retired = Path(tempfile.mkdtemp(prefix=f".{directory.name}.old.", dir=directory.parent))
+            try:
+                os.replace(directory, retired)
+            except FileNotFoundError:
+                pass
+            try:
+                os.replace(staging, directory)
+            except OSError:
+                # Another worker published its raster in between; built from the same inputs, so keep it
+                pass
+            shutil.rmtree(retired, ignore_errors=True)
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path: str) -> Optional["SafetyRaster"]:
+        """Memory-mapped raster from `path`, or None if there isn't a complete one"""
+        directory = Path(path)
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+            arrays = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in cls.ARRAYS}
+        except (OSError, ValueError) as e:
+            print(f"Error loading safety raster: {e}")
+            return None
+        return cls(arrays, meta["bounds"], meta["resolution"], meta["key"])
+
+    # Queries
+
+    def cells(self, lat, lng) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(rows, cols, inside) for arrays of coordinates"""
+        row = np.floor((np.asarray(lat, dtype=np.float64) - self.bounds["south"]) / self.resolution).astype(np.int64)
+        col = np.floor((np.asarray(lng, dtype=np.float64) - self.bounds["west"]) / self.resolution).astype(np.int64)
+        inside = (row >= 0) & (row < self.rows) & (col >= 0) & (col < self.cols)
+        return np.where(inside, row, 0), np.where(inside, col, 0), inside
+
+    def inputs_at(self, lat: float, lng: float) -> Optional[Dict[str, Any]]:
+        """Safety inputs of the cell containing a point, or None outside the raster"""
+        row = int((lat - self.bounds["south"]) // self.resolution)
+        col = int((lng - self.bounds["west"]) // self.resolution)
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        code = int(self.codes[row, col])
+        return {
+            "police_index": int(self.police_index[row, col]),
+            "police_distance_km": float(self.police_km[row, col]),
+            "tourist_area": bool(code & 2),
+            "lit": bool(code & 1)
+        }
+
+    def scores(self, lat, lng, time_of_day: str = "day") -> np.ndarray:
+        """Clamped 1-10 scores for arrays of coordinates (NO_SCORE outside the raster)"""
+        row, col, inside = self.cells(lat, lng)
+        scores = np.clip(self.tables[time_of_day][self.codes[row, col]], 1, 10)
+        return np.where(inside, scores, NO_SCORE).astype(np.int8)
+
+    def leg_safety(self, lat_lng: np.ndarray, leg_km: np.ndarray, time_of_day: str = "day",
+                   step_km: float = 0.05) -> Dict[str, Any]:
+        """
+        Safety sampled every `step_km` along each leg of a polyline, in one pass
+
+        Args:
+            lat_lng: (n, 2) array of stops
+            leg_km: (n - 1,) leg lengths
+
+        Returns:
+            Arrays "min" and "mean" per leg (NaN where a leg is outside the
+            raster), the overall "min_score"/"mean_score", and the weakest
+            sampled point (None when nothing is covered)
+        """
+        # Every leg gets ceil(length / step) + 1 samples (at least its two ends)
+        samples_per_leg = np.maximum(2, np.ceil(leg_km / step_km).astype(np.int64) + 1)
+        starts = np.concatenate(([0], np.cumsum(samples_per_leg)[:-1]))
+        leg = np.repeat(np.arange(len(leg_km)), samples_per_leg)
+        t = (np.arange(leg.size) - starts[leg]) / (samples_per_leg[leg] - 1)
+
+        origin, target = lat_lng[leg], lat_lng[leg + 1]
+        lats = origin[:, 0] + (target[:, 0] - origin[:, 0]) * t
+        lngs = origin[:, 1] + (target[:, 1] - origin[:, 1]) * t
+        scores = self.scores(lats, lngs, time_of_day)
+
+        covered = scores != NO_SCORE
+        covered_count = np.add.reduceat(covered.astype(np.int64), starts)
+        leg_sum = np.add.reduceat(np.where(covered, scores, 0).astype(np.int64), starts)
+        leg_min = np.minimum.reduceat(np.where(covered, scores, 127), starts).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            leg_mean = leg_sum / covered_count
+        leg_min[covered_count == 0] = np.nan
+
+        if not covered.any():
+            return {"min": leg_min, "mean": leg_mean, "min_score": None, "mean_score": None, "weakest_point": None}
+
+        weakest = np.flatnonzero(covered)[scores[covered].argmin()]
+        return {
+            "min": leg_min,
+            "mean": leg_mean,
+            "min_score": int(scores[covered].min()),
+            "mean_score": round(float(scores[covered].mean()), 1),
+            "weakest_point": {"lat": round(float(lats[weakest]), 6), "lng": round(float(lngs[weakest]), 6)}
+        }
+
+    def route(self, points: Sequence[Tuple[float, float]], time_of_day: str = "day",
+              step_km: float = 0.05) -> Dict[str, Any]:
+        """
+        Safety along a polyline, sampled every `step_km`
+
+        Returns:
+            Per-leg minimum and mean scores, the overall minimum and mean,
+            and the weakest sampled point
+        """
+        if len(points) < 2:
+            raise ValueError("A route needs at least two points")
+
+        lat_lng = np.asarray(points, dtype=np.float64)
+        leg_km = haversine_array(lat_lng[:-1, 0], lat_lng[:-1, 1], lat_lng[1:, 0], lat_lng[1:, 1])
+        safety = self.leg_safety(lat_lng, leg_km, time_of_day, step_km)
+        legs = [
+            {
+                "distance_km": round(float(km), 2),
+                "min_score": None if np.isnan(low) else int(low),
+                "mean_score": None if np.isnan(mean) else round(float(mean), 1)
+            }
+            for km, low, mean in zip(leg_km, safety["min"], safety["mean"])
+        ]
+        return {
+            "legs": legs,
+            "min_score": safety["min_score"],
+            "mean_score": safety["mean_score"],
+            "weakest_point": safety["weakest_point"]
+        }
+
+    def window(self, south: float, west: float, north: float, east: float,
+               time_of_day: str = "day", max_cells: int = 128) -> Dict[str, Any]:
+        """
+        Score grid for a map viewport (heatmap tile), rows from north to south
+
+        The grid is strided down to at most `max_cells` per side.
+        """
+        row0, col0, _ = self.cells(max(south, self.bounds["south"]), max(west, self.bounds["west"]))
+        row1, col1, _ = self.cells(min(north, self.bounds["north"]) - 1e-9, min(east, self.bounds["east"]) - 1e-9)
+        row0, col0, row1, col1 = int(row0), int(col0), int(row1), int(col1)
+        if south >= self.bounds["north"] or north <= self.bounds["south"] or row1 < row0 \
+                or west >= self.bounds["east"] or east <= self.bounds["west"] or col1 < col0:
+            return {"bounds": None, "cell_deg": None, "scores": []}
+
+        stride = max(1, -(-max(row1 - row0 + 1, col1 - col0 + 1) // max_cells))
+        codes = self.codes[row0:row1 + 1:stride, col0:col1 + 1:stride]
+        scores = np.clip(self.tables[time_of_day][codes], 1, 10)
+        return {
+            "bounds": {
+                "south": self.bounds["south"] + row0 * self.resolution,
+                "west": self.bounds["west"] + col0 * self.resolution,
+                "north": self.bounds["south"] + (row1 + 1) * self.resolution,
+                "east": self.bounds["west"] + (col1 + 1) * self.resolution
+            },
+            "cell_deg": self.resolution * stride,
+            "scores": scores[::-1].tolist()
+        }
+
+
+@lru_cache()
+def get_safety_raster() -> SafetyRaster:
+    """
+    Raster at SAFETY_RASTER_PATH, rebuilt (and saved) if missing or built from other inputs
+
+    The app calls this at startup so requests never build the raster;
+    `python -m backend.scripts.build_safety_raster` builds it ahead of deployment.
+    """
+    path = settings.SAFETY_RASTER_PATH
+    key = fingerprint(GUWAHATI_BOUNDS, settings.SAFETY_RASTER_RESOLUTION, POLICE_STATIONS, TOURIST_AREAS, LIT_ROADS)
+    raster = SafetyRaster.load(path) if Path(path, "meta.json").exists() else None
+    if raster is not None and raster.key == key:
+        return raster
+
+    raster = SafetyRaster.build()
+    try:
+        raster.save(path)
+    except OSError as e:
+        print(f"Error saving safety raster: {e}")
+    return raster
@@ -0,0 +1,326 @@
+"""
+Service-area polygons with a precomputed grid-mask index.
+
+Every polygon is rasterized onto a shared grid (SERVICE_AREA_CELL_DEG). A
+cell entirely inside or outside the polygon answers containment directly;
+only boundary cells keep the edges that cross them. A point in a boundary
+cell is resolved from the known state of a reference point in the cell by
+counting crossings between it and the point, which only involves those few
+edges. A lookup is therefore a couple of array reads, however many polygons
+exist.
+
+Polygons use the even-odd rule over all of their rings, so holes are rings.
+Points on a polygon's edges count as inside it, as they did for the old
+bounding-box check. Restricted zones ("kind": "restricted") only come from
+the SERVICE_AREAS_PATH file.
+"""
+
+import json
+import math
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS
+
+OUTSIDE, INSIDE, BOUNDARY = 0, 1, 2
+
+# Where in its cell the reference point sits. Not the center: hand-drawn
+# polygons use round coordinates, which land exactly on cell centers.
+REFERENCE_OFFSET = (0.5772156649, 0.4142135624)  # (x, y) fractions of a cell
+
+# How close (degrees) a point must be to an edge to count as on it
+EDGE_TOLERANCE_DEG = 1e-9
+
+# Rings are (lat, lng) sequences; the closing vertex is optional
+SERVICE_AREAS = [
+    {
+        "id": "guwahati",
+        "name": "Guwahati",
+        "kind": "city",
+        "rings": [[
+            (GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["west"]),
+            (GUWAHATI_BOUNDS["north"], GUWAHATI_BOUNDS["west"]),
+            (GUWAHATI_BOUNDS["north"], GUWAHATI_BOUNDS["east"]),
+            (GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["east"])
+        ]]
+    },
+    {
+        "id": "nilachal_hill",
+        "name": "Nilachal Hill (Kamakhya)",
+        "kind": "neighbourhood",
+        "rings": [[(26.1610, 91.6990), (26.1720, 91.6980), (26.1780, 91.7080),
+                   (26.1720, 91.7160), (26.1620, 91.7130)]]
+    },
+    {
+        "id": "pan_bazaar",
+        "name": "Pan Bazaar",
+        "kind": "neighbourhood",
+        "rings": [[(26.1830, 91.7380), (26.1900, 91.7380), (26.1900, 91.7470), (26.1830, 91.7470)]]
+    },
+    {
+        "id": "paltan_bazaar",
+        "name": "Paltan Bazaar",
+        "kind": "neighbourhood",
+        "rings": [[(26.1780, 91.7470), (26.1860, 91.7470), (26.1860, 91.7580), (26.1780, 91.7580)]]
+    },
+    {
+        "id": "uzan_bazaar_riverfront",
+        "name": "Uzan Bazaar Riverfront",
+        "kind": "neighbourhood",
+        "rings": [[(26.1830, 91.7440), (26.1880, 91.7440), (26.1930, 91.7560),
+                   (26.1900, 91.7620), (26.1840, 91.7560)]]
+    },
+    {
+        "id": "dispur",
+        "name": "Dispur",
+        "kind": "neighbourhood",
+        "rings": [[(26.1330, 91.7800), (26.1480, 91.7800), (26.1480, 91.8000), (26.1330, 91.8000)]]
+    }
+
+]
+
+
+def _edges(rings: Sequence[Sequence[Tuple[float, float]]]) -> np.ndarray:
+    """(E, 4) array of edges as x1, y1, x2, y2 (x = lng, y = lat), rings closed"""
+    edges = []
+    for ring in rings:
+        points = [(float(lng), float(lat)) for lat, lng in ring]
+        if points[0] == points[-1]:
+            points = points[:-1]
+        if len(points) < 3:
+            raise ValueError("A polygon ring needs at least three vertices")
+        edges.extend((*a, *b) for a, b in zip(points, points[1:] + points[:1]))
+    return np.asarray(edges, dtype=np.float64)
+
+
+def points_in_polygon(x: np.ndarray, y: np.ndarray, edges: np.ndarray, chunk: int = 4096) -> np.ndarray:
+    """Even-odd ray casting for arrays of points (exact, O(points x edges))"""
+    x, y = np.asarray(x, dtype=np.float64).ravel(), np.asarray(y, dtype=np.float64).ravel()
+    x1, y1, x2, y2 = (edges[:, i] for i in range(4))
+    inside = np.zeros(x.size, dtype=bool)
+    for start in range(0, x.size, chunk):
+        px, py = x[start:start + chunk, None], y[start:start + chunk, None]
+        straddles = (y1 > py) != (y2 > py)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            crossing_x = x1 + (py - y1) * (x2 - x1) / (y2 - y1)
+        inside[start:start + chunk] = np.count_nonzero(straddles & (px < crossing_x), axis=1) % 2 == 1
+    return inside
+
+
+def _segments_touch_cells(edge: np.ndarray, xmin: np.ndarray, ymin: np.ndarray, size: float) -> np.ndarray:
+    """Liang-Barsky: does the edge intersect each (closed) cell, grown by EDGE_TOLERANCE_DEG?"""
+    x1, y1, x2, y2 = edge
+    dx, dy = x2 - x1, y2 - y1
+    xmin, ymin, size = xmin - EDGE_TOLERANCE_DEG, ymin - EDGE_TOLERANCE_DEG, size + 2 * EDGE_TOLERANCE_DEG
+    t0 = np.zeros(xmin.shape)
+    t1 = np.ones(xmin.shape)
+    hit = np.ones(xmin.shape, dtype=bool)
+    for p, q in ((-dx, x1 - xmin), (dx, xmin + size - x1), (-dy, y1 - ymin), (dy, ymin + size - y1)):
+        if p == 0:
+            hit &= q >= 0
+        elif p < 0:
+            t0 = np.maximum(t0, q / p)
+        else:
+            t1 = np.minimum(t1, q / p)
+    return hit & (t0 <= t1)
+
+
+def _orientation(ax, ay, bx, by, cx, cy):
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _on_edge(x: float, y: float, x1: float, y1: float, x2: float, y2: float) -> bool:
+    """Whether the point lies on the edge, within EDGE_TOLERANCE_DEG"""
+    if not (min(x1, x2) - EDGE_TOLERANCE_DEG <= x <= max(x1, x2) + EDGE_TOLERANCE_DEG
+            and min(y1, y2) - EDGE_TOLERANCE_DEG <= y <= max(y1, y2) + EDGE_TOLERANCE_DEG):
+        return False
+    return abs(_orientation(x1, y1, x2, y2, x, y)) <= EDGE_TOLERANCE_DEG * math.hypot(x2 - x1, y2 - y1)
+
+
+class PreparedArea:
+    """One polygon rasterized onto the grid"""
+
+    def __init__(self, area: Dict[str, Any], cell_deg: float):
+        self.id = area["id"]
+        self.name = area.get("name", area["id"])
+        self.kind = area.get("kind", "neighbourhood")
+        self.cell_deg = cell_deg
+        self.edges = _edges(area["rings"])
+
+        xs, ys = self.edges[:, [0, 2]], self.edges[:, [1, 3]]
+        self.row0, self.col0 = math.floor(ys.min() / cell_deg), math.floor(xs.min() / cell_deg)
+        rows = math.floor(ys.max() / cell_deg) - self.row0 + 1
+        cols = math.floor(xs.max() / cell_deg) - self.col0 + 1
+
+        # Exact state of each cell's reference point: the cell's state off the
+        # boundary, and the starting point for points in boundary cells
+        reference_y = (self.row0 + np.arange(rows) + REFERENCE_OFFSET[1]) * cell_deg
+        reference_x = (self.col0 + np.arange(cols) + REFERENCE_OFFSET[0]) * cell_deg
+        grid_x, grid_y = np.meshgrid(reference_x, reference_y)
+        self.reference_inside = points_in_polygon(grid_x, grid_y, self.edges).reshape(rows, cols)
+        self.state = np.where(self.reference_inside, INSIDE, OUTSIDE).astype(np.uint8)
+
+        cell_edges: Dict[Tuple[int, int], List[int]] = {}
+        for e, edge in enumerate(self.edges):
+            r0 = math.floor(min(edge[1], edge[3]) / cell_deg) - self.row0
+            r1 = math.floor(max(edge[1], edge[3]) / cell_deg) - self.row0
+            c0 = math.floor(min(edge[0], edge[2]) / cell_deg) - self.col0
+            c1 = math.floor(max(edge[0], edge[2]) / cell_deg) - self.col0
+            # One cell of slack: an edge on a cell line touches both neighbours
+            r0, c0 = max(r0 - 1, 0), max(c0 - 1, 0)
+            r1, c1 = min(r1 + 1, rows - 1), min(c1 + 1, cols - 1)
+            rr, cc = np.mgrid[r0:r1 + 1, c0:c1 + 1]
+            touched = _segments_touch_cells(
+                edge, (self.col0 + cc) * cell_deg, (self.row0 + rr) * cell_deg, cell_deg
+            )
+            for r, c in zip(rr[touched], cc[touched]):
+                cell_edges.setdefault((int(r), int(c)), []).append(e)
+
+        # Plain tuples: a boundary cell has a handful of edges, too few for NumPy to pay off
+        self.cell_edges = {
+            cell: tuple(tuple(edge) for edge in self.edges[indexes].tolist())
+            for cell, indexes in cell_edges.items()
+        }
+        for r, c in cell_edges:
+            self.state[r, c] = BOUNDARY
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.state.shape
+
+    def _resolve(self, r: int, c: int, x: float, y: float) -> bool:
+        """Point in a boundary cell: on an edge, or reference state flipped once per edge crossed on the way"""
+        edges = self.cell_edges[(r, c)]
+        if any(_on_edge(x, y, *edge) for edge in edges):
+            return True
+        cx = (self.col0 + c + REFERENCE_OFFSET[0]) * self.cell_deg
+        cy = (self.row0 + r + REFERENCE_OFFSET[1]) * self.cell_deg
+        inside = bool(self.reference_inside[r, c])
+        for x1, y1, x2, y2 in edges:
+            # Half-open sides, so a path through a shared vertex is counted once
+            if ((_orientation(cx, cy, x, y, x1, y1) > 0) != (_orientation(cx, cy, x, y, x2, y2) > 0)
+                    and (_orientation(x1, y1, x2, y2, cx, cy) > 0) != (_orientation(x1, y1, x2, y2, x, y) > 0)):
+                inside = not inside
+        return inside
+
+    def contains(self, lat: float, lng: float) -> bool:
+        r = math.floor(lat / self.cell_deg) - self.row0
+        c = math.floor(lng / self.cell_deg) - self.col0
+        rows, cols = self.state.shape
+        if not (0 <= r < rows and 0 <= c < cols):
+            return False
+        state = self.state.item(r, c)
+        if state == BOUNDARY:
+            return self._resolve(r, c, lng, lat)
+        return state == INSIDE
+
+    def contains_many(self, lats, lngs) -> np.ndarray:
+        lats = np.asarray(lats, dtype=np.float64)
+        lngs = np.asarray(lngs, dtype=np.float64)
+        r = np.floor(lats / self.cell_deg).astype(np.int64) - self.row0
+        c = np.floor(lngs / self.cell_deg).astype(np.int64) - self.col0
+        rows, cols = self.state.shape
+        covered = (r >= 0) & (r < rows) & (c >= 0) & (c < cols)
+        state = np.where(covered, self.state[np.where(covered, r, 0), np.where(covered, c, 0)], OUTSIDE)
+
+        inside = state == INSIDE
+        for i in np.flatnonzero(state == BOUNDARY):
+            inside[i] = self._resolve(int(r[i]), int(c[i]), float(lngs[i]), float(lats[i]))
+        return inside
+
+
+class ServiceAreaIndex:
+    """All service areas, with a shared cell -> candidate areas index"""
+
+    def __init__(self, areas: Iterable[Dict[str, Any]] = (), cell_deg: float = settings.SERVICE_AREA_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.areas: Dict[str, PreparedArea] = {}
+        self._candidates: Dict[Tuple[int, int], List[PreparedArea]] = {}
+        for area in areas:
+            self.add(area)
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def __contains__(self, area_id: str) -> bool:
+        return area_id in self.areas
+
+    def add(self, area: Dict[str, Any]) -> PreparedArea:
+        """Prepare and index a polygon (replacing any area with the same id)"""
+        if area["id"] in self.areas:
+            self.remove(area["id"])
+        prepared = PreparedArea(area, self.cell_deg)
+        self.areas[prepared.id] = prepared
+        for r, c in zip(*np.nonzero(prepared.state)):
+            key = (prepared.row0 + int(r), prepared.col0 + int(c))
+            self._candidates.setdefault(key, []).append(prepared)
+        return prepared
+
+    def remove(self, area_id: str):
+        prepared = self.areas.pop(area_id)
+        for r, c in zip(*np.nonzero(prepared.state)):
+            key = (prepared.row0 + int(r), prepared.col0 + int(c))
+            self._candidates[key].remove(prepared)
+            if not self._candidates[key]:
+                del self._candidates[key]
+
+    def contains(self, area_id: str, lat: float, lng: float) -> bool:
+        area = self.areas.get(area_id)
+        return area is not None and area.contains(lat, lng)
+
+    def contains_many(self, area_id: str, lats, lngs) -> np.ndarray:
+        """Boolean array: which of the points lie in the area (for bulk imports)"""
+        area = self.areas.get(area_id)
+        if area is None:
+            return np.zeros(np.shape(lats), dtype=bool)
+        return area.contains_many(lats, lngs)
+
+    def areas_at(self, lat: float, lng: float, kind: Optional[str] = None) -> List[Dict[str, str]]:
+        """Every area containing the point, optionally only of one kind"""
+        key = (math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg))
+        return [
+            {"id": area.id, "name": area.name, "kind": area.kind}
+            for area in self._candidates.get(key, ())
+            if (kind is None or area.kind == kind) and area.contains(lat, lng)
+        ]
+
+
+def load_geojson(path: str) -> List[Dict[str, Any]]:
+    """
+    Service areas from a GeoJSON FeatureCollection
+
+    Features need properties "id" (and optionally "name" and "kind") and a
+    Polygon or MultiPolygon geometry; a missing file is no areas.
+    """
+    if not Path(path).exists():
+        return []
+
+    with open(path, encoding="utf-8") as f:
+        collection = json.load(f)
+
+    areas = []
+    for feature in collection.get("features", []):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") == "Polygon":
+            polygons = [geometry["coordinates"]]
+        elif geometry.get("type") == "MultiPolygon":
+            polygons = geometry["coordinates"]
+        else:
+            continue
+        properties = feature.get("properties") or {}
+        areas.append({
+            "id": properties["id"],
+            "name": properties.get("name", properties["id"]),
+            "kind": properties.get("kind", "neighbourhood"),
+            # GeoJSON positions are [lng, lat]
+            "rings": [[(lat, lng) for lng, lat, *_ in ring] for polygon in polygons for ring in polygon]
+        })
+    return areas
+
+
+@lru_cache()
+def get_service_areas() -> ServiceAreaIndex:
+    """Built-in areas plus any from SERVICE_AREAS_PATH (which may override them by id)"""
+    return ServiceAreaIndex([*SERVICE_AREAS, *load_geojson(settings.SERVICE_AREAS_PATH)])
@@ -0,0 +1,251 @@
+"""
+Grid index over named points (landmarks, meeting points, POIs) for
+k-nearest-neighbour and radius queries.
+
+Points are bucketed into square cells of SPATIAL_INDEX_CELL_DEG degrees, so a
+query only measures the points in the cells around it, growing the search
+ring until the k nearest are certain. Batched queries group origins by cell
+and measure each group against its shared candidates in one array
+operation, which is what itinerary stops (many origins, one index) need.
+"""
+
+import math
+from functools import lru_cache
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.utils.geolocation import GUWAHATI_LANDMARKS, MEETING_POINTS, haversine_array
+
+# Kilometres per degree of latitude (and of longitude at the equator)
+KM_PER_DEG_LAT = 110.57
+KM_PER_DEG_LNG = 111.32
+
+# Shave the guaranteed search radius so haversine vs grid rounding never drops a point
+RADIUS_MARGIN = 0.995
+
+
+class PointIndex:
+    """Points with an id, coordinates, a type and arbitrary details"""
+
+    def __init__(self, cell_deg: float = settings.SPATIAL_INDEX_CELL_DEG):
+        self.cell_deg = cell_deg
+        self.ids: List[Optional[str]] = []
+        self.index: Dict[str, int] = {}
+        self.points: Dict[str, Dict[str, Any]] = {}
+        # Types as small integers (0: slot free after a removal)
+        self._type_codes: Dict[str, int] = {}
+        self._coords = np.zeros((0, 2), dtype=np.float64)
+        self._types = np.zeros(0, dtype=np.int16)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, point_id: str) -> bool:
+        return point_id in self.index
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_deg), math.floor(lng / self.cell_deg)
+
+    def _type_code(self, point_type: Optional[str]) -> int:
+        return self._type_codes.setdefault(point_type or "", len(self._type_codes) + 1)
+
+    # Updates
+
+    def add(self, point_id: str, lat: float, lng: float, point_type: Optional[str] = None, **details):
+        """Add a point, or move and update it if the id is already indexed"""
+        if point_id in self.index:
+            self.remove(point_id)
+
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = len(self.ids)
+            if slot == len(self._coords):
+                capacity = max(16, slot + slot // 2)
+                coords = np.zeros((capacity, 2), dtype=np.float64)
+                types = np.zeros(capacity, dtype=np.int16)
+                coords[:slot], types[:slot] = self._coords, self._types
+                self._coords, self._types = coords, types
+            self.ids.append(None)
+
+        self.ids[slot] = point_id
+        self.index[point_id] = slot
+        self.points[point_id] = {"lat": lat, "lng": lng, "type": point_type, **details}
+        self._coords[slot] = (lat, lng)
+        self._types[slot] = self._type_code(point_type)
+        self._cells.setdefault(self._cell(lat, lng), []).append(slot)
+
+    def add_many(self, points: Dict[str, Dict[str, Any]]):
+        """Add points given as {id: {"lat", "lng", "type", ...details}}"""
+        for point_id, point in points.items():
+            details = {key: value for key, value in point.items() if key not in ("lat", "lng", "type")}
+            self.add(point_id, point["lat"], point["lng"], point.get("type"), **details)
+
+    def remove(self, point_id: str) -> bool:
+        slot = self.index.pop(point_id, None)
+        if slot is None:
+            return False
+        point = self.points.pop(point_id)
+        cell = self._cell(point["lat"], point["lng"])
+        self._cells[cell].remove(slot)
+        if not self._cells[cell]:
+            del self._cells[cell]
+        self.ids[slot] = None
+        self._types[slot] = 0
+        self._free.append(slot)
+        return True
+
+    # Queries
+
+    def nearest(
+            self,
+            lat: float,
+            lng: float,
+            k: int = 1,
+            max_km: Optional[float] = None,
+            types: Optional[Iterable[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The k nearest points, closest first
+
+        Args:
+            lat, lng: Query coordinates
+            k: Number of points
+            max_km: Ignore points further than this
+            types: Only points of these types
+        """
+        return self.nearest_many([(lat, lng)], k, max_km, types)[0]
+
+    def within(
+            self,
+            lat: float,
+            lng: float,
+            radius_km: float,
+            types: Optional[Iterable[str]] = None,
+            limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """All points within radius_km (or the `limit` nearest of them), closest first"""
+        return self.nearest_many([(lat, lng)], limit or len(self.index), radius_km, types)[0]
+
+    def nearest_many(
+            self,
+            origins: Sequence[Tuple[float, float]],
+            k: int = 1,
+            max_km: Optional[float] = None,
+            types: Optional[Iterable[str]] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        nearest() for many origins at once
+
+        Returns:
+            One list of results per origin, in order
+        """
+        origins = np.asarray(origins, dtype=np.float64).reshape(-1, 2)
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(len(origins))]
+        wanted = self._wanted_codes(types)
+        if not len(origins) or k <= 0 or not self.index or (wanted is not None and not len(wanted)):
+            return results
+
+        # Origins sharing a grid cell share their candidate points
+        groups: Dict[Tuple[int, int], List[int]] = {}
+        for i, (lat, lng) in enumerate(origins.tolist()):
+            groups.setdefault(self._cell(lat, lng), []).append(i)
+        for cell, rows in groups.items():
+            for i, found in zip(rows, self._nearest_in_cell(origins[rows], cell, k, max_km, wanted)):
+                results[i] = found
+        return results
+
+    def _nearest_in_cell(
+            self,
+            origins: np.ndarray,
+            cell: Tuple[int, int],
+            k: int,
+            max_km: Optional[float],
+            wanted: Optional[np.ndarray]
+    ) -> List[List[Dict[str, Any]]]:
+        """nearest_many for origins in one grid cell"""
+        results: List[List[Dict[str, Any]]] = [[] for _ in range(len(origins))]
+        # Smallest km per cell at these latitudes: a ring of r cells covers at least r * cell_km around the origins
+        max_lat = min(float(np.abs(origins[:, 0]).max()) + self.cell_deg, 89.0)
+        cell_km = self.cell_deg * min(KM_PER_DEG_LAT, KM_PER_DEG_LNG * math.cos(math.radians(max_lat)))
+
+        pending = np.arange(len(origins))
+        ring = 1 if max_km is None else max(1, math.ceil(max_km / (cell_km * RADIUS_MARGIN)))
+        while len(pending):
+            slots, everything = self._slots_around(cell, ring)
+            covered_km = ring * cell_km * RADIUS_MARGIN
+            if wanted is not None and len(slots):
+                slots = slots[np.isin(self._types[slots], wanted)]
+
+            distances = haversine_array(
+                origins[pending, None, 0], origins[pending, None, 1],
+                self._coords[slots, 0][None, :], self._coords[slots, 1][None, :]
+            ) if len(slots) else np.zeros((len(pending), 0))
+            if max_km is not None:
+                distances = np.where(distances <= max_km, distances, np.inf)
+
+            take = min(k, distances.shape[1])
+            if take:
+                nearest = np.argpartition(distances, take - 1, axis=1)[:, :take]
+                nearest_km = np.take_along_axis(distances, nearest, axis=1)
+                order = np.argsort(nearest_km, axis=1, kind="stable")
+                nearest = np.take_along_axis(nearest, order, axis=1)
+                nearest_km = np.take_along_axis(nearest_km, order, axis=1)
+                done = (np.isfinite(nearest_km).sum(axis=1) >= k) & (nearest_km[:, -1] <= covered_km)
+            else:
+                done = np.zeros(len(pending), dtype=bool)
+
+            # Certain when the k-th nearest lies inside the covered radius, or nothing beyond it can count
+            if everything or (max_km is not None and covered_km >= max_km):
+                done[:] = True
+
+            for row in np.flatnonzero(done).tolist():
+                results[pending[row]] = [
+                    self._result(int(slots[column]), distance)
+                    for column, distance in zip(nearest[row].tolist(), nearest_km[row].tolist())
+                    if distance != np.inf
+                ] if take else []
+            pending = pending[~done]
+            ring *= 2
+        return results
+
+    def _wanted_codes(self, types: Optional[Iterable[str]]) -> Optional[np.ndarray]:
+        if types is None:
+            return None
+        return np.array([self._type_codes[t] for t in types if t in self._type_codes], dtype=np.int16)
+
+    def _slots_around(self, cell: Tuple[int, int], ring: int) -> Tuple[np.ndarray, bool]:
+        """Slots of the points within `ring` cells of `cell`, and whether that is every point"""
+        if len(self._cells) <= (2 * ring + 1) ** 2:
+            # Cheaper to take every occupied cell than to probe that many
+            keys: Iterable[Tuple[int, int]] = self._cells.keys()
+            everything = True
+        else:
+            row, col = cell
+            keys = [
+                (r, c) for r in range(row - ring, row + ring + 1) for c in range(col - ring, col + ring + 1)
+                if (r, c) in self._cells
+            ]
+            everything = False
+        return np.fromiter(chain.from_iterable(self._cells[key] for key in keys), dtype=np.int64), everything
+
+    def _result(self, slot: int, distance_km: float) -> Dict[str, Any]:
+        point_id = self.ids[slot]
+        return {"id": point_id, **self.points[point_id], "distance_km": round(distance_km, 2)}
+
+
+# Point sets the shared indexes are built from
+POINT_SETS = {"landmark": GUWAHATI_LANDMARKS, "meeting_point": MEETING_POINTS}
+
+
+@lru_cache()
+def get_point_index(kind: str) -> PointIndex:
+    """Shared index of the landmarks ("landmark") or meeting points ("meeting_point")"""
+    if kind not in POINT_SETS:
+        raise ValueError(f"Unknown point kind: {kind}. Must be one of: {', '.join(POINT_SETS)}")
+    index = PointIndex()
+    index.add_many(POINT_SETS[kind])
+    return index
@@ -0,0 +1,328 @@
+"""
+Precomputed travel-time matrix over the known meeting points and landmarks.
+
+Distances and per-mode ETAs between every pair of known points are computed
+once, saved to TRAVEL_MATRIX_PATH and loaded on startup. Points added later
+(or moved) only cost their own rows and columns. Lookups are array reads, and
+nearest-point ranking sorts one precomputed row by ETA.
+
+When a routing graph is built, each pair is routed over the road network the
+same way calculate_travel_time does, falling back to a straight line at the
+mode's speed for pairs off the network; which one was used is kept per pair.
+A matrix saved for a different routing graph is rebuilt.
+"""
+
+import os
+import tempfile
+import zipfile
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.services.routing_engine import get_road_router
+from backend.app.utils.geolocation import GUWAHATI_LANDMARKS, MEETING_POINTS, TRAVEL_SPEEDS_KMH, haversine_array
+
+MATRIX_MODES = ("walking", "auto", "driving")
+
+# Per-pair route source codes, named as travel_estimate names them
+ROUTE_SOURCES = ("straight_line", "road_network")
+STRAIGHT_LINE, ROAD_NETWORK = 0, 1
+
+Origin = Union[str, Tuple[float, float]]
+
+
+def known_points() -> Dict[str, Dict[str, Any]]:
+    """Meeting points and landmarks by id, with their kind"""
+    points = {}
+    for point_id, landmark in GUWAHATI_LANDMARKS.items():
+        points[point_id] = {"name": landmark["name"], "lat": landmark["lat"], "lng": landmark["lng"],
+                            "kind": "landmark"}
+    for point_id, point in MEETING_POINTS.items():
+        points[point_id] = {"name": point["name"], "lat": point["lat"], "lng": point["lng"],
+                            "kind": "meeting_point", "type": point["type"]}
+    return points
+
+
+class TravelTimeMatrix:
+    """Pairwise distance (km) and ETA (minutes) per mode between named points"""
+
+    def __init__(self, modes: Sequence[str] = MATRIX_MODES, router=None, graph_key: str = ""):
+        """
+        Args:
+            modes: Travel modes (keys of TRAVEL_SPEEDS_KMH)
+            router: RoadRouter to route pairs over roads (None: straight lines only)
+            graph_key: Identifies the routing graph, so a saved matrix built from another one is not reused
+        """
+        self.modes = tuple(modes)
+        self.router = router
+        self.graph_key = graph_key
+        self._mode_index = {mode: i for i, mode in enumerate(self.modes)}
+        self._speeds = np.array([TRAVEL_SPEEDS_KMH[mode] for mode in self.modes], dtype=np.float32)
+        self.ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.points: Dict[str, Dict[str, Any]] = {}
+        # Kinds as small integers (0: no details, e.g. removed since the matrix was saved)
+        self._kind_codes: Dict[str, int] = {}
+        # Storage grows by half again when full, so adding a point rarely copies the matrix.
+        # Dense n x n per mode: meant for the curated points (hundreds), not bulk POIs
+        self._coords = np.zeros((0, 2), dtype=np.float64)
+        self._kinds = np.zeros(0, dtype=np.int16)
+        self._distance = np.zeros((len(self.modes), 0, 0), dtype=np.float32)
+        self._minutes = np.zeros((len(self.modes), 0, 0), dtype=np.float32)
+        self._source = np.zeros((len(self.modes), 0, 0), dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, point_id: str) -> bool:
+        return point_id in self.index
+
+    @property
+    def coords(self) -> np.ndarray:
+        return self._coords[:len(self.ids)]
+
+    @property
+    def distance_km(self) -> np.ndarray:
+        """(modes, n, n) distance in km"""
+        return self._distance[:, :len(self.ids), :len(self.ids)]
+
+    @property
+    def minutes(self) -> np.ndarray:
+        """(modes, n, n) ETA in minutes"""
+        return self._minutes[:, :len(self.ids), :len(self.ids)]
+
+    @property
+    def source(self) -> np.ndarray:
+        """(modes, n, n) route source codes (see ROUTE_SOURCES)"""
+        return self._source[:, :len(self.ids), :len(self.ids)]
+
+    def _reserve(self, size: int):
+        capacity = len(self._coords)
+        if size <= capacity:
+            return
+        capacity = max(size, capacity + capacity // 2, 16)
+        n = len(self.ids)
+        coords = np.zeros((capacity, 2), dtype=np.float64)
+        kinds = np.zeros(capacity, dtype=np.int16)
+        distance = np.zeros((len(self.modes), capacity, capacity), dtype=np.float32)
+        minutes = np.zeros((len(self.modes), capacity, capacity), dtype=np.float32)
+        source = np.zeros((len(self.modes), capacity, capacity), dtype=np.uint8)
+        coords[:n], kinds[:n] = self._coords[:n], self._kinds[:n]
+        distance[:, :n, :n], minutes[:, :n, :n], source[:, :n, :n] = self.distance_km, self.minutes, self.source
+        self._coords, self._kinds, self._distance, self._minutes = coords, kinds, distance, minutes
+        self._source = source
+
+    def _kind_code(self, kind: str) -> int:
+        return self._kind_codes.setdefault(kind, len(self._kind_codes) + 1)
+
+    def _distances(self, origins: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """(len(origins), len(targets)) km"""
+        return haversine_array(origins[:, None, 0], origins[:, None, 1], targets[None, :, 0], targets[None, :, 1])
+
+    def add_points(self, points: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Add new points and refresh moved ones; only their rows and columns are computed
+
+        Returns:
+            Number of points added or updated
+        """
+        changed = [
+            point_id for point_id, point in points.items()
+            if point_id not in self.index
+            or self._coords[self.index[point_id]].tolist() != [point["lat"], point["lng"]]
+        ]
+        new_ids = [point_id for point_id in changed if point_id not in self.index]
+        if new_ids:
+            self._reserve(len(self.ids) + len(new_ids))
+            self.index.update({point_id: len(self.ids) + i for i, point_id in enumerate(new_ids)})
+            self.ids.extend(new_ids)
+
+        for point_id, point in points.items():
+            self.points[point_id] = dict(point)
+            self._kinds[self.index[point_id]] = self._kind_code(point.get("kind", ""))
+        if not changed:
+            return 0
+
+        n = len(self.ids)
+        rows = np.array([self.index[point_id] for point_id in changed])
+        self._coords[rows] = [(points[point_id]["lat"], points[point_id]["lng"]) for point_id in changed]
+        block = self._distances(self._coords[rows], self._coords[:n]).astype(np.float32)
+        block_minutes = block[None, :, :] / self._speeds[:, None, None] * 60
+        self._distance[:, rows, :n] = block
+        self._distance[:, :n, rows] = block.T
+        self._minutes[:, rows, :n] = block_minutes
+        self._minutes[:, :n, rows] = block_minutes.transpose(0, 2, 1)
+        self._source[:, rows, :n] = STRAIGHT_LINE
+        self._source[:, :n, rows] = STRAIGHT_LINE
+        if self.router is not None:
+            self._route(rows, n)
+        return len(changed)
+
+    def _route(self, rows: np.ndarray, n: int):
+        """Overwrite the given rows and columns with road routes where the router finds one"""
+        coords = self._coords[:n].tolist()
+        pairs = {(i, j) for i in rows.tolist() for j in range(n)}
+        pairs |= {(j, i) for i, j in pairs}
+        for m, mode in enumerate(self.modes):
+            if not self.router.supports(mode):
+                continue
+            for i, j in pairs:
+                route = self.router.route(coords[i], coords[j], mode)
+                if route is not None:
+                    self._distance[m, i, j] = route["distance_km"]
+                    self._minutes[m, i, j] = route["duration_minutes"]
+                    self._source[m, i, j] = ROAD_NETWORK
+
+    def _mode(self, mode: str) -> int:
+        try:
+            return self._mode_index[mode]
+        except KeyError:
+            raise ValueError(f"Unknown travel mode: {mode}. Must be one of: {', '.join(self.modes)}")
+
+    def lookup(self, from_id: str, to_id: str, mode: str = "walking") -> Optional[Dict[str, Any]]:
+        """Distance and ETA between two known points, or None if either is unknown"""
+        i, j = self.index.get(from_id), self.index.get(to_id)
+        if i is None or j is None:
+            return None
+        m = self._mode(mode)
+        return {
+            "from": from_id,
+            "to": to_id,
+            "distance_km": round(self._distance.item(m, i, j), 2),
+            "estimated_time_minutes": int(self._minutes.item(m, i, j)),
+            "mode": mode,
+            "route_source": ROUTE_SOURCES[self._source.item(m, i, j)]
+        }
+
+    def rank(
+            self,
+            origin: Origin,
+            mode: str = "walking",
+            limit: int = 5,
+            kind: Optional[str] = None,
+            max_minutes: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Known points ordered by ETA from a point id or (lat, lng)
+
+        Args:
+            origin: Known point id (excluded from the results) or coordinates
+                (ranked by straight-line ETA)
+            mode: Travel mode
+            limit: Maximum results
+            kind: Only "landmark" or "meeting_point"
+            max_minutes: Only points reachable within this ETA
+        """
+        m = self._mode(mode)
+        n = len(self.ids)
+        if isinstance(origin, str):
+            if origin not in self.index:
+                raise KeyError(origin)
+            row = self.index[origin]
+            distances, minutes = self._distance[m, row, :n], self._minutes[m, row, :n]
+            sources = self._source[m, row, :n]
+        else:
+            row = None
+            distances = self._distances(np.array([origin], dtype=np.float64), self.coords)[0]
+            minutes = distances / self._speeds[m] * 60
+            sources = np.full(n, STRAIGHT_LINE, dtype=np.uint8)
+
+        kinds = self._kinds[:n]
+        candidates = kinds != 0 if kind is None else kinds == self._kind_codes.get(kind, -1)
+        if row is not None:
+            candidates[row] = False
+        if max_minutes is not None:
+            candidates &= minutes <= max_minutes
+
+        order = np.flatnonzero(candidates)
+        if len(order) > limit:
+            order = order[np.argpartition(minutes[order], limit)[:limit]]
+        order = order[np.argsort(minutes[order], kind="stable")]
+        return [
+            {
+                "id": self.ids[i],
+                **self.points[self.ids[i]],
+                "distance_km": round(float(distances[i]), 2),
+                "estimated_time_minutes": int(minutes[i]),
+                "mode": mode,
+                "route_source": ROUTE_SOURCES[sources[i]]
+            }
+            for i in order.tolist()
+        ]
+
+    # Persistence
+
+    def save(self, path: str):
+        """Write to a temporary sibling file and rename it over `path`, so readers never see a partial matrix"""
+        directory = Path(path).parent
+        directory.mkdir(parents=True, exist_ok=True)
+        fd, staging = tempfile.mkstemp(prefix=f".{Path(path).name}.", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, ids=np.array(self.ids), coords=self.coords, modes=np.array(self.modes),
+                         graph_key=np.array(self.graph_key), distance_km=self.distance_km, minutes=self.minutes,
+                         source=self.source)
+            os.chmod(staging, 0o644)  # mkstemp creates the file 0600
+            os.replace(staging, path)
+        except BaseException:
+            Path(staging).unlink(missing_ok=True)
+            raise
+
+    @classmethod
+    def load(cls, path: str, modes: Sequence[str] = MATRIX_MODES, router=None,
+             graph_key: str = "") -> Optional["TravelTimeMatrix"]:
+        """
+        Matrix saved at `path` (without point details; add_points fills them in), or None
+
+        None too when it was saved for other modes or another routing graph.
+        """
+        try:
+            with np.load(path) as data:
+                if data["modes"].tolist() != list(modes) or str(data["graph_key"]) != graph_key:
+                    return None
+                ids, coords = data["ids"].tolist(), data["coords"]
+                distance_km, minutes, source = data["distance_km"], data["minutes"], data["source"]
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Error loading travel matrix: {e}")
+            return None
+
+        matrix = cls(modes, router, graph_key)
+        matrix._reserve(len(ids))
+        n = len(ids)
+        matrix.ids = ids
+        matrix.index = {point_id: i for i, point_id in enumerate(ids)}
+        matrix._coords[:n] = coords
+        matrix._distance[:, :n, :n] = distance_km
+        matrix._minutes[:, :n, :n] = minutes
+        matrix._source[:, :n, :n] = source
+        return matrix
+
+
+def routing_graph_key(path: str) -> str:
+    """Size and modification time of the routing graph file ("" when there is none)"""
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return ""
+    return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+
+@lru_cache()
+def get_travel_matrix() -> TravelTimeMatrix:
+    """
+    Saved matrix extended with any new or moved known points (and saved again if it changed)
+
+    Pairs are routed over the road network when the routing graph is built.
+    """
+    path = settings.TRAVEL_MATRIX_PATH
+    router = get_road_router()
+    graph_key = routing_graph_key(settings.ROUTING_GRAPH_PATH) if router is not None else ""
+    matrix = (TravelTimeMatrix.load(path, router=router, graph_key=graph_key) if Path(path).exists() else None) \
+        or TravelTimeMatrix(router=router, graph_key=graph_key)
+    if matrix.add_points(known_points()):
+        try:
+            matrix.save(path)
+        except OSError as e:
+            print(f"Error saving travel matrix: {e}")
+    return matrix
@@ -11,6 +11,7 @@ from email_validator import validate_email, EmailNotValidError
 import phonenumbers
 from phonenumbers import NumberParseException
 from backend.app.utils.geolocation import validate_coordinates, is_within_guwahati
+from backend.app.utils.service_areas import get_service_areas
 
 
 class ValidationError(Exception):
@@ -516,7 +517,8 @@ def validate_price(price: Union[str, float, int], field: str = "price", min_pric
 
 
 def validate_coordinates_input(lat: Union[str, float], lng: Union[str, float], field_prefix: str = "location",
-                               result: Optional[ValidationResult] = None) -> Tuple[bool, Optional[Tuple[float, float]]]:
+                               result: Optional[ValidationResult] = None,
+                               check_restricted: bool = False) -> Tuple[bool, Optional[Tuple[float, float]]]:
     """
     Validate latitude and longitude coordinates
 
@@ -525,6 +527,7 @@ def validate_coordinates_input(lat: Union[str, float], lng: Union[str, float], f
         lng: Longitude
         field_prefix: Prefix for field names
         result: Optional ValidationResult to add errors to
+        check_restricted: Also reject points inside restricted service areas
 
     Returns:
         Tuple of (is_valid, (lat, lng))
@@ -551,6 +554,13 @@ def validate_coordinates_input(lat: Union[str, float], lng: Union[str, float], f
                 result.add_error(field_prefix, "Location must be within Guwahati area", (lat_float, lng_float))
             return False, None
 
+        restricted = get_service_areas().areas_at(lat_float, lng_float, kind="restricted") if check_restricted else []
+        if restricted:
+            if result:
+                result.add_error(field_prefix, f"Location is inside a restricted zone: {restricted[0]['name']}",
+                                 (lat_float, lng_float))
+            return False, None
+
         return True, (lat_float, lng_float)
 
     except (ValueError, TypeError):
@@ -703,6 +713,41 @@ def validate_list_items(items: List[Any], field: str = "items", min_items: int =
     return True, cleaned_items
 
 
+def validate_fields_param(fields: Optional[str], allowed_fields: Tuple[str, ...], field: str = "fields",
+                          result: Optional[ValidationResult] = None) -> Tuple[bool, Optional[Tuple[str, ...]]]:
+    """
+    Validate a comma-separated sparse fieldset (e.g. "id,title,price_per_person")
+
+    Args:
+        fields: Raw query parameter value
+        allowed_fields: Whitelist of selectable fields
+        field: Field name for errors
+        result: Optional ValidationResult to add errors to
+
+    Returns:
+        Tuple of (is_valid, selected_fields); selected_fields is None when all fields are wanted
+    """
+    if fields is None or not fields.strip():
+        return True, None
+
+    selected = []
+    for name in fields.split(","):
+        name = name.strip()
+        if not name or name in selected:
+            continue
+        if name not in allowed_fields:
+            if result:
+                result.add_error(field, f"Unknown field '{name}'. Allowed: {', '.join(allowed_fields)}", fields)
+            return False, None
+        selected.append(name)
+
+    # The id is always returned so clients can fetch the full object
+    if "id" not in selected:
+        selected.insert(0, "id")
+
+    return True, tuple(selected)
+
+
 def validate_uuid(uuid_str: str, field: str = "id", result: Optional[ValidationResult] = None) -> Tuple[
     bool, Optional[str]]:
     """
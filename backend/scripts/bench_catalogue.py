@@ -0,0 +1,77 @@
+"""
+Regression benchmark for itinerary catalogue lookups.
+
+Lookup by id and by category must stay O(1) as the catalogue grows; the
+script exits non-zero if the largest catalogue is noticeably slower than
+the smallest one.
+
+Run from the repository root:
+    python -m backend.scripts.bench_catalogue
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.itinerary_catalogue import ItineraryCatalogue
+from backend.app.api.v1.endpoints.itineraries import ITINERARIES
+
+SIZES = [10, 1_000, 100_000]
+LOOKUPS = 200_000
+# Allowed slowdown of the largest catalogue vs the smallest. Hash lookups are flat;
+# the remaining growth is CPU cache misses, while the old linear scan grows ~1000x
+MAX_SLOWDOWN = 10.0
+
+
+def synthetic_catalogue(size: int):
+    template = ITINERARIES[0]
+    categories = ["spiritual", "nature", "cultural", "culinary", "historical"]
+    return [
+        {**template, "id": f"it_{n:06d}", "category": categories[n % len(categories)]}
+        for n in range(size)
+    ]
+
+
+def per_lookup_ns(fn, keys) -> float:
+    start = time.perf_counter()
+    for key in keys:
+        fn(key)
+    return (time.perf_counter() - start) / len(keys) * 1e9
+
+
+def linear_get(itineraries, itinerary_id):
+    for itinerary in itineraries:
+        if itinerary["id"] == itinerary_id:
+            return itinerary
+    return None
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Itinerary catalogue lookup benchmark")
+    print("=" * 60)
+    print(f"{'size':>8}{'build ms':>10}{'get ns':>10}{'linear ns':>12}{'category ns':>13}")
+
+    results = {}
+    for size in SIZES:
+        items = synthetic_catalogue(size)
+        start = time.perf_counter()
+        catalogue = ItineraryCatalogue(items)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        keys = [items[(n * 7919) % size]["id"] for n in range(LOOKUPS)]
+        get_ns = per_lookup_ns(catalogue.get, keys)
+        # The old O(N) scan, sampled: it is far too slow to run LOOKUPS times on big catalogues
+        linear_ns = per_lookup_ns(lambda key: linear_get(items, key), keys[:max(10, LOOKUPS // size)])
+        category_ns = per_lookup_ns(lambda c: catalogue.filter(category=c), ["nature"] * 10_000)
+
+        results[size] = get_ns
+        print(f"{size:>8}{build_ms:>10.1f}{get_ns:>10.0f}{linear_ns:>12.0f}{category_ns:>13.0f}")
+
+    slowdown = results[SIZES[-1]] / results[SIZES[0]]
+    print(f"\nget() slowdown {SIZES[0]} -> {SIZES[-1]} items: {slowdown:.2f}x (limit {MAX_SLOWDOWN}x)")
+    if slowdown > MAX_SLOWDOWN:
+        print("❌ Catalogue lookup is no longer O(1)")
+        sys.exit(1)
+    print("✅ Catalogue lookup is O(1)")
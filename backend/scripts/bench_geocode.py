@@ -0,0 +1,102 @@
+"""
+Reverse geocoding with the geohash cache against the local fake geocoder.
+
+Tourists cluster around a few landmarks and GPS fixes jitter by tens of
+metres, so most lookups fall into cells that were already resolved.
+
+Run from the repository root:
+    python -m backend.scripts.bench_geocode
+"""
+import sys
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import requests
+from backend.scripts import fake_geocoder
+from backend.app.services.geocoding_service import GeocodingService
+from backend.app.utils.cache import TieredCache
+from backend.app.utils.geolocation import GUWAHATI_LANDMARKS, MEETING_POINTS
+
+PORT = 9030
+BASE_URL = f"http://127.0.0.1:{PORT}/maps/api/geocode/json"
+LOOKUPS = 5000
+CONCURRENCY = 100
+BLOCKING_SAMPLE = 30
+JITTER_DEG = 0.0004  # ~45 m
+
+
+def workload(n: int):
+    rng = random.Random(17)
+    hotspots = [(p["lat"], p["lng"]) for p in list(GUWAHATI_LANDMARKS.values()) + list(MEETING_POINTS.values())]
+    return [
+        (lat + rng.gauss(0, JITTER_DEG), lng + rng.gauss(0, JITTER_DEG))
+        for lat, lng in rng.choices(hotspots, k=n)
+    ]
+
+
+def report(name: str, latencies, wall: float, upstream: int):
+    latencies = sorted(latencies)
+    print(f"{name:<30}{len(latencies) / wall:>9,.0f} req/s  p50 {statistics.median(latencies) * 1000:>7.2f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.2f} ms  upstream calls {upstream:>5}")
+
+
+async def blocking_baseline(points):
+    """The old behaviour: requests.get per lookup"""
+    before = fake_geocoder.STATS["requests"]
+    latencies = []
+
+    async def one(lat, lng):
+        start = time.perf_counter()
+        requests.get(BASE_URL, params={"latlng": f"{lat},{lng}", "key": "stub"})
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(lat, lng) for lat, lng in points))
+    report(f"blocking, uncached (n={len(points)})", latencies, time.perf_counter() - start,
+           fake_geocoder.STATS["requests"] - before)
+
+
+async def cached(service: GeocodingService, points, name: str):
+    before = fake_geocoder.STATS["requests"]
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one(lat, lng):
+        async with semaphore:
+            start = time.perf_counter()
+            await service.reverse_geocode(lat, lng)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(lat, lng) for lat, lng in points))
+    report(name, latencies, time.perf_counter() - start, fake_geocoder.STATS["requests"] - before)
+
+
+async def main():
+    server = fake_geocoder.start(PORT)
+    cache_path = str(Path(tempfile.mkdtemp()) / "geocode_cache.db")
+    points = workload(LOOKUPS)
+
+    await blocking_baseline(points[:BLOCKING_SAMPLE])
+
+    service = GeocodingService("stub", BASE_URL, cache=TieredCache(cache_path, table="reverse_geocode"))
+    await cached(service, points, "cold cache, single-flight")
+    await cached(service, workload(LOOKUPS), "warm cache, new fixes")
+    print(f"  cache stats {service.cache.stats}")
+    await service.aclose()
+
+    restarted = GeocodingService("stub", BASE_URL, cache=TieredCache(cache_path, table="reverse_geocode"))
+    await cached(restarted, points, "after restart (disk tier)")
+    await restarted.aclose()
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,135 @@
+"""
+Itinerary search on a large seeded table: the old split path (PostGIS query
+through exec_sql that dropped the other filters, OFFSET paging) vs the
+search_itineraries RPC (every filter in one statement, keyset paging).
+
+Seeds rows titled "bench-search ..." under an existing vendor and removes them
+afterwards (unless --keep). Needs SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY,
+and sql/search_itineraries.sql applied.
+
+Run from the repository root:
+    python -m backend.scripts.bench_itinerary_search [--rows 200000] [--pages 20] [--keep]
+"""
+import sys
+import argparse
+import asyncio
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from supabase import create_client
+from backend.app.core.config import settings
+from backend.app.services.itinerary_service import ItineraryService
+
+TITLE_PREFIX = "bench-search"
+ORIGIN = (26.1665, 91.7065)
+PAGE_SIZE = 20
+
+SEED_SQL = """
+INSERT INTO itineraries (title, description, duration_minutes, category, difficulty, price_per_person,
+                         max_group_size, meeting_point, meeting_address, vendor_id, is_active, created_at)
+SELECT '{prefix} ' || n || CASE WHEN n % 7 = 0 THEN ' heritage walk' ELSE ' tour' END,
+       'Seeded for bench_itinerary_search',
+       30 + (n % 8) * 30,
+       (ARRAY['spiritual', 'nature', 'heritage', 'culinary', 'cultural'])[1 + n % 5],
+       'easy',
+       300 + (n % 40) * 50,
+       10,
+       ST_SetSRID(ST_MakePoint(91.60 + random() * 0.30, 26.08 + random() * 0.16), 4326),
+       'Guwahati',
+       '{vendor_id}',
+       n % 10 <> 0,
+       now() - (n || ' minutes')::interval
+FROM generate_series(1, {rows}) AS n;
+"""
+
+OLD_GEO_SQL = """
+SELECT *, ST_Distance(meeting_point::geography, ST_SetSRID(ST_MakePoint({lng}, {lat}), 4326)::geography) / 1000
+       AS distance_km
+FROM itineraries
+WHERE ST_DWithin(meeting_point::geography, ST_SetSRID(ST_MakePoint({lng}, {lat}), 4326)::geography, {radius_m})
+AND is_active = true
+ORDER BY distance_km
+LIMIT {limit} OFFSET {offset};
+"""
+
+
+def timed(name: str, fn, count: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<52}{elapsed * 1000:>9.1f} ms  {elapsed / count * 1000:>7.1f} ms/page")
+    return result
+
+
+async def page_through(service: ItineraryService, pages: int, **filters):
+    cursor, seen = None, []
+    for _ in range(pages):
+        result = await service.search_itineraries(limit=PAGE_SIZE, cursor=cursor, **filters)
+        seen.extend(item["id"] for item in result["items"])
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    return seen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark itinerary search on a seeded table")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--keep", action="store_true", help="Leave the seeded rows (e.g. for EXPLAIN)")
+    args = parser.parse_args()
+
+    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+    service = ItineraryService()
+    service.supabase = supabase
+
+    vendors = supabase.table("vendors").select("id").limit(1).execute().data
+    if not vendors:
+        print("No vendor to own the seeded itineraries; run seed_data first")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    supabase.rpc("exec_sql", {"query": SEED_SQL.format(prefix=TITLE_PREFIX, rows=args.rows,
+                                                       vendor_id=vendors[0]["id"])}).execute()
+    supabase.rpc("exec_sql", {"query": "ANALYZE itineraries;"}).execute()
+    print(f"Seeded {args.rows:,} itineraries in {time.perf_counter() - start:.1f}s\n")
+
+    try:
+        radius_m = 3000
+        old = timed(
+            f"old: radius via exec_sql, OFFSET, {args.pages} pages",
+            lambda: [
+                supabase.rpc("exec_sql", {"query": OLD_GEO_SQL.format(
+                    lat=ORIGIN[0], lng=ORIGIN[1], radius_m=radius_m, limit=PAGE_SIZE, offset=page * PAGE_SIZE
+                )}).execute()
+                for page in range(args.pages)
+            ],
+            args.pages
+        )
+        new = timed(
+            f"new: radius via search_itineraries, keyset, {args.pages} pages",
+            lambda: asyncio.run(page_through(service, args.pages, latitude=ORIGIN[0], longitude=ORIGIN[1],
+                                             radius_km=radius_m / 1000)),
+            args.pages
+        )
+        old_ids = [row["id"] for response in old for row in response.data or []]
+        print(f"  same rows in the same order: {old_ids == new}\n")
+
+        filters = dict(latitude=ORIGIN[0], longitude=ORIGIN[1], radius_km=5, category="heritage",
+                       duration_max=120, price_max=1200, search="walk")
+        filtered = timed("new: radius + every filter, keyset",
+                         lambda: asyncio.run(page_through(service, args.pages, **filters)), args.pages)
+        print(f"  {len(filtered)} rows (the old path ignored these filters)\n")
+
+        timed("new: newest first, keyset",
+              lambda: asyncio.run(page_through(service, args.pages)), args.pages)
+    finally:
+        if not args.keep:
+            supabase.rpc("exec_sql", {"query": f"DELETE FROM itineraries WHERE title LIKE '{TITLE_PREFIX} %';"}) \
+                .execute()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Itinerary map clusters: payload of the raw itinerary list vs clustered
+tiles for a city viewport, tile latency, and the cost of an incremental
+update (one itinerary moved) vs rebuilding every zoom level.
+
+Run from the repository root:
+    python -m backend.scripts.bench_map_clusters
+"""
+import sys
+import json
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.map_clusters import PinClusterer
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS, tile_for_point
+
+ITINERARIES = 5000
+CATEGORIES = ("spiritual", "heritage", "nature", "food", "culture")
+
+
+def timed(name: str, fn, count: int = 1):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<44}{elapsed * 1000:>9.2f} ms  {elapsed / count * 1e6:>9.1f} us each")
+    return result
+
+
+def viewport_tiles(zoom: int):
+    west, north = tile_for_point(GUWAHATI_BOUNDS["north"], GUWAHATI_BOUNDS["west"], zoom)
+    east, south = tile_for_point(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["east"], zoom)
+    return [(zoom, x, y) for x in range(west, east + 1) for y in range(north, south + 1)]
+
+
+def main():
+    rng = random.Random(4)
+    itineraries = [
+        {
+            "id": f"it_{i:05d}",
+            "title": f"Itinerary {i}",
+            "category": rng.choice(CATEGORIES),
+            "meeting_point": {
+                "lat": rng.uniform(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["north"]),
+                "lng": rng.uniform(GUWAHATI_BOUNDS["west"], GUWAHATI_BOUNDS["east"])
+            }
+        }
+        for i in range(ITINERARIES)
+    ]
+    raw_bytes = len(json.dumps(itineraries))
+
+    clusterer = PinClusterer()
+    timed(f"build ({ITINERARIES} pins, zooms 0-{clusterer.max_zoom})", lambda: clusterer.sync(itineraries))
+    print()
+
+    for zoom in (10, 12, 14, 16, 18):
+        tiles = viewport_tiles(zoom)
+        bodies = timed(f"z{zoom}: {len(tiles)} tiles, cold", lambda: [clusterer.tile_body(*t) for t in tiles],
+                       len(tiles))
+        timed(f"z{zoom}: {len(tiles)} tiles, cached", lambda: [clusterer.tile_body(*t) for t in tiles], len(tiles))
+        payload = [json.loads(body.body) for body in bodies]
+        total = sum(c["count"] for p in payload for c in p["clusters"]) + sum(len(p["pins"]) for p in payload)
+        features = sum(len(p["clusters"]) + len(p["pins"]) for p in payload)
+        size = sum(len(body.body) for body in bodies)
+        print(f"  {features} features for {total}/{ITINERARIES} pins, "
+              f"{size / 1024:.0f} KiB vs raw list {raw_bytes / 1024:.0f} KiB\n")
+
+    moved = [dict(i) for i in itineraries]
+    moved[0] = dict(moved[0], meeting_point={"lat": 26.1665, "lng": 91.7065})
+    changes = timed("incremental sync (1 itinerary moved)", lambda: clusterer.sync(moved))
+    timed("full rebuild", lambda: PinClusterer().sync(moved))
+    print(f"  {changes} pin(s) updated")
+
+
+if __name__ == "__main__":
+    main()
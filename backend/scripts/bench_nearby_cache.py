@@ -0,0 +1,173 @@
+"""
+Nearby-itinerary cache: hit rate and latency of hotspot traffic through
+NearbyCache vs querying every request, a check that cached answers match a
+direct query, and how many entries one itinerary write invalidates.
+
+The database is replaced by an in-memory search over synthetic itineraries
+with a fixed simulated round trip, so only the cache itself is measured.
+
+Run from the repository root:
+    python -m backend.scripts.bench_nearby_cache [--requests 5000] [--latency-ms 20]
+"""
+import sys
+import argparse
+import asyncio
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+from backend.app.core.config import settings
+from backend.app.services.nearby_cache import NearbyCache
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS, haversine_array
+
+ITINERARIES = 5000
+CATEGORIES = ("spiritual", "heritage", "nature", "culinary", "cultural")
+RADII_KM = (1, 2, 3, 5)
+
+# Where nearby requests come from, with the spread (degrees) of the reported positions
+HOTSPOTS = {
+    "Kamakhya gate": (26.1665, 91.7065),
+    "Kachari Ghat": (26.1920, 91.7460),
+    "Pan Bazaar": (26.1860, 91.7440),
+    "Railway station": (26.1820, 91.7510),
+}
+JITTER_DEG = 0.003
+
+
+class FakeDatabase:
+    """search_itineraries over an in-memory table, with a simulated round trip"""
+
+    def __init__(self, itineraries, latency_s: float):
+        self.itineraries = itineraries
+        self.coords = np.array([(i["meeting_point"]["lat"], i["meeting_point"]["lng"]) for i in itineraries])
+        self.latency_s = latency_s
+        self.queries = 0
+
+    def search(self, lat, lng, radius_km, filters):
+        distances = haversine_array(lat, lng, self.coords[:, 0], self.coords[:, 1])
+        found = []
+        for i in np.flatnonzero(distances <= radius_km).tolist():
+            itinerary = self.itineraries[i]
+            if filters.get("category") is not None and itinerary["category"] != filters["category"]:
+                continue
+            if filters.get("price_max") is not None and itinerary["price_per_person"] > filters["price_max"]:
+                continue
+            found.append((float(distances[i]), itinerary["id"], itinerary))
+        # Nearest first by exact distance, like ORDER BY distance_m, id
+        return [{**itinerary, "distance_km": round(distance, 2)} for distance, _, itinerary in sorted(found)]
+
+    async def fetch(self, lat, lng, radius_km, filters):
+        self.queries += 1
+        await asyncio.sleep(self.latency_s)
+        return self.search(lat, lng, radius_km, filters)
+
+    async def fetch_candidates(self, lat, lng, radius_km, filters):
+        """fetch as the service passes it to the cache: None past NEARBY_CACHE_MAX_CANDIDATES"""
+        items = await self.fetch(lat, lng, radius_km, filters)
+        return items if len(items) <= settings.NEARBY_CACHE_MAX_CANDIDATES else None
+
+    def move(self, index: int, lat: float, lng: float):
+        self.itineraries[index] = dict(self.itineraries[index], meeting_point={"lat": lat, "lng": lng})
+        self.coords[index] = (lat, lng)
+
+
+def synthetic_itineraries(rng: random.Random):
+    return [
+        {
+            "id": f"it_{i:05d}",
+            "title": f"Itinerary {i}",
+            "category": rng.choice(CATEGORIES),
+            "price_per_person": rng.randrange(300, 2500, 50),
+            "meeting_point": {
+                "lat": rng.uniform(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["north"]),
+                "lng": rng.uniform(GUWAHATI_BOUNDS["west"], GUWAHATI_BOUNDS["east"])
+            }
+        }
+        for i in range(ITINERARIES)
+    ]
+
+
+def hotspot_requests(rng: random.Random, count: int):
+    requests = []
+    for _ in range(count):
+        lat, lng = rng.choice(list(HOTSPOTS.values()))
+        filters = {"category": rng.choice((None, None, "spiritual", "heritage")), "price_max": None}
+        requests.append((lat + rng.gauss(0, JITTER_DEG), lng + rng.gauss(0, JITTER_DEG), rng.choice(RADII_KM),
+                         filters))
+    return requests
+
+
+async def nearby(cache: NearbyCache, database: FakeDatabase, lat, lng, radius_km, filters):
+    """The service's path: the cache, or a direct query when the area is too busy to cache"""
+    cached = await cache.nearby(lat, lng, radius_km, filters, database.fetch_candidates)
+    if cached is None:
+        cached = await database.fetch(lat, lng, radius_km, filters)
+    return cached
+
+
+def ids(items):
+    return [(item["id"], item["distance_km"]) for item in items]
+
+
+async def run(args):
+    rng = random.Random(49)
+    database = FakeDatabase(synthetic_itineraries(rng), args.latency_ms / 1000)
+    requests = hotspot_requests(rng, args.requests)
+
+    start = time.perf_counter()
+    for lat, lng, radius_km, filters in requests:
+        await database.fetch(lat, lng, radius_km, filters)
+    direct = time.perf_counter() - start
+    print(f"{'direct: every request queried':<40}{direct:>8.2f} s  {direct / len(requests) * 1000:>7.2f} ms each")
+
+    cache = NearbyCache()
+    database.queries = 0
+    start = time.perf_counter()
+    for lat, lng, radius_km, filters in requests:
+        await nearby(cache, database, lat, lng, radius_km, filters)
+    cached_time = time.perf_counter() - start
+    print(f"{'cached':<40}{cached_time:>8.2f} s  {cached_time / len(requests) * 1000:>7.2f} ms each")
+    total = cache.hits + cache.misses
+    print(f"  hit rate {cache.hits / total:.1%}, {database.queries} queries for {len(requests)} requests, "
+          f"{len(cache)} entries")
+
+    mismatches = 0
+    for lat, lng, radius_km, filters in requests:
+        cached = await nearby(cache, database, lat, lng, radius_km, filters)
+        mismatches += ids(cached) != ids(database.search(lat, lng, radius_km, filters))
+    print(f"  {mismatches} answers differ from a direct query\n")
+
+    # A write drops only the entries whose candidate circle covers the old or new location
+    before = len(cache)
+    held = database.search(*HOTSPOTS["Kamakhya gate"], 1, {})[0]["id"]
+    moved = next(i for i, item in enumerate(database.itineraries) if item["id"] == held)
+    new_point = HOTSPOTS["Pan Bazaar"]
+    old_point = database.itineraries[moved]["meeting_point"]
+    database.move(moved, *new_point)
+    dropped = cache.invalidate_itinerary(database.itineraries[moved]["id"], {"lat": new_point[0],
+                                                                             "lng": new_point[1]})
+    print(f"move {database.itineraries[moved]['id']} from ({old_point['lat']:.4f}, {old_point['lng']:.4f}) "
+          f"to Pan Bazaar: {dropped}/{before} entries dropped")
+
+    stale = 0
+    for lat, lng, radius_km, filters in requests[:500]:
+        cached = await nearby(cache, database, lat, lng, radius_km, filters)
+        stale += ids(cached) != ids(database.search(lat, lng, radius_km, filters))
+    print(f"  {stale} stale answers in the next 500 requests")
+
+    far = (GUWAHATI_BOUNDS["south"] + 0.005, GUWAHATI_BOUNDS["west"] + 0.005)
+    print(f"  a write far from every hotspot drops {cache.invalidate_point(*far)}/{len(cache)} entries")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the nearby-itinerary cache")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=20)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Checkout load test against the local fake Razorpay server.
+
+Run from the repository root:
+    python -m backend.scripts.bench_payments
+"""
+import sys
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import requests
+from backend.scripts import fake_razorpay
+from backend.app.services.payment_gateway import RazorpayGateway, PaymentGatewayError, CircuitOpenError
+from backend.app.services.payment_service import compute_payment_signature
+
+PORT = 9010
+BASE_URL = f"http://127.0.0.1:{PORT}/v1"
+CONCURRENCY = 200
+ORDER = {"amount": 120000, "currency": "INR", "receipt": "booking_bench", "payment_capture": 1}
+
+
+def report(name: str, latencies, wall: float, failures: int = 0):
+    latencies = sorted(latencies)
+    p50 = statistics.median(latencies) * 1000 if latencies else 0
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0
+    print(f"{name:<34}{len(latencies) / wall:>9,.0f} ops/s  p50 {p50:>7.1f} ms  p99 {p99:>7.1f} ms"
+          f"  failures {failures}")
+
+
+async def blocking_checkout(n: int):
+    """The old behaviour: a synchronous HTTP call made straight from async code"""
+    session = requests.Session()
+    latencies = []
+
+    async def one():
+        start = time.perf_counter()
+        session.post(f"{BASE_URL}/orders", json=ORDER, auth=("key", "secret"))
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    report("blocking SDK-style calls", latencies, time.perf_counter() - start)
+
+
+async def async_checkout(n: int, gateway: RazorpayGateway, name: str):
+    latencies, failures = [], 0
+
+    async def one():
+        nonlocal failures
+        start = time.perf_counter()
+        try:
+            await gateway.create_order(ORDER)
+            latencies.append(time.perf_counter() - start)
+        except PaymentGatewayError:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(n)))
+    report(name, latencies, time.perf_counter() - start, failures)
+
+
+async def breaker_demo():
+    gateway = RazorpayGateway("key", "secret", base_url="http://127.0.0.1:9", max_retries=1, backoff_base=0.01)
+    timings = []
+    for _ in range(10):
+        start = time.perf_counter()
+        try:
+            await gateway.fetch_order("order_missing")
+        except CircuitOpenError:
+            timings.append(("open", time.perf_counter() - start))
+        except PaymentGatewayError:
+            timings.append(("failed", time.perf_counter() - start))
+    await gateway.aclose()
+    opened = sum(1 for state, _ in timings if state == "open")
+    print(f"dead gateway: {len(timings) - opened} real attempts, {opened} short-circuited "
+          f"(breaker state: {gateway.breaker.state})")
+
+
+async def verify_latency(iterations: int = 200):
+    """/transactions/verify: SDK verify + gateway fetch vs local HMAC + our own order record"""
+    import hmac
+    import razorpay
+
+    secret = "bench_secret"
+    gateway = RazorpayGateway("key", secret, base_url=BASE_URL)
+    order = await gateway.create_order(ORDER)
+    payment_id = "pay_bench"
+    signature = compute_payment_signature(order["id"], payment_id, secret)
+    sdk = razorpay.Client(auth=("key", secret))
+    recorded_orders = {order["id"]: {"amount": order["amount"] / 100}}
+
+    old, new = [], []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        sdk.utility.verify_payment_signature({
+            "razorpay_order_id": order["id"],
+            "razorpay_payment_id": payment_id,
+            "razorpay_signature": signature
+        })
+        await gateway.fetch_order(order["id"])
+        old.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        expected = compute_payment_signature(order["id"], payment_id, secret)
+        assert hmac.compare_digest(expected, signature)
+        recorded_orders[order["id"]]["amount"]
+        new.append(time.perf_counter() - start)
+    await gateway.aclose()
+
+    print(f"verify: SDK + gateway fetch     p50 {statistics.median(old) * 1000:>8.3f} ms")
+    print(f"verify: local HMAC + record     p50 {statistics.median(new) * 1000:>8.3f} ms "
+          f"(plus one indexed transactions read)")
+
+
+async def main():
+    print("=" * 60)
+    print(f"Checkout load test ({CONCURRENCY} concurrent orders, "
+          f"{fake_razorpay.LATENCY_MS:.0f} ms gateway latency)")
+    print("=" * 60)
+
+    await blocking_checkout(CONCURRENCY // 4)
+
+    gateway = RazorpayGateway("key", "secret", base_url=BASE_URL)
+    await async_checkout(CONCURRENCY, gateway, "async pooled gateway")
+
+    fake_razorpay.ERROR_RATE = 0.2
+    await async_checkout(CONCURRENCY, gateway, "async gateway, 20% 503s")
+    fake_razorpay.ERROR_RATE = 0.0
+    await gateway.aclose()
+
+    await breaker_demo()
+    await verify_latency()
+
+
+if __name__ == "__main__":
+    server = fake_razorpay.run_in_thread(port=PORT)
+    try:
+        asyncio.run(main())
+    finally:
+        server.should_exit = True
@@ -0,0 +1,112 @@
+"""
+Phrasebook store: build time, lookups and search at scale.
+
+Builds a synthetic phrasebook of thousands of phrases in Assamese, Hindi and
+Bengali and compares indexed queries with the per-request scan they replace.
+
+Run from the repository root:
+    python -m backend.scripts.bench_phrasebook
+"""
+import sys
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.phrasebook import Phrasebook, get_phrasebook, records_from_phrases
+from backend.app.services.translation_service import TranslationService, split_phrase
+from backend.app.utils.validation import sanitize_input
+
+PHRASES = 5000
+QUERIES = 2000
+WORDS = ["temple", "river", "market", "ticket", "ferry", "tea", "silk", "hotel", "doctor", "station",
+         "museum", "bridge", "bazaar", "garden", "festival", "ghat", "island", "hill", "bus", "rickshaw"]
+VERBS = ["where is the", "how much is the", "take me to the", "is there a", "i am looking for the",
+         "please show me the", "how far is the", "when does the", "can i visit the", "what time is the"]
+
+
+def synthetic_phrases(n: int):
+    """{lang: {category: {key: "text (phonetic)"}}} with n phrases per language"""
+    rng = random.Random(3)
+    categories = ["greetings", "directions", "emergency", "shopping", "food", "transport", "sightseeing"]
+    phrases = {lang: {} for lang in ("as", "hi", "bn")}
+    for i in range(n):
+        english = f"{rng.choice(VERBS)} {rng.choice(WORDS)} {i}"
+        key = english.replace(" ", "_")
+        category = categories[i % len(categories)]
+        for lang in phrases:
+            phonetic = f"{rng.choice(WORDS)[::-1]} {lang}{i}"
+            phrases[lang].setdefault(category, {})[key] = f"{lang}-{i} ({phonetic})"
+    return phrases
+
+
+def timed(fn, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        fn()
+    return (time.perf_counter() - start) / n
+
+
+def old_phrasebook_request(phrases_by_category):
+    """The replaced path: re-split every phrase and sanitize it on each request"""
+    phrases = []
+    for category, category_phrases in phrases_by_category.items():
+        for key, value in category_phrases.items():
+            phrases.append({
+                "id": f"{category}_{key}",
+                "english": key.replace("_", " ").title(),
+                "assamese": value.split(" (")[0],
+                "phonetic": value.split(" (")[1].rstrip(")") if "(" in value else "",
+                "category": category
+            })
+    return [sanitize_input(phrase) for phrase in phrases]
+
+
+def main():
+    builtin = get_phrasebook()
+    print(f"built-in phrasebook: {len(builtin)} phrases, languages {builtin.languages}, "
+          f"categories {builtin.categories}")
+    print(f"  'turn' -> {[p['english'] for p in builtin.search('turn')]}")
+    print(f"  'hospitel' (typo, hi) -> {[(p['english'], p['hindi']) for p in builtin.search('hospitel', 'hi')]}")
+
+    data = synthetic_phrases(PHRASES)
+    start = time.perf_counter()
+    phrasebook = Phrasebook(records_from_phrases(data))
+    print(f"\nsynthetic phrasebook: {len(phrasebook):,} phrases x {len(phrasebook.languages)} languages, "
+          f"built in {time.perf_counter() - start:.2f}s")
+
+    per_request = timed(lambda: old_phrasebook_request(data["as"]), 3)
+    indexed = timed(lambda: phrasebook.body("as", "food").body, 10000)
+    print(f"  full category list: per-request build {per_request * 1000:,.1f} ms, "
+          f"pre-encoded {indexed * 1e6:.2f} us")
+
+    rng = random.Random(5)
+    prefixes = [rng.choice(WORDS)[:rng.randint(2, 5)] for _ in range(QUERIES)]
+    typos = []
+    for _ in range(QUERIES):
+        word = rng.choice(WORDS)
+        position = rng.randrange(len(word))
+        typos.append(f"{rng.choice(VERBS)} {word[:position]}x{word[position + 1:]}")
+
+    all_english = [(record["english"].lower(), record) for record in phrasebook.records]
+
+    def scan(query):
+        return [record for english, record in all_english if query in english][:20]
+
+    for name, queries in (("prefix", prefixes), ("fuzzy (typo)", typos)):
+        start = time.perf_counter()
+        hits = sum(1 for query in queries if phrasebook.search(query, "bn"))
+        indexed = (time.perf_counter() - start) / len(queries)
+        start = time.perf_counter()
+        scan_hits = sum(1 for query in queries[:200] if scan(query))
+        scanned = (time.perf_counter() - start) / 200
+        print(f"  {name:<13} search {indexed * 1e6:>8.1f} us/query ({hits / len(queries):.0%} answered)   "
+              f"substring scan {scanned * 1e6:>8.1f} us/query ({scan_hits / 200:.0%} answered)")
+
+    text, phonetic = split_phrase(TranslationService.PHRASES["greetings"]["hello"])
+    print(f"\nsplit_phrase sanity: {text} / {phonetic}")
+
+
+if __name__ == "__main__":
+    main()
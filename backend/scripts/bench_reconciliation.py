@@ -0,0 +1,131 @@
+"""
+Payment reconciliation throughput and memory against the local fake Razorpay server.
+
+Run from the repository root (the order count defaults to 1M):
+    python -m backend.scripts.bench_reconciliation [orders]
+"""
+import sys
+import asyncio
+import resource
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.scripts import fake_razorpay
+from backend.app.services.payment_gateway import RazorpayGateway
+from backend.app.services.reconciliation import PaymentReconciler
+
+PORT = 9011
+BASE_URL = f"http://127.0.0.1:{PORT}/v1"
+LATENCY_MS = 5
+SEQUENTIAL_SAMPLE = 200
+
+
+class SyntheticLedger:
+    """
+    Ledger matching the fake gateway's synthetic orders, generated on demand
+    (nothing is stored, so the memory reported is the job's own)
+
+    Every 10th order has no transaction; half of the paid orders were never
+    marked paid locally; every 1000th unpaid order is marked paid by mistake.
+    """
+
+    def __init__(self):
+        self.reads = 0
+        self.writes = 0
+
+    @staticmethod
+    def transaction(index: int):
+        if index % 10 == 9:
+            return None
+        gateway_paid = index % 4 != 0
+        paid = (gateway_paid and index % 2 == 0) or (not gateway_paid and index % 1000 == 0)
+        return {
+            "id": f"txn_{index}",
+            "booking_id": f"booking_{index}",
+            "razorpay_order_id": f"order_syn{index:011d}",
+            "amount": (50000 + (index % 50) * 1000) / 100,
+            "status": "paid" if paid else "created"
+        }
+
+    async def get_by_order_ids(self, order_ids):
+        order_ids = list(order_ids)
+        self.reads += (len(order_ids) + 199) // 200
+        transactions = {}
+        for order_id in order_ids:
+            transaction = self.transaction(int(order_id[len("order_syn"):]))
+            if transaction:
+                transactions[order_id] = transaction
+        return transactions
+
+    async def get_booking_payment_statuses(self, booking_ids):
+        booking_ids = list(booking_ids)
+        self.reads += (len(booking_ids) + 199) // 200
+        return {
+            booking_id: self.transaction(int(booking_id[len("booking_"):]))["status"]
+            for booking_id in booking_ids
+        }
+
+    async def mark_paid(self, transaction_id, fields):
+        self.writes += 1
+        index = int(transaction_id[len("txn_"):])
+        if fields.get("razorpay_payment_id") != f"pay_syn{index:011d}":
+            raise AssertionError(f"{transaction_id} marked paid without its captured payment")
+        return {**self.transaction(index), **fields, "status": "paid"}
+
+    async def mark_bookings_paid(self, booking_ids):
+        self.writes += (len(list(booking_ids)) + 199) // 200
+
+
+async def sequential_estimate(gateway: RazorpayGateway, total: int) -> float:
+    """The per-booking alternative: one get_order call after another"""
+    start = time.perf_counter()
+    for i in range(SEQUENTIAL_SAMPLE):
+        await gateway.list_orders(count=1, skip=i)
+    return (time.perf_counter() - start) / SEQUENTIAL_SAMPLE * total
+
+
+async def main(total: int):
+    fake_razorpay.LATENCY_MS = LATENCY_MS
+    fake_razorpay.SYNTHETIC_ORDERS = total
+    server = fake_razorpay.run_in_thread(port=PORT)
+
+    gateway = RazorpayGateway("key", "secret", base_url=BASE_URL)
+    ledger = SyntheticLedger()
+    checkpoint_path = Path(tempfile.mkdtemp()) / "reconcile_checkpoint.json"
+    reconciler = PaymentReconciler(ledger, gateway, checkpoint_path=str(checkpoint_path), concurrency=16)
+
+    print(f"reconciling {total:,} orders (gateway latency {LATENCY_MS} ms, "
+          f"{reconciler.concurrency} pages of {reconciler.page_size} in flight)")
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+
+    # Interrupted run, then resume from the checkpoint
+    partial = await reconciler.run(fresh=True, max_windows=10)
+    print(f"  interrupted after {partial['skip']:,} orders, checkpoint at {checkpoint_path.name}")
+    result = await reconciler.run()
+
+    wall = time.perf_counter() - start
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    stats = result["stats"]
+
+    print(f"  scanned {stats['orders_scanned']:,} orders in {wall:.1f}s "
+          f"({stats['orders_scanned'] / wall:,.0f} orders/s)")
+    print(f"  corrections: {stats['transactions_marked_paid']:,} transactions and "
+          f"{stats['bookings_marked_paid']:,} bookings marked paid")
+    print(f"  unmatched orders {stats['unmatched_orders']:,}, flagged for review {stats['flagged']:,}")
+    print(f"  ledger round trips: {ledger.reads:,} reads, {ledger.writes:,} writes")
+    print(f"  peak RSS growth {(rss_after - rss_before) / 1024:,.1f} MB "
+          f"(process peak {rss_after / 1024:,.1f} MB, includes the fake server)")
+
+    estimate = await sequential_estimate(gateway, total)
+    print(f"  sequential get_order per booking would take ~{estimate / 60:,.0f} min")
+
+    await gateway.aclose()
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000))
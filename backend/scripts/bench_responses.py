@@ -0,0 +1,130 @@
+"""
+Throughput benchmark for the public catalogue/support endpoints.
+
+Run from the repository root:
+    python -m backend.scripts.bench_responses
+"""
+import sys
+import gzip
+import json
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from fastapi.testclient import TestClient
+from backend.app.main import app
+from backend.app.utils.helpers import to_json_bytes, serialize_datetime
+from backend.app.api.v1.endpoints.itineraries import ITINERARIES
+from backend.app.services.translation_service import TranslationService
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENDPOINTS = [
+    "/api/v1/itineraries/",
+    "/api/v1/itineraries/featured",
+    "/api/v1/itineraries/it_001",
+    "/api/v1/support/phrasebook",
+    "/api/v1/support/emergency-contacts",
+]
+
+PAYLOADS = {
+    "catalogue": ITINERARIES,
+    "phrasebook": {"phrases": TranslationService.get_common_phrases()},
+    "emergency_contacts": {"contacts": TranslationService.get_emergency_contacts()},
+}
+
+
+def time_it(fn, iterations: int) -> float:
+    """Return operations per second for fn"""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed if elapsed else float("inf")
+
+
+def bench_serialization(iterations: int = 20000):
+    print("\n=== Serialization (ops/sec) ===")
+    print(f"{'payload':<22}{'json.dumps':>14}{'orjson':>14}{'pre-encoded':>14}{'bytes':>8}")
+    for name, payload in PAYLOADS.items():
+        body = to_json_bytes(payload)
+        stdlib = time_it(lambda: json.dumps(payload, default=serialize_datetime).encode("utf-8"), iterations)
+        fast = time_it(lambda: to_json_bytes(payload), iterations)
+        cached = time_it(lambda: body, iterations)
+        print(f"{name:<22}{stdlib:>14,.0f}{fast:>14,.0f}{cached:>14,.0f}{len(body):>8}")
+
+
+def bench_endpoints(iterations: int = 2000, headers: dict = None):
+    print("\n=== Endpoint throughput (req/sec, in-process) ===")
+    client = TestClient(app)
+    for path in ENDPOINTS:
+        response = client.get(path, headers=headers)
+        rps = time_it(lambda: client.get(path, headers=headers), iterations)
+        print(f"{path:<40}{response.status_code:>5}{rps:>12,.0f}{len(response.content):>8} bytes")
+
+
+def bench_conditional(iterations: int = 2000):
+    print("\n=== Conditional GETs: 200 vs 304 ===")
+    print(f"{'path':<40}{'200 req/s':>12}{'304 req/s':>12}{'bytes saved':>13}")
+    client = TestClient(app)
+    for path in ENDPOINTS:
+        first = client.get(path)
+        etag = first.headers.get("etag")
+        if not etag:
+            print(f"{path:<40}{'(not cacheable)':>24}")
+            continue
+        revalidate = {"If-None-Match": etag}
+        not_modified = client.get(path, headers=revalidate)
+        full_rps = time_it(lambda: client.get(path), iterations)
+        cached_rps = time_it(lambda: client.get(path, headers=revalidate), iterations)
+        saved = len(first.content) - len(not_modified.content)
+        print(f"{path:<40}{full_rps:>12,.0f}{cached_rps:>12,.0f}{saved:>13}")
+
+
+def bench_compression(iterations: int = 2000):
+    print("\n=== Compression: CPU cost vs bytes saved ===")
+    codecs = [(f"gzip-{level}", lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0))
+              for level in (1, 6, 9)]
+    if brotli is not None:
+        codecs += [(f"br-{quality}", lambda data, quality=quality: brotli.compress(data, quality=quality))
+                   for quality in (1, 5, 11)]
+
+    print(f"{'payload':<22}{'codec':<10}{'bytes':>8}{'ratio':>8}{'us/op':>10}")
+    for name, payload in PAYLOADS.items():
+        body = to_json_bytes(payload)
+        print(f"{name:<22}{'identity':<10}{len(body):>8}{1.0:>8.2f}{0.0:>10.1f}")
+        for codec, fn in codecs:
+            compressed = fn(body)
+            ops = time_it(lambda: fn(body), iterations)
+            print(f"{'':<22}{codec:<10}{len(compressed):>8}{len(body) / len(compressed):>8.2f}{1e6 / ops:>10.1f}")
+
+
+def bench_sparse_fields(iterations: int = 2000):
+    print("\n=== Sparse fieldsets: payload size ===")
+    client = TestClient(app)
+    mobile_fields = "id,title,price_per_person,vendor,image_url"
+    identity = {"Accept-Encoding": "identity"}
+    for path in ["/api/v1/itineraries/", "/api/v1/itineraries/?category=spiritual"]:
+        separator = "&" if "?" in path else "?"
+        full = client.get(path, headers=identity)
+        sparse_path = f"{path}{separator}fields={mobile_fields}"
+        sparse = client.get(sparse_path, headers=identity)
+        full_rps = time_it(lambda: client.get(path, headers=identity), iterations)
+        sparse_rps = time_it(lambda: client.get(sparse_path, headers=identity), iterations)
+        print(f"{path:<42}full {len(full.content):>6} B {full_rps:>8,.0f} req/s | "
+              f"fields= {len(sparse.content):>6} B {sparse_rps:>8,.0f} req/s")
+
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("Response serialization benchmark")
+    print("=" * 60)
+    bench_serialization()
+    bench_endpoints()
+    bench_conditional()
+    bench_compression()
+    bench_sparse_fields()
@@ -0,0 +1,87 @@
+"""
+Route analysis: per-pair helper calls in a Python loop vs one vectorized pass.
+
+The loop is what callers did before: calculate_travel_time per leg and mode,
+and calculate_safety_score at each sample along the leg.
+
+Run from the repository root:
+    python -m backend.scripts.bench_route_analysis
+"""
+import sys
+import math
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.utils.geolocation import (
+    GUWAHATI_BOUNDS, TRAVEL_SPEEDS_KMH, calculate_distance, calculate_safety_score, calculate_travel_time
+)
+from backend.app.utils.route_analysis import analyze_route
+from backend.app.utils.safety_raster import get_safety_raster
+
+SIZES = (5, 20, 50, 200)
+SAMPLE_KM = 0.05
+
+
+def random_route(rng: random.Random, n: int):
+    lat = rng.uniform(26.15, 26.20)
+    lng = rng.uniform(91.70, 91.80)
+    route = []
+    for _ in range(n):
+        lat = min(max(lat + rng.gauss(0, 0.004), GUWAHATI_BOUNDS["south"]), GUWAHATI_BOUNDS["north"])
+        lng = min(max(lng + rng.gauss(0, 0.004), GUWAHATI_BOUNDS["west"]), GUWAHATI_BOUNDS["east"])
+        route.append({"coordinates": {"lat": lat, "lng": lng}})
+    return route
+
+
+def loop_analysis(stops, time_of_day: str = "night"):
+    legs = []
+    for a, b in zip(stops, stops[1:]):
+        (lat1, lng1), (lat2, lng2) = (
+            (s["coordinates"]["lat"], s["coordinates"]["lng"]) for s in (a, b)
+        )
+        times = {
+            mode: calculate_travel_time(lat1, lng1, lat2, lng2, mode)["estimated_time_minutes"]
+            for mode in TRAVEL_SPEEDS_KMH
+        }
+        samples = max(2, math.ceil(calculate_distance((lat1, lng1), (lat2, lng2)) / SAMPLE_KM) + 1)
+        scores = [
+            calculate_safety_score(
+                lat1 + (lat2 - lat1) * i / (samples - 1), lng1 + (lng2 - lng1) * i / (samples - 1), time_of_day
+            )["safety_score"]
+            for i in range(samples)
+        ]
+        legs.append({"time_minutes": times, "min_safety_score": min(scores)})
+    return legs
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(11)
+    get_safety_raster()
+    print(f"{'stops':>6}{'loop':>12}{'vectorized':>14}{'speedup':>10}")
+    for n in SIZES:
+        route = random_route(rng, n)
+        loop = best_of(lambda: loop_analysis(route), 3)
+        vectorized = best_of(lambda: analyze_route(route, time_of_day="night", sample_km=SAMPLE_KM), 20)
+        print(f"{n:>6}{loop * 1000:>10.2f}ms{vectorized * 1000:>12.3f}ms{loop / vectorized:>9.0f}x")
+
+        expected = loop_analysis(route)
+        legs = analyze_route(route, time_of_day="night", sample_km=SAMPLE_KM)["legs"]
+        for old, new in zip(expected, legs):
+            assert old["time_minutes"] == new["time_minutes"], (old, new)
+            assert old["min_safety_score"] == new["min_safety_score"], (old, new)
+
+
+if __name__ == "__main__":
+    main()
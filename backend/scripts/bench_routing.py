@@ -0,0 +1,119 @@
+"""
+Road routing: plain Dijkstra over the road graph vs contraction-hierarchy
+queries (checked to agree), and network vs straight-line estimates across
+the river and up Nilachal Hill.
+
+Uses a synthetic extract (scripts/synthetic_osm.py) unless --osm is given.
+
+Run from the repository root:
+    python -m backend.scripts.bench_routing [--osm backend/data/guwahati.osm.bz2] [--spacing 0.001]
+"""
+import sys
+import argparse
+import heapq
+import random
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.routing_engine import ContractionHierarchy, RoadRouter
+from backend.app.utils.geolocation import TRAVEL_SPEEDS_KMH, haversine_distance
+from backend.app.utils.osm_loader import PROFILES, build_graph, read_osm
+from backend.scripts.synthetic_osm import BRIDGE_LNG, HILL, generate, write_osm
+
+QUERIES = 300
+
+
+def dijkstra(graph, source, target):
+    offsets, targets, seconds = graph
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, x = heapq.heappop(heap)
+        if x == target:
+            return d
+        if d > dist[x]:
+            continue
+        for k in range(offsets[x], offsets[x + 1]):
+            y, nd = targets[k], d + seconds[k]
+            if nd < dist.get(y, float("inf")):
+                dist[y] = nd
+                heapq.heappush(heap, (nd, y))
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark road routing")
+    parser.add_argument("--osm")
+    parser.add_argument("--spacing", type=float, default=0.001)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        osm_path = args.osm
+        if osm_path is None:
+            osm_path = f"{tmp}/synthetic.osm"
+            write_osm(osm_path, *generate(args.spacing))
+        extract = read_osm(osm_path)
+
+        hierarchies = {}
+        for name in PROFILES:
+            graph = build_graph(extract, PROFILES[name])
+            start = time.perf_counter()
+            hierarchies[name] = ContractionHierarchy.build(graph)
+            print(f"{name}: {graph.node_count} nodes, {graph.edge_count} edges, "
+                  f"contracted in {time.perf_counter() - start:.1f}s")
+
+            rng = random.Random(3)
+            pairs = [(rng.randrange(graph.node_count), rng.randrange(graph.node_count)) for _ in range(QUERIES)]
+            plain = (graph.offsets.tolist(), graph.targets.tolist(), graph.seconds.tolist())
+
+            start = time.perf_counter()
+            expected = [dijkstra(plain, s, t) for s, t in pairs]
+            plain_s = time.perf_counter() - start
+            ch = hierarchies[name]
+            start = time.perf_counter()
+            found = [ch.query(s, t) for s, t in pairs]
+            ch_s = time.perf_counter() - start
+
+            mismatches = sum(
+                (e is None) != (f is None) or (e is not None and abs(e - f[0]) > 1e-3 * max(e, 1))
+                for e, f in zip(expected, found)
+            )
+            print(f"  dijkstra {plain_s / QUERIES * 1000:8.2f} ms/query   "
+                  f"ch {ch_s / QUERIES * 1000:6.3f} ms/query   "
+                  f"{plain_s / ch_s:6.0f}x   mismatches {mismatches}/{QUERIES}")
+
+        router = RoadRouter(hierarchies)
+        graph_path = f"{tmp}/routing_graph.npz"
+        router.save(graph_path)
+        router = RoadRouter.load(graph_path)
+
+    # Network vs straight line where geography matters (synthetic layout)
+    cases = {
+        "across the river (bridge)": ((26.185, BRIDGE_LNG + 0.05), (26.21, BRIDGE_LNG + 0.05)),
+        "foot of Nilachal Hill -> Kamakhya": ((HILL[0] + HILL[2] + 0.002, HILL[1]), (HILL[0], HILL[1]))
+    }
+    for label, (a, b) in cases.items():
+        straight = haversine_distance(a[0], a[1], b[0], b[1])
+        print(f"{label}: straight {straight:.2f} km")
+        for mode in ("walking", "driving"):
+            route = router.route(a, b, mode)
+            if route is None:
+                print(f"  {mode:<8} no route")
+                continue
+            print(f"  {mode:<8} road {route['distance_km']:.2f} km, {route['duration_minutes']:.1f} min "
+                  f"(straight line {straight / TRAVEL_SPEEDS_KMH[mode] * 60:.1f} min)")
+
+    rng = random.Random(5)
+    coords = [((rng.uniform(26.11, 26.185), rng.uniform(91.65, 91.81)),
+               (rng.uniform(26.11, 26.185), rng.uniform(91.65, 91.81))) for _ in range(QUERIES)]
+    start = time.perf_counter()
+    routed = sum(router.route(a, b, "auto") is not None for a, b in coords)
+    elapsed = time.perf_counter() - start
+    print(f"router.route (snap + query), auto: {elapsed / QUERIES * 1000:.3f} ms each, {routed}/{QUERIES} routed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Safety scoring: per-call distance loops vs the precomputed raster.
+
+Run from the repository root:
+    python -m backend.scripts.bench_safety
+"""
+import sys
+import random
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+from backend.app.utils.geolocation import (
+    GUWAHATI_BOUNDS, POLICE_STATIONS, TOURIST_AREAS, calculate_distance, calculate_safety_score, safety_factors
+)
+from backend.app.utils.safety_raster import SafetyRaster
+
+POINTS = 20000
+
+
+def direct_score(lat: float, lng: float, time_of_day: str) -> int:
+    """The old computation: distances to every station and area on each call"""
+    police_km = min(calculate_distance((lat, lng), (s["lat"], s["lng"])) for s in POLICE_STATIONS)
+    tourist = any(calculate_distance((lat, lng), (a["lat"], a["lng"])) <= 2.0 for a in TOURIST_AREAS)
+    score, _ = safety_factors(police_km, tourist, False, time_of_day)
+    return max(1, min(10, score))
+
+
+def timed(name: str, fn, count: int):
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<38}{elapsed * 1000:>9.1f} ms  {elapsed / count * 1e6:>8.2f} us each")
+
+
+def main():
+    rng = random.Random(3)
+    points = [
+        (rng.uniform(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["north"]),
+         rng.uniform(GUWAHATI_BOUNDS["west"], GUWAHATI_BOUNDS["east"]))
+        for _ in range(POINTS)
+    ]
+
+    start = time.perf_counter()
+    raster = SafetyRaster.build()
+    print(f"build {raster.rows} x {raster.cols} cells: {(time.perf_counter() - start) * 1000:.0f} ms")
+    path = str(Path(tempfile.mkdtemp()) / "safety_raster")
+    raster.save(path)
+    start = time.perf_counter()
+    raster = SafetyRaster.load(path)
+    print(f"load (memory-mapped): {(time.perf_counter() - start) * 1000:.2f} ms\n")
+
+    calculate_safety_score(*points[0])  # Build or load the shared raster outside the timings
+    timed("direct, per point", lambda: [direct_score(lat, lng, "day") for lat, lng in points], POINTS)
+    timed("calculate_safety_score (raster)", lambda: [calculate_safety_score(lat, lng) for lat, lng in points], POINTS)
+    lats, lngs = np.array(points).T
+    timed("raster, batched", lambda: raster.scores(lats, lngs, "day"), POINTS)
+
+    # Daytime agreement (lighting only changes night scores); differences are cells straddling a threshold
+    batched = raster.scores(lats, lngs, "day")
+    agree = sum(int(b) == direct_score(lat, lng, "day") for b, (lat, lng) in zip(batched, points))
+    print(f"\nagreement with direct scoring: {agree / POINTS:.2%}")
+
+    route = [(26.1852, 91.7511), (26.1864, 91.7432), (26.1839, 91.7464), (26.1665, 91.7065)]
+    timed("route, 4 stops, 50m samples", lambda: raster.route(route, "night"), 1)
+    timed("heatmap window 128 x 128", lambda: raster.window(26.10, 91.65, 26.25, 91.85, "night"), 1)
+
+
+if __name__ == "__main__":
+    main()
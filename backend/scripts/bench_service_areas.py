@@ -0,0 +1,91 @@
+"""
+Service-area containment: grid-mask index vs ray casting over every polygon.
+
+Adds a few hundred synthetic neighbourhood polygons to the built-in areas,
+checks the index against exact ray casting, and times single and batch
+lookups.
+
+Run from the repository root:
+    python -m backend.scripts.bench_service_areas
+"""
+import sys
+import math
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import numpy as np
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS, is_within_guwahati
+from backend.app.utils.service_areas import SERVICE_AREAS, ServiceAreaIndex, _edges, points_in_polygon
+
+SYNTHETIC_AREAS = 300
+POINTS = 20000
+BATCH = 200000
+
+
+def synthetic_area(rng: random.Random, i: int):
+    """Star-shaped polygon with 12-60 vertices, radius 0.3-2 km"""
+    lat = rng.uniform(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["north"])
+    lng = rng.uniform(GUWAHATI_BOUNDS["west"], GUWAHATI_BOUNDS["east"])
+    radius = rng.uniform(0.003, 0.018)
+    vertices = rng.randint(12, 60)
+    ring = []
+    for k in range(vertices):
+        angle = 2 * math.pi * k / vertices
+        r = radius * rng.uniform(0.5, 1.0)
+        ring.append((lat + r * math.sin(angle), lng + r * math.cos(angle)))
+    return {"id": f"synthetic_{i}", "name": f"Synthetic {i}", "kind": "neighbourhood", "rings": [ring]}
+
+
+def random_points(rng: random.Random, n: int):
+    margin = 0.02
+    return [
+        (rng.uniform(GUWAHATI_BOUNDS["south"] - margin, GUWAHATI_BOUNDS["north"] + margin),
+         rng.uniform(GUWAHATI_BOUNDS["west"] - margin, GUWAHATI_BOUNDS["east"] + margin))
+        for _ in range(n)
+    ]
+
+
+def timed(name: str, fn, count: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<46}{elapsed * 1000:>9.1f} ms  {elapsed / count * 1e6:>8.2f} us each")
+    return result
+
+
+def main():
+    rng = random.Random(5)
+    areas = SERVICE_AREAS + [synthetic_area(rng, i) for i in range(SYNTHETIC_AREAS)]
+    index = timed(f"build index ({len(areas)} polygons)", lambda: ServiceAreaIndex(areas), len(areas))
+    points = random_points(rng, POINTS)
+    lats, lngs = np.array(points).T
+
+    # Exact reference: ray casting every point against every polygon
+    edges = {area["id"]: _edges(area["rings"]) for area in areas}
+    expected = timed(
+        "ray casting, all polygons (numpy, batched)",
+        lambda: {area_id: points_in_polygon(lngs, lats, e) for area_id, e in edges.items()},
+        POINTS
+    )
+
+    found = timed("index.areas_at, per point", lambda: [index.areas_at(lat, lng) for lat, lng in points], POINTS)
+    mismatches = sum(
+        {a["id"] for a in hits} != {area_id for area_id, inside in expected.items() if inside[i]}
+        for i, hits in enumerate(found)
+    )
+    print(f"  mismatches vs ray casting: {mismatches}")
+
+    timed("is_within_guwahati, per point", lambda: [is_within_guwahati(lat, lng) for lat, lng in points], POINTS)
+    batch_lats, batch_lngs = np.array(random_points(rng, BATCH)).T
+    timed("index.contains_many('guwahati'), batch", lambda: index.contains_many("guwahati", batch_lats, batch_lngs),
+          BATCH)
+    inside = timed("index.contains_many(synthetic_0), batch",
+                   lambda: index.contains_many("synthetic_0", batch_lats, batch_lngs), BATCH)
+    assert (inside == points_in_polygon(batch_lngs, batch_lats, edges["synthetic_0"])).all()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Nearest-point queries: linear scan with calculate_distance (as
+find_nearest_landmark / get_safe_meeting_points did) vs the grid index, for
+single, radius and batched (itinerary stops) queries over synthetic POIs.
+Results are checked against the scan.
+
+Run from the repository root:
+    python -m backend.scripts.bench_spatial_index
+"""
+import sys
+import random
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS, calculate_distance
+from backend.app.utils.spatial_index import PointIndex
+
+POINTS = 5000
+QUERIES = 2000
+TYPES = ("temple", "riverfront", "market", "park", "museum")
+K = 5
+
+
+def scan(points, lat, lng, k, max_km=None, types=None):
+    found = []
+    for point_id, point in points.items():
+        if types is not None and point["type"] not in types:
+            continue
+        distance = calculate_distance((lat, lng), (point["lat"], point["lng"]))
+        if max_km is None or distance <= max_km:
+            found.append((distance, point_id))
+    found.sort()
+    return [point_id for _, point_id in found[:k]]
+
+
+def timed(name: str, fn, count: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<40}{elapsed * 1000:>9.1f} ms  {elapsed / count * 1e6:>9.1f} us each")
+    return result
+
+
+def random_point(rng):
+    return (rng.uniform(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["north"]),
+            rng.uniform(GUWAHATI_BOUNDS["west"], GUWAHATI_BOUNDS["east"]))
+
+
+def main():
+    rng = random.Random(11)
+    points = {}
+    for i in range(POINTS):
+        lat, lng = random_point(rng)
+        points[f"poi_{i}"] = {"name": f"POI {i}", "lat": lat, "lng": lng, "type": rng.choice(TYPES)}
+    origins = [random_point(rng) for _ in range(QUERIES)]
+
+    index = PointIndex()
+    timed(f"build index ({POINTS} points)", lambda: index.add_many(points), 1)
+    print()
+
+    cases = [
+        (f"k={K}", dict(k=K)),
+        (f"k={K}, types=temple,market", dict(k=K, types=("temple", "market"))),
+        ("within 1.5 km", dict(k=POINTS, max_km=1.5))
+    ]
+    for label, options in cases:
+        expected = timed(f"scan     {label}", lambda: [scan(points, lat, lng, **options) for lat, lng in origins],
+                         QUERIES)
+        found = timed(f"index    {label}", lambda: [index.nearest(lat, lng, **options) for lat, lng in origins],
+                      QUERIES)
+        batched = timed(f"batched  {label}", lambda: index.nearest_many(origins, **options), QUERIES)
+        mismatches = sum(
+            [p["id"] for p in single] != ids or [p["id"] for p in batch] != ids
+            for ids, single, batch in zip(expected, found, batched)
+        )
+        print(f"mismatches: {mismatches}/{QUERIES}\n")
+
+    stops = origins[:30]
+    timed("scan     30 itinerary stops, k=3", lambda: [scan(points, lat, lng, 3) for lat, lng in stops], 1)
+    timed("batched  30 itinerary stops, k=3", lambda: index.nearest_many(stops, 3), 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Startup import time of the app: `import backend.app.main` in fresh
+interpreters under -X importtime, the median total, the slowest packages by
+their own import time, and a check that optional integrations (geopy,
+requests, razorpay) are not imported until they are used.
+
+Needs the same environment as the app (SUPABASE_URL / SUPABASE_KEY).
+
+Run from the repository root:
+    python -m backend.scripts.bench_startup [--runs 5] [--top 15]
+"""
+import sys
+import argparse
+import os
+import statistics
+import subprocess
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+APP_MODULE = "backend.app.main"
+
+# Optional integrations that must stay out of a plain app import
+LAZY_MODULES = ("geopy", "requests", "razorpay")
+
+
+def import_profile():
+    """(total microseconds, {package: self microseconds}, imported top-level modules) of one fresh import"""
+    code = f"import sys, {APP_MODULE}; print(' '.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    )
+    if result.returncode != 0:
+        sys.exit(result.stderr.strip().splitlines()[-1])
+
+    total, packages = 0, defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        packages[name.split(".")[0] if not name.startswith("backend.") else ".".join(name.split(".")[:3])] \
+            += int(self_us)
+        if name == APP_MODULE:
+            total = int(cumulative_us)
+    return total, packages, set(result.stdout.split())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the app's startup import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    # The first run warms the bytecode and filesystem caches
+    import_profile()
+    profiles = [import_profile() for _ in range(args.runs)]
+    totals = sorted(total for total, _, _ in profiles)
+    print(f"import {APP_MODULE}: median {statistics.median(totals) / 1000:.0f} ms "
+          f"(min {totals[0] / 1000:.0f}, max {totals[-1] / 1000:.0f}) over {args.runs} runs\n")
+
+    packages = defaultdict(list)
+    for _, package_times, _ in profiles:
+        for package, self_us in package_times.items():
+            packages[package].append(self_us)
+    slowest = sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+    print(f"{'package':<40}{'median self time':>18}")
+    for package, times in slowest:
+        print(f"{package:<40}{statistics.median(times) / 1000:>15.1f} ms")
+
+    imported = profiles[0][2]
+    loaded = [name for name in LAZY_MODULES if name in imported]
+    print(f"\noptional integrations imported at startup: {', '.join(loaded) or 'none'}")
+    sys.exit(1 if loaded else 0)
+
+
+if __name__ == "__main__":
+    main()
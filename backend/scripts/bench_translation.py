@@ -0,0 +1,119 @@
+"""
+Translation latency and upstream call counts against the local stub server.
+
+Run from the repository root:
+    python -m backend.scripts.bench_translation
+"""
+import sys
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import requests
+from backend.scripts import fake_translate
+from backend.app.api.v1.endpoints.itineraries import ITINERARIES
+from backend.app.services.translation_service import TranslationService, itinerary_strings
+from backend.app.utils.cache import TieredCache
+
+PORT = 9020
+BASE_URL = f"http://127.0.0.1:{PORT}/language/translate/v2"
+REQUESTS = 2000
+CONCURRENCY = 100
+BLOCKING_SAMPLE = 50
+
+# Tourists ask for a few phrases far more often than the rest
+PHRASES = [f"Where is the nearest {place}?" for place in (
+    "temple", "hospital", "ATM", "bus stop", "ferry ghat", "police station", "pharmacy", "market",
+    "hotel", "restaurant", "museum", "taxi stand", "railway station", "toilet", "bank"
+)] + [f"How much does the {item} cost?" for item in (
+    "ticket", "shawl", "tea", "boat ride", "room", "meal", "silk", "guide", "entry", "taxi"
+)]
+
+
+def workload(n: int):
+    rng = random.Random(7)
+    weights = [1 / (rank + 1) for rank in range(len(PHRASES))]
+    return rng.choices(PHRASES, weights=weights, k=n)
+
+
+def report(name: str, latencies, wall: float, upstream: int):
+    latencies = sorted(latencies)
+    print(f"{name:<30}{len(latencies) / wall:>9,.0f} req/s  p50 {statistics.median(latencies) * 1000:>7.2f} ms  "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>7.2f} ms  upstream calls {upstream:>5}")
+
+
+async def blocking_baseline(texts):
+    """The old behaviour: requests.post per call, no pooling, no cache"""
+    before = fake_translate.STATS["requests"]
+    latencies = []
+
+    async def one(text):
+        start = time.perf_counter()
+        requests.post(BASE_URL, params={"key": "stub"}, json={"q": text, "target": "as", "format": "text"})
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    report(f"blocking, uncached (n={len(texts)})", latencies, time.perf_counter() - start,
+           fake_translate.STATS["requests"] - before)
+
+
+async def cached(service: TranslationService, texts, name: str):
+    before = fake_translate.STATS["requests"]
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def one(text):
+        async with semaphore:
+            start = time.perf_counter()
+            translated = await service.translate_text(text, "as")
+            latencies.append(time.perf_counter() - start)
+            assert translated == fake_translate.fake_translation(text, "as")
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in texts))
+    report(name, latencies, time.perf_counter() - start, fake_translate.STATS["requests"] - before)
+
+
+async def main():
+    server = fake_translate.start(PORT)
+    cache_path = str(Path(tempfile.mkdtemp()) / "translation_cache.db")
+    texts = workload(REQUESTS)
+
+    await blocking_baseline(texts[:BLOCKING_SAMPLE])
+
+    service = TranslationService("stub", BASE_URL, cache=TieredCache(cache_path, table="translations"))
+    await cached(service, texts, "cold cache, batched")
+    await cached(service, texts, "warm memory cache")
+    print(f"  cache stats {service.cache.stats}")
+    await service.aclose()
+
+    # A restart keeps the disk tier
+    restarted = TranslationService("stub", BASE_URL, cache=TieredCache(cache_path, table="translations"))
+    await cached(restarted, texts, "after restart (disk tier)")
+    print(f"  cache stats {restarted.cache.stats}")
+    await restarted.aclose()
+
+    # One itinerary: every text field at once
+    itinerary = ITINERARIES[0]
+    strings = itinerary_strings(itinerary)
+    for name, batch_size in (("one q per request", 1), ("micro-batched", 100)):
+        service = TranslationService("stub", BASE_URL, cache=TieredCache(":memory:", table="translations"))
+        service.batcher.max_batch = batch_size
+        before = fake_translate.STATS["requests"]
+        start = time.perf_counter()
+        await service.translate_itinerary(itinerary, "hi")
+        print(f"itinerary ({len(strings)} strings), {name:<18}{(time.perf_counter() - start) * 1000:>7.0f} ms  "
+              f"upstream calls {fake_translate.STATS['requests'] - before}")
+        await service.aclose()
+
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
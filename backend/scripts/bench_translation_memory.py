@@ -0,0 +1,104 @@
+"""
+Translation memory hit rate and latency.
+
+Loads the phrasebook plus a synthetic corpus of phrase pairs, replays a mix
+of repeated, misspelled and novel requests, and reports how many are answered
+locally and how fast. Misses go to the local stub translation server.
+
+Run from the repository root:
+    python -m backend.scripts.bench_translation_memory
+"""
+import sys
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.scripts import fake_translate
+from backend.app.services.translation_memory import get_translation_memory
+from backend.app.services.translation_service import TranslationService
+from backend.app.utils.cache import TieredCache
+
+PORT = 9022
+CORPUS = 20000
+REQUESTS = 10000
+PLACES = ["temple", "river", "market", "ticket counter", "ferry ghat", "tea garden", "silk village", "hotel",
+          "hospital", "railway station", "museum", "bridge", "zoo", "planetarium", "bus stand", "airport"]
+TEMPLATES = ["Where is the {}?", "How far is the {}?", "Take me to the {}", "Is the {} open today?",
+             "How much is the ticket for the {}?", "What time does the {} close?", "Is the {} near here?"]
+
+
+def corpus_sentences(n: int):
+    rng = random.Random(11)
+    sentences = set()
+    while len(sentences) < n:
+        sentences.add(rng.choice(TEMPLATES).format(f"{rng.choice(PLACES)} {rng.randint(1, 2000)}"))
+    return sorted(sentences)
+
+
+def misspell(text: str, rng: random.Random) -> str:
+    position = rng.randrange(1, len(text) - 1)
+    return text[:position] + text[position + 1] + text[position] + text[position + 2:]
+
+
+def workload(sentences, n: int):
+    rng = random.Random(13)
+    requests = []
+    for _ in range(n):
+        roll = rng.random()
+        sentence = rng.choice(sentences)
+        if roll < 0.6:
+            requests.append(rng.choice([sentence, sentence.lower(), sentence.rstrip("?") + " ?"]))
+        elif roll < 0.8:
+            requests.append(misspell(sentence, rng))
+        else:
+            requests.append(rng.choice(TEMPLATES).format(f"{rng.choice(PLACES)} {rng.randint(3000, 9000)}"))
+    return requests
+
+
+async def main():
+    memory = get_translation_memory()
+    sentences = corpus_sentences(CORPUS)
+    start = time.perf_counter()
+    memory.add_many((sentence, "hi", fake_translate.fake_translation(sentence, "hi")) for sentence in sentences)
+    print(f"translation memory: {len(memory):,} sources (loaded {CORPUS:,} pairs in "
+          f"{time.perf_counter() - start:.2f}s)")
+
+    requests = workload(sentences, REQUESTS)
+    outcomes = {"exact": [], "fuzzy": [], "miss": []}
+    misses = []
+    for text in requests:
+        start = time.perf_counter()
+        match = memory.lookup(text, "hi")
+        elapsed = time.perf_counter() - start
+        outcomes[match["match"] if match else "miss"].append(elapsed)
+        if not match:
+            misses.append(text)
+
+    for name, latencies in outcomes.items():
+        if latencies:
+            latencies.sort()
+            print(f"  {name:<6}{len(latencies) / REQUESTS:>6.1%}  p50 {statistics.median(latencies) * 1e6:>7.1f} us  "
+                  f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e6:>7.1f} us")
+    print(f"  answered locally: {1 - len(misses) / REQUESTS:.1%}")
+
+    server = fake_translate.start(PORT)
+    service = TranslationService(
+        "stub",
+        f"http://127.0.0.1:{PORT}/language/translate/v2",
+        cache=TieredCache(str(Path(tempfile.mkdtemp()) / "translations.db"), table="translations")
+    )
+    start = time.perf_counter()
+    await asyncio.gather(*(service.translate_text(text, "hi") for text in misses))
+    print(f"  {len(misses):,} misses sent upstream in {time.perf_counter() - start:.2f}s "
+          f"({fake_translate.STATS['requests']} batched requests, {fake_translate.LATENCY_MS:.0f} ms each)")
+    await service.aclose()
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""
+Travel times between known points: calculate_travel_time per pair vs the
+precomputed matrix, plus the cost of extending the matrix with new points.
+Known points are routed over the road network when the routing graph is
+built; the synthetic points used for the extension timings are not.
+
+Run from the repository root:
+    python -m backend.scripts.bench_travel_matrix
+"""
+import sys
+import random
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.routing_engine import get_road_router
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS, calculate_travel_time
+from backend.app.utils.travel_matrix import MATRIX_MODES, TravelTimeMatrix, known_points
+
+QUERIES = 100000
+SYNTHETIC_POINTS = 500
+
+
+def timed(name: str, fn, count: int):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<44}{elapsed * 1000:>9.1f} ms  {elapsed / count * 1e6:>8.2f} us each")
+    return result
+
+
+def main():
+    rng = random.Random(9)
+    points = known_points()
+    ids = list(points)
+    pairs = [(rng.choice(ids), rng.choice(ids), rng.choice(MATRIX_MODES)) for _ in range(QUERIES)]
+
+    router = get_road_router()
+    matrix = TravelTimeMatrix(router=router)
+    timed(f"build ({len(points)} points, {'road network' if router else 'straight lines'})",
+          lambda: matrix.add_points(points), 1)
+
+    def per_pair():
+        for a, b, mode in pairs:
+            calculate_travel_time(points[a]["lat"], points[a]["lng"], points[b]["lat"], points[b]["lng"], mode)
+
+    timed("calculate_travel_time per pair", per_pair, QUERIES)
+    timed("matrix.lookup", lambda: [matrix.lookup(a, b, mode) for a, b, mode in pairs], QUERIES)
+    for a, b, mode in pairs[:1000]:
+        expected = calculate_travel_time(points[a]["lat"], points[a]["lng"], points[b]["lat"], points[b]["lng"], mode)
+        found = matrix.lookup(a, b, mode)
+        assert abs(found["distance_km"] - expected["distance_km"]) <= 0.01, (found, expected)
+        assert abs(found["estimated_time_minutes"] - expected["estimated_time_minutes"]) <= 1, (found, expected)
+        assert found["route_source"] == expected["route_source"], (found, expected)
+
+    # Routing every synthetic pair would dominate the extension timings
+    matrix.router = None
+    synthetic = {
+        f"poi_{i}": {
+            "name": f"POI {i}", "kind": "meeting_point",
+            "lat": rng.uniform(GUWAHATI_BOUNDS["south"], GUWAHATI_BOUNDS["north"]),
+            "lng": rng.uniform(GUWAHATI_BOUNDS["west"], GUWAHATI_BOUNDS["east"])
+        }
+        for i in range(SYNTHETIC_POINTS)
+    }
+    timed(f"extend with {SYNTHETIC_POINTS} new points", lambda: matrix.add_points(synthetic), 1)
+    timed("extend with 1 more point",
+          lambda: matrix.add_points({"poi_new": {"name": "New", "kind": "landmark", "lat": 26.18, "lng": 91.75}}), 1)
+    timed(f"rank from a point id ({len(matrix)} points)",
+          lambda: [matrix.rank("kachari_ghat", "walking", 5) for _ in range(1000)], 1000)
+    timed("rank from coordinates", lambda: [matrix.rank((26.18, 91.74), "auto", 5) for _ in range(1000)], 1000)
+
+    path = str(Path(tempfile.mkdtemp()) / "travel_matrix.npz")
+    timed("save", lambda: matrix.save(path), 1)
+    loaded = timed("load + refresh details", lambda: TravelTimeMatrix.load(path), 1)
+    assert loaded.add_points({**points, **synthetic}) == 0
+    print(f"\nnearest to kachari_ghat by auto: {[p['id'] for p in loaded.rank('kachari_ghat', 'auto', 3)]}")
+
+
+if __name__ == "__main__":
+    main()
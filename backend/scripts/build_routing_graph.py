@@ -0,0 +1,47 @@
+"""
+Build the contracted road graph used for travel times, from a local
+OpenStreetMap extract (e.g. a Geofabrik .osm.bz2 clipped to Guwahati with
+osmium, or one written by scripts/synthetic_osm.py).
+
+Run from the repository root:
+    python -m backend.scripts.build_routing_graph [--osm backend/data/guwahati.osm.bz2] [--out backend/data/routing_graph.npz]
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.core.config import settings
+from backend.app.services.routing_engine import ContractionHierarchy, RoadRouter
+from backend.app.utils.osm_loader import PROFILES, build_graph, read_osm
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the road routing graph")
+    parser.add_argument("--osm", default=settings.ROUTING_OSM_PATH)
+    parser.add_argument("--out", default=settings.ROUTING_GRAPH_PATH)
+    parser.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    extract = read_osm(args.osm)
+    print(f"Read {len(extract.node_ids)} nodes, {len(extract.ways)} highways in {time.perf_counter() - start:.1f}s")
+
+    hierarchies = {}
+    for name in args.profiles:
+        start = time.perf_counter()
+        graph = build_graph(extract, PROFILES[name])
+        ch = ContractionHierarchy.build(graph, progress=lambda done, total: print(f"  {done}/{total}"))
+        shortcuts = len(ch.forward["targets"]) + len(ch.backward["targets"]) - graph.edge_count
+        print(f"{name}: {graph.node_count} nodes, {graph.edge_count} edges, {shortcuts} shortcuts "
+              f"in {time.perf_counter() - start:.1f}s")
+        hierarchies[name] = ch
+
+    RoadRouter(hierarchies).save(args.out)
+    print(f"Saved -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Build the safety-score raster ahead of deployment.
+
+The API builds it at startup when missing or stale; running this at deploy
+time keeps that cost out of startup. The new raster replaces the old one
+atomically, so it is safe to run while the API is serving.
+
+Run from the repository root:
+    python -m backend.scripts.build_safety_raster [--path backend/data/safety_raster] [--resolution 0.0005]
+"""
+import sys
+import argparse
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.core.config import settings
+from backend.app.utils.safety_raster import SafetyRaster
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the safety-score raster")
+    parser.add_argument("--path", default=settings.SAFETY_RASTER_PATH)
+    parser.add_argument("--resolution", type=float, default=settings.SAFETY_RASTER_RESOLUTION)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    raster = SafetyRaster.build(resolution=args.resolution)
+    raster.save(args.path)
+    size = sum(getattr(raster, name).nbytes for name in SafetyRaster.ARRAYS)
+    print(f"Built {raster.rows} x {raster.cols} cells ({size / 1024:.0f} KiB) "
+          f"in {time.perf_counter() - start:.2f}s -> {args.path}")
+
+
+if __name__ == "__main__":
+    main()
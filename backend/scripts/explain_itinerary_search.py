@@ -0,0 +1,51 @@
+"""
+Check the query plans of search_itineraries (sql/search_itineraries.sql):
+radius searches must go through the GiST index on meeting_point and the
+default listing through the (created_at, id) index, with every other filter
+applied in the same statement.
+
+Needs SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY, and a table large enough
+for the planner to prefer indexes (see bench_itinerary_search --keep).
+
+Run from the repository root:
+    python -m backend.scripts.explain_itinerary_search
+"""
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from supabase import create_client
+from backend.app.core.config import settings
+from backend.app.services.itinerary_service import search_params
+
+# (label, search_params arguments, index the plan must use)
+CASES = [
+    ("radius only", dict(latitude=26.1665, longitude=91.7065, radius_km=3),
+     "itineraries_meeting_point_geog_idx"),
+    ("radius + every filter", dict(latitude=26.1665, longitude=91.7065, radius_km=3, category="spiritual",
+                                   duration_min=60, duration_max=180, price_max=1500, search="walk"),
+     "itineraries_meeting_point_geog_idx"),
+    ("radius at 0, 0 (not treated as missing)", dict(latitude=0.0, longitude=0.0, radius_km=3),
+     "itineraries_meeting_point_geog_idx"),
+    ("newest first", dict(), "itineraries_active_created_at_id_idx"),
+    ("category, newest first", dict(category="heritage"), "itineraries_active_category_created_at_id_idx"),
+]
+
+
+def main():
+    supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_SERVICE_ROLE_KEY)
+    failures = 0
+    for label, arguments, index in CASES:
+        response = supabase.rpc("explain_search_itineraries", search_params(**arguments)).execute()
+        plan = "\n".join(row if isinstance(row, str) else next(iter(row.values())) for row in response.data or [])
+        ok = index in plan
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}: expects {index}")
+        print("\n".join(f"       {line}" for line in plan.splitlines()))
+        print()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Local fake of the Google reverse geocoding API for tests and benchmarks.
+
+Run standalone:
+    uvicorn backend.scripts.fake_geocoder:app --port 9030
+and point the backend at it:
+    GOOGLE_GEOCODE_API_BASE=http://127.0.0.1:9030/maps/api/geocode/json
+    GOOGLE_MAPS_API_KEY=stub
+
+Addresses are derived from the nearest landmark, so results are deterministic.
+Points outside Guwahati get ZERO_RESULTS. FAKE_GEOCODER_LATENCY_MS simulates
+the upstream round trip.
+"""
+import sys
+import asyncio
+import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import uvicorn
+from fastapi import FastAPI
+from backend.app.utils.geolocation import GUWAHATI_BOUNDS, find_nearest_landmark
+from backend.scripts.fake_razorpay import run_in_thread
+
+LATENCY_MS = float(os.getenv("FAKE_GEOCODER_LATENCY_MS", "150"))
+
+app = FastAPI(title="Fake Google Geocoder")
+STATS = {"requests": 0}
+
+
+@app.get("/maps/api/geocode/json")
+async def reverse_geocode(latlng: str, key: str = ""):
+    STATS["requests"] += 1
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if not key:
+        return {"status": "REQUEST_DENIED", "error_message": "The provided API key is invalid.", "results": []}
+
+    lat, lng = (float(value) for value in latlng.split(","))
+    if not (GUWAHATI_BOUNDS["south"] <= lat <= GUWAHATI_BOUNDS["north"]
+            and GUWAHATI_BOUNDS["west"] <= lng <= GUWAHATI_BOUNDS["east"]):
+        return {"status": "ZERO_RESULTS", "results": []}
+
+    landmark = find_nearest_landmark(lat, lng)
+    street = f"Lane {int(lat * 1000) % 100}"
+    return {"status": "OK", "results": [{
+        "formatted_address": f"{street}, near {landmark['name']}, Guwahati, Assam 781001, India",
+        "address_components": [
+            {"long_name": street, "types": ["route"]},
+            {"long_name": landmark["name"], "types": ["sublocality", "political"]},
+            {"long_name": "Guwahati", "types": ["locality", "political"]},
+            {"long_name": "Assam", "types": ["administrative_area_level_1", "political"]},
+            {"long_name": "India", "types": ["country", "political"]},
+            {"long_name": "781001", "types": ["postal_code"]}
+        ]
+    }]}
+
+
+@app.get("/stats")
+async def stats():
+    return STATS
+
+
+def start(port: int = 9030) -> uvicorn.Server:
+    return run_in_thread(app, port)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=9030)
@@ -0,0 +1,165 @@
+"""
+Local fake of the Razorpay REST API for tests and checkout load tests.
+
+Run standalone:
+    uvicorn backend.scripts.fake_razorpay:app --port 9010
+and point the backend at it:
+    RAZORPAY_API_BASE=http://127.0.0.1:9010/v1
+
+FAKE_GATEWAY_LATENCY_MS and FAKE_GATEWAY_ERROR_RATE simulate a slow or
+flaky gateway. FAKE_GATEWAY_SYNTHETIC_ORDERS adds that many generated (not
+stored) older orders to the order listing, for reconciliation runs.
+"""
+import asyncio
+import os
+import random
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Query, Request
+
+LATENCY_MS = float(os.getenv("FAKE_GATEWAY_LATENCY_MS", "80"))
+ERROR_RATE = float(os.getenv("FAKE_GATEWAY_ERROR_RATE", "0"))
+SYNTHETIC_ORDERS = int(os.getenv("FAKE_GATEWAY_SYNTHETIC_ORDERS", "0"))
+SYNTHETIC_EPOCH = 1_700_000_000
+
+app = FastAPI(title="Fake Razorpay")
+ORDERS: Dict[str, dict] = {}
+PAYMENTS: Dict[str, dict] = {}
+STATS = {"requests": 0}
+
+
+async def simulate_network():
+    STATS["requests"] += 1
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if ERROR_RATE and random.random() < ERROR_RATE:
+        raise HTTPException(status_code=503, detail="Simulated gateway outage")
+
+
+@app.post("/v1/orders")
+async def create_order(request: Request):
+    await simulate_network()
+    data = await request.json()
+    if not isinstance(data.get("amount"), int) or data["amount"] < 100:
+        raise HTTPException(status_code=400, detail="The amount must be at least INR 1.00")
+
+    order_id = f"order_{uuid.uuid4().hex[:14]}"
+    order = {
+        "id": order_id,
+        "entity": "order",
+        "amount": data["amount"],
+        "amount_paid": 0,
+        "amount_due": data["amount"],
+        "currency": data.get("currency", "INR"),
+        "receipt": data.get("receipt"),
+        "status": "created",
+        "attempts": 0,
+        "created_at": int(time.time())
+    }
+    ORDERS[order_id] = order
+    return order
+
+
+@app.get("/v1/orders/{order_id}")
+async def fetch_order(order_id: str):
+    await simulate_network()
+    if order_id not in ORDERS:
+        raise HTTPException(status_code=400, detail="The id provided does not exist")
+    return ORDERS[order_id]
+
+
+def synthetic_order(index: int, expand_payments: bool = False) -> dict:
+    """Deterministic order #index: every 4th one is still unpaid"""
+    amount = 50000 + (index % 50) * 1000
+    paid = index % 4 != 0
+    order = {
+        "id": f"order_syn{index:011d}",
+        "entity": "order",
+        "amount": amount,
+        "amount_paid": amount if paid else 0,
+        "amount_due": 0 if paid else amount,
+        "currency": "INR",
+        "receipt": f"booking_syn{index}",
+        "status": "paid" if paid else "created",
+        "attempts": 1 if paid else 0,
+        "created_at": SYNTHETIC_EPOCH - index
+    }
+    if expand_payments:
+        payments = [{
+            "id": f"pay_syn{index:011d}",
+            "entity": "payment",
+            "order_id": order["id"],
+            "amount": amount,
+            "status": "captured"
+        }] if paid else []
+        order["payments"] = {"entity": "collection", "count": len(payments), "items": payments}
+    return order
+
+
+@app.get("/v1/orders")
+async def list_orders(
+        count: int = 10,
+        skip: int = 0,
+        created_from: Optional[int] = Query(None, alias="from"),
+        created_to: Optional[int] = Query(None, alias="to"),
+        expand: Optional[str] = Query(None, alias="expand[]")
+):
+    """Newest first: stored orders, then the synthetic backlog"""
+    await simulate_network()
+    count = min(count, 100)
+    stored = sorted(
+        (
+            order for order in ORDERS.values()
+            if (created_from is None or order["created_at"] >= created_from)
+            and (created_to is None or order["created_at"] <= created_to)
+        ),
+        key=lambda order: order["created_at"],
+        reverse=True
+    )
+    items = stored[skip:skip + count]
+    first = max(0, skip - len(stored))
+    items += [
+        synthetic_order(i, expand_payments=expand == "payments")
+        for i in range(first, min(SYNTHETIC_ORDERS, first + count - len(items)))
+    ]
+    return {"entity": "collection", "count": len(items), "items": items}
+
+
+@app.post("/v1/payments/{payment_id}/capture")
+async def capture_payment(payment_id: str, request: Request):
+    await simulate_network()
+    data = await request.json()
+    payment = PAYMENTS.setdefault(payment_id, {
+        "id": payment_id,
+        "entity": "payment",
+        "amount": data.get("amount"),
+        "currency": data.get("currency", "INR"),
+        "status": "authorized"
+    })
+    if payment["status"] == "captured":
+        raise HTTPException(status_code=400, detail="This payment has already been captured")
+    payment["status"] = "captured"
+    return payment
+
+
+@app.get("/stats")
+async def stats():
+    return {**STATS, "orders": len(ORDERS)}
+
+
+def run_in_thread(fake_app=app, port: int = 9010) -> uvicorn.Server:
+    """Start a fake server on a background thread and wait until it accepts connections"""
+    server = uvicorn.Server(uvicorn.Config(fake_app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=9010)
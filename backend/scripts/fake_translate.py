@@ -0,0 +1,60 @@
+"""
+Local stub of the Google Translate v2 API for tests and benchmarks.
+
+Run standalone:
+    uvicorn backend.scripts.fake_translate:app --port 9020
+and point the backend at it:
+    GOOGLE_TRANSLATE_API_BASE=http://127.0.0.1:9020/language/translate/v2
+    GOOGLE_TRANSLATE_API_KEY=stub
+
+Translations are deterministic ("[as] hello"), so results can be asserted on.
+FAKE_TRANSLATE_LATENCY_MS simulates the upstream round trip.
+"""
+import sys
+import asyncio
+import os
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from backend.scripts.fake_razorpay import run_in_thread
+
+LATENCY_MS = float(os.getenv("FAKE_TRANSLATE_LATENCY_MS", "100"))
+
+app = FastAPI(title="Fake Google Translate")
+STATS = {"requests": 0, "strings": 0}
+
+
+def fake_translation(text: str, target: str) -> str:
+    return f"[{target}] {text}"
+
+
+@app.post("/language/translate/v2")
+async def translate(request: Request):
+    STATS["requests"] += 1
+    if LATENCY_MS:
+        await asyncio.sleep(LATENCY_MS / 1000)
+    if not request.query_params.get("key"):
+        raise HTTPException(status_code=403, detail="API key missing")
+
+    data = await request.json()
+    texts = data["q"] if isinstance(data.get("q"), list) else [data.get("q", "")]
+    STATS["strings"] += len(texts)
+    return {"data": {"translations": [
+        {"translatedText": fake_translation(text, data.get("target", "en"))} for text in texts
+    ]}}
+
+
+@app.get("/stats")
+async def stats():
+    return STATS
+
+
+def start(port: int = 9020) -> uvicorn.Server:
+    return run_in_thread(app, port)
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=9020)
@@ -0,0 +1,71 @@
+"""
+Pre-translate the itinerary catalogue into the translation store.
+
+Every catalogue string is sent through the batched translator once per
+language, so itinerary translations are then served from the cache.
+
+Run from the repository root:
+    python -m backend.scripts.pretranslate_catalogue [--langs as,hi,bn] [--stub]
+
+--stub starts the local fake translation server and writes to a temporary
+store instead of the configured one (useful to try the script offline).
+"""
+import sys
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.api.v1.endpoints.itineraries import ITINERARIES
+from backend.app.services.translation_service import TRANSLATION_LANGUAGES, TranslationService, itinerary_strings
+from backend.app.utils.cache import TieredCache
+
+STUB_PORT = 9021
+
+
+async def pretranslate(service: TranslationService, langs):
+    strings = list(dict.fromkeys(text for itinerary in ITINERARIES for text in itinerary_strings(itinerary)))
+    print(f"{len(ITINERARIES)} itineraries, {len(strings)} distinct strings")
+
+    for lang in langs:
+        batches_before = service.batcher.batches_sent
+        start = time.perf_counter()
+        results = await service.translate_many(strings, lang)
+        missing = sum(1 for result in results if result is None)
+        print(f"  {lang}: {len(strings) - missing}/{len(strings)} translated in "
+              f"{(time.perf_counter() - start) * 1000:.0f} ms, "
+              f"{service.batcher.batches_sent - batches_before} upstream requests")
+
+
+async def main(args):
+    langs = [lang.strip() for lang in args.langs.split(",") if lang.strip()]
+    server = None
+    if args.stub:
+        from backend.scripts import fake_translate
+        server = fake_translate.start(STUB_PORT)
+        service = TranslationService(
+            "stub",
+            f"http://127.0.0.1:{STUB_PORT}/language/translate/v2",
+            cache=TieredCache(str(Path(tempfile.mkdtemp()) / "translations.db"), table="translations")
+        )
+    else:
+        service = TranslationService()
+        if not service.api_key:
+            sys.exit("GOOGLE_TRANSLATE_API_KEY is not set (use --stub to try against the local fake)")
+
+    try:
+        await pretranslate(service, langs)
+    finally:
+        await service.aclose()
+        if server:
+            server.should_exit = True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--langs", default=",".join(TRANSLATION_LANGUAGES))
+    parser.add_argument("--stub", action="store_true")
+    asyncio.run(main(parser.parse_args()))
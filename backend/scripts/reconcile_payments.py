@@ -0,0 +1,40 @@
+"""
+Reconcile Razorpay orders with transactions and bookings.
+
+Run from the repository root (resumes from the last checkpoint):
+    python -m backend.scripts.reconcile_payments [--fresh] [--max-windows N]
+"""
+import sys
+import argparse
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.reconciliation import PaymentReconciler
+from backend.app.services.transaction_service import TransactionService
+
+
+async def main(args):
+    transaction_service = TransactionService()
+    reconciler = PaymentReconciler(transaction_service)
+    try:
+        checkpoint = await reconciler.run(fresh=args.fresh, max_windows=args.max_windows)
+    finally:
+        await reconciler.gateway.aclose()
+
+    stats = checkpoint["stats"]
+    print(f"{'finished' if checkpoint['done'] else 'paused'} after {stats['orders_scanned']:,} orders")
+    print(f"  transactions marked paid: {stats['transactions_marked_paid']:,}")
+    print(f"  bookings marked paid:     {stats['bookings_marked_paid']:,}")
+    print(f"  orders not in the ledger: {stats['unmatched_orders']:,}")
+    print(f"  flagged for review:       {stats['flagged']:,}")
+    for sample in stats["flagged_samples"]:
+        print(f"    {sample['order_id']}: {sample['reason']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--fresh", action="store_true", help="ignore the checkpoint and start over")
+    parser.add_argument("--max-windows", type=int, default=None, help="stop after N windows (resumable)")
+    asyncio.run(main(parser.parse_args()))
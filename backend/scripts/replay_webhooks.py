@@ -0,0 +1,164 @@
+"""
+Replay signed Razorpay webhook traffic against the webhook endpoint.
+
+Posts a burst of payment events concurrently, reports acknowledgement
+latency, then drains the queue through the worker pool into an in-memory
+ledger and reports how many database round trips the batches needed. Some
+orders are paid through /verify between a batch's ledger read and its
+writes (after a failed attempt event), to check those rows are not clobbered.
+
+Run from the repository root:
+    python -m backend.scripts.replay_webhooks
+"""
+import sys
+import asyncio
+import hashlib
+import hmac
+import os
+import statistics
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+WEBHOOK_SECRET = "replay_secret"
+os.environ["RAZORPAY_WEBHOOK_SECRET"] = WEBHOOK_SECRET
+os.environ["WEBHOOK_QUEUE_PATH"] = str(Path(tempfile.mkdtemp()) / "webhook_queue.db")
+
+import httpx
+import orjson
+from fastapi import FastAPI
+from backend.app.api.v1.endpoints import transactions
+from backend.app.services.webhook_queue import WebhookProcessor, get_webhook_queue
+
+EVENTS = 5000
+CONCURRENCY = 200
+DUPLICATE_RATE = 0.1  # Razorpay redelivers events it did not see acknowledged
+VERIFY_RACE_EVERY = 20  # Every nth order gets a payment.failed event and is paid through /verify mid-batch
+
+
+class FakeLedger:
+    """Stands in for TransactionService and counts the round trips it would make"""
+
+    def __init__(self, order_ids, verified_mid_batch=()):
+        self.rows = {
+            order_id: {"id": str(uuid.uuid4()), "booking_id": f"booking_{i}", "razorpay_order_id": order_id,
+                       "status": "created"}
+            for i, order_id in enumerate(order_ids)
+        }
+        self.by_id = {row["id"]: row for row in self.rows.values()}
+        self.verified_mid_batch = set(verified_mid_batch)
+        self.round_trips = 0
+        self.paid_bookings = set()
+
+    async def get_by_order_ids(self, order_ids):
+        self.round_trips += 1
+        snapshot = {order_id: dict(self.rows[order_id]) for order_id in order_ids if order_id in self.rows}
+        # /verify lands right after the read, before the batch writes
+        for order_id in self.verified_mid_batch.intersection(snapshot):
+            self.rows[order_id].update(status="paid", razorpay_payment_id=f"pay_verify_{order_id}",
+                                       razorpay_signature="verify_signature")
+        return snapshot
+
+    async def mark_paid(self, transaction_id, fields):
+        self.round_trips += 1
+        row = self.by_id[transaction_id]
+        if row["status"] == "paid":
+            return None
+        row.update(fields, status="paid")
+        return dict(row)
+
+    async def mark_failed(self, transaction_ids):
+        if transaction_ids:
+            self.round_trips += 1
+        for transaction_id in transaction_ids:
+            if self.by_id[transaction_id]["status"] != "paid":
+                self.by_id[transaction_id]["status"] = "failed"
+
+    async def mark_bookings_paid(self, booking_ids):
+        if booking_ids:
+            self.round_trips += 1
+        self.paid_bookings.update(booking_ids)
+
+
+def signed_event(order_id: str, event: str = "payment.captured"):
+    body = orjson.dumps({
+        "entity": "event",
+        "event": event,
+        "payload": {"payment": {"entity": {
+            "id": f"pay_{uuid.uuid4().hex[:14]}", "order_id": order_id, "amount": 120000,
+            "status": "failed" if event == "payment.failed" else "captured"
+        }}}
+    })
+    signature = hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return body, {"X-Razorpay-Signature": signature, "X-Razorpay-Event-Id": f"evt_{order_id}",
+                  "Content-Type": "application/json"}
+
+
+async def replay(order_ids, raced):
+    app = FastAPI()
+    app.include_router(transactions.router, prefix="/transactions")
+
+    deliveries = [
+        signed_event(order_id, "payment.failed" if order_id in raced else "payment.captured")
+        for order_id in order_ids
+    ]
+    deliveries += deliveries[:int(len(deliveries) * DUPLICATE_RATE)]
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies, statuses = [], {}
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        async def post(body, headers):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post("/transactions/webhook", content=body, headers=headers)
+                latencies.append(time.perf_counter() - start)
+                statuses[response.json().get("status")] = statuses.get(response.json().get("status"), 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post(body, headers) for body, headers in deliveries))
+        wall = time.perf_counter() - start
+
+        bad = await client.post("/transactions/webhook", content=deliveries[0][0],
+                                headers={"X-Razorpay-Signature": "0" * 64})
+
+    latencies.sort()
+    print(f"acknowledged {len(latencies):,} deliveries: {len(latencies) / wall:,.0f} req/s  "
+          f"p50 {statistics.median(latencies) * 1000:.2f} ms  p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.2f} ms")
+    print(f"  outcomes {statuses}, forged signature -> HTTP {bad.status_code}")
+
+
+async def drain(ledger: FakeLedger):
+    queue = get_webhook_queue()
+    processor = WebhookProcessor(queue, ledger, workers=2, batch_size=100, idle_sleep=0.01)
+    pending = queue.pending()
+    start = time.perf_counter()
+    processor.start()
+    while queue.pending():
+        await asyncio.sleep(0.01)
+    wall = time.perf_counter() - start
+    await processor.stop()
+
+    paid = sum(1 for row in ledger.rows.values() if row["status"] == "paid")
+    print(f"drained {pending:,} events in {wall:.2f}s ({pending / wall:,.0f} events/s)")
+    print(f"  {paid:,} transactions paid, {len(ledger.paid_bookings):,} bookings updated by the batches, "
+          f"{ledger.round_trips} DB round trips (per-event writes would need {pending * 3:,})")
+    intact = sum(
+        1 for order_id in ledger.verified_mid_batch
+        if ledger.rows[order_id]["status"] == "paid"
+        and ledger.rows[order_id].get("razorpay_signature") == "verify_signature"
+    )
+    print(f"  {intact}/{len(ledger.verified_mid_batch)} orders paid through /verify mid-batch kept their row")
+
+
+def main():
+    order_ids = [f"order_{uuid.uuid4().hex[:14]}" for _ in range(EVENTS)]
+    raced = set(order_ids[::VERIFY_RACE_EVERY])
+    asyncio.run(replay(order_ids, raced))
+    asyncio.run(drain(FakeLedger(order_ids, raced)))
+
+
+if __name__ == "__main__":
+    main()
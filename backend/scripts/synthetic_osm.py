@@ -0,0 +1,145 @@
+"""
+Write a synthetic Guwahati-like OpenStreetMap extract for routing tests and
+benchmarks, when no real extract is at hand.
+
+A street grid over the city with primary roads every fifth line and some
+one-way streets, the Brahmaputra crossed only by a bridge, and Nilachal Hill
+(Kamakhya) reached by a winding road or, on foot, by steps.
+
+Run from the repository root:
+    python -m backend.scripts.synthetic_osm [--out backend/data/synthetic.osm.bz2] [--spacing 0.001]
+"""
+import sys
+import argparse
+import bz2
+import math
+from pathlib import Path
+from xml.sax.saxutils import quoteattr
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.core.config import DATA_DIR
+
+LAT_RANGE = (26.10, 26.22)
+LNG_RANGE = (91.64, 91.82)
+RIVER = (26.19, 26.205)
+BRIDGE_LNG = 91.675
+HILL = (26.166, 91.705, 0.006)  # centre and radius in degrees
+
+
+def in_river(lat: float) -> bool:
+    return RIVER[0] <= lat <= RIVER[1]
+
+
+def on_hill(lat: float, lng: float) -> bool:
+    return math.hypot(lat - HILL[0], lng - HILL[1]) < HILL[2]
+
+
+def generate(spacing: float):
+    """(nodes {id: (lat, lng)}, ways [(node ids, tags)])"""
+    rows = int(round((LAT_RANGE[1] - LAT_RANGE[0]) / spacing)) + 1
+    cols = int(round((LNG_RANGE[1] - LNG_RANGE[0]) / spacing)) + 1
+    bridge_col = int(round((BRIDGE_LNG - LNG_RANGE[0]) / spacing))
+
+    def node_id(i: int, j: int) -> int:
+        return i * cols + j + 1
+
+    nodes = {}
+    for i in range(rows):
+        for j in range(cols):
+            lat, lng = LAT_RANGE[0] + i * spacing, LNG_RANGE[0] + j * spacing
+            if on_hill(lat, lng) or (in_river(lat) and j != bridge_col):
+                continue
+            nodes[node_id(i, j)] = (lat, lng)
+
+    def road_tags(index: int, along_rows: bool):
+        if index % 5 == 0:
+            return {"highway": "primary", "name": f"{'East' if along_rows else 'North'} Road {index // 5}"}
+        tags = {"highway": "residential"}
+        if along_rows and index % 7 == 3:
+            tags["oneway"] = "yes" if index % 2 else "-1"
+        return tags
+
+    ways = []
+
+    def add_runs(line, tags):
+        run = []
+        for nid in line + [None]:
+            if nid in nodes:
+                run.append(nid)
+                continue
+            if len(run) > 1:
+                ways.append((run, dict(tags)))
+            run = []
+
+    for i in range(rows):
+        add_runs([node_id(i, j) for j in range(cols)], road_tags(i, True))
+    for j in range(cols):
+        tags = road_tags(j, False)
+        if j == bridge_col:
+            tags = {"highway": "trunk", "name": "Saraighat Bridge", "bridge": "yes"}
+        add_runs([node_id(i, j) for i in range(rows)], tags)
+
+    # Nilachal Hill: a spiral road to the summit from the west, steps straight up from the north
+    next_id = rows * cols + 1
+    summit = next_id
+    nodes[summit] = (HILL[0], HILL[1])
+    next_id += 1
+    spiral = []
+    for k in range(24):
+        angle = math.pi + k * (3 * math.pi / 24)
+        radius = HILL[2] * (1 - k / 24) + spacing / 2
+        nodes[next_id] = (HILL[0] + radius * math.sin(angle), HILL[1] + radius * math.cos(angle))
+        spiral.append(next_id)
+        next_id += 1
+    entry_west = min(
+        (nid for nid, (lat, lng) in nodes.items() if nid <= rows * cols and lng < HILL[1] - HILL[2]),
+        key=lambda nid: math.hypot(nodes[nid][0] - HILL[0], nodes[nid][1] - (HILL[1] - HILL[2]))
+    )
+    ways.append(([entry_west] + spiral + [summit], {"highway": "tertiary", "name": "Kamakhya Temple Road"}))
+
+    entry_north = min(
+        (nid for nid, (lat, lng) in nodes.items() if nid <= rows * cols and lat > HILL[0] + HILL[2]),
+        key=lambda nid: math.hypot(nodes[nid][0] - (HILL[0] + HILL[2]), nodes[nid][1] - HILL[1])
+    )
+    steps = [entry_north]
+    for k in range(1, 6):
+        lat = nodes[entry_north][0] + (HILL[0] - nodes[entry_north][0]) * k / 6
+        lng = nodes[entry_north][1] + (HILL[1] - nodes[entry_north][1]) * k / 6
+        nodes[next_id] = (lat, lng)
+        steps.append(next_id)
+        next_id += 1
+    ways.append((steps + [summit], {"highway": "steps", "name": "Kamakhya Steps"}))
+    return nodes, ways
+
+
+def write_osm(path: str, nodes, ways):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    opener = bz2.open if path.endswith(".bz2") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<osm version="0.6" generator="synthetic_osm">\n')
+        for nid, (lat, lng) in nodes.items():
+            f.write(f'  <node id="{nid}" lat="{lat:.7f}" lon="{lng:.7f}"/>\n')
+        for way_id, (refs, tags) in enumerate(ways, start=1):
+            f.write(f'  <way id="{way_id}">\n')
+            for ref in refs:
+                f.write(f'    <nd ref="{ref}"/>\n')
+            for key, value in tags.items():
+                f.write(f'    <tag k={quoteattr(key)} v={quoteattr(value)}/>\n')
+            f.write('  </way>\n')
+        f.write('</osm>\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic OpenStreetMap extract")
+    parser.add_argument("--out", default=str(DATA_DIR / "synthetic.osm.bz2"))
+    parser.add_argument("--spacing", type=float, default=0.001, help="Grid spacing in degrees (~110m)")
+    args = parser.parse_args()
+
+    nodes, ways = generate(args.spacing)
+    write_osm(args.out, nodes, ways)
+    print(f"Wrote {len(nodes)} nodes, {len(ways)} ways -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -109,6 +109,35 @@ def test_vendors():
             print(f"  - {vendor['business_name']} ({vendor['rating']}★)")
 
 
+def test_payment_signatures(token):
+    print("\n\nTesting Payment Signatures...")
+
+    # Malformed (non-ASCII) signatures must be rejected as bad requests, not crash the handler
+    webhook = requests.post(f"{BASE_URL}/transactions/webhook", data=b'{"event": "payment.captured"}',
+                            headers={"X-Razorpay-Signature": "\u00e9" * 64})
+    if webhook.status_code == 400:
+        print("✅ Webhook with a non-ASCII signature rejected (400)")
+    else:
+        print(f"❌ Webhook with a non-ASCII signature: {webhook.status_code} {webhook.text}")
+
+    if not token:
+        print("❌ Skipping verify signature test - no token")
+        return
+
+    params = {
+        "razorpay_order_id": "order_test",
+        "razorpay_payment_id": "pay_test",
+        "razorpay_signature": "\u00e9" * 64,
+        "booking_id": "booking_test"
+    }
+    verify = requests.post(f"{BASE_URL}/transactions/verify", params=params,
+                           headers={"Authorization": f"Bearer {token}"})
+    if verify.status_code == 400:
+        print("✅ Verify with a non-ASCII signature rejected (400)")
+    else:
+        print(f"❌ Verify with a non-ASCII signature: {verify.status_code} {verify.text}")
+
+
 def test_bookings(token):
     print("\n\nTesting Bookings...")
 
@@ -160,6 +189,7 @@ if __name__ == "__main__":
         test_itineraries()
         test_vendors()
         test_support()
+        test_payment_signatures(token)
 
         # Test bookings with token
         if token:
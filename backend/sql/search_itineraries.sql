@@ -0,0 +1,159 @@
+-- Itinerary search used by ItineraryService.search_itineraries
+-- Every filter, the radius filter and keyset pagination in one parameterized statement
+-- Apply in the Supabase SQL editor (safe to re-run)
+-- Assumes itineraries.id is a UUID and itineraries.meeting_point a geometry(Point, 4326)
+
+CREATE EXTENSION IF NOT EXISTS postgis;
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Radius filter: ST_DWithin on the geography cast uses this expression index
+CREATE INDEX IF NOT EXISTS itineraries_meeting_point_geog_idx
+    ON itineraries USING GIST ((meeting_point::geography))
+    WHERE is_active;
+
+-- Default listing, newest first, paged by (created_at, id)
+CREATE INDEX IF NOT EXISTS itineraries_active_created_at_id_idx
+    ON itineraries (created_at DESC, id DESC)
+    WHERE is_active;
+
+-- Category listing, newest first
+CREATE INDEX IF NOT EXISTS itineraries_active_category_created_at_id_idx
+    ON itineraries (category, created_at DESC, id DESC)
+    WHERE is_active;
+
+-- Title search (ILIKE '%term%')
+CREATE INDEX IF NOT EXISTS itineraries_title_trgm_idx
+    ON itineraries USING GIN (title gin_trgm_ops);
+
+
+-- The statement for one combination of filters: only the predicates in use are emitted, so each
+-- combination gets its own plan (a catch-all "$1 IS NULL OR ..." would hide the indexes from the planner).
+-- Placeholders:
+--   $1 category          $2 duration_min      $3 duration_max     $4 price_max
+--   $5 lat               $6 lng               $7 radius_m         $8 title pattern
+--   $9 after_distance_m  $10 after_created_at $11 after_id        $12 fields
+--   $13 limit            $14 offset
+CREATE OR REPLACE FUNCTION search_itineraries_sql(
+    p_category TEXT,
+    p_duration_min INT,
+    p_duration_max INT,
+    p_price_max NUMERIC,
+    p_lat DOUBLE PRECISION,
+    p_lng DOUBLE PRECISION,
+    p_search TEXT,
+    p_after_id UUID
+) RETURNS TEXT
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    geo BOOLEAN := p_lat IS NOT NULL AND p_lng IS NOT NULL;
+    origin CONSTANT TEXT := 'ST_SetSRID(ST_MakePoint($6, $5), 4326)::geography';
+    conditions TEXT := 'i.is_active';
+    rows_sql TEXT;
+BEGIN
+    IF p_category IS NOT NULL THEN
+        conditions := conditions || ' AND i.category = $1';
+    END IF;
+    IF p_duration_min IS NOT NULL THEN
+        conditions := conditions || ' AND i.duration_minutes >= $2';
+    END IF;
+    IF p_duration_max IS NOT NULL THEN
+        conditions := conditions || ' AND i.duration_minutes <= $3';
+    END IF;
+    IF p_price_max IS NOT NULL THEN
+        conditions := conditions || ' AND i.price_per_person <= $4';
+    END IF;
+    IF p_search IS NOT NULL THEN
+        conditions := conditions || ' AND i.title ILIKE $8';
+    END IF;
+
+    IF geo THEN
+        conditions := conditions || ' AND ST_DWithin(i.meeting_point::geography, ' || origin || ', $7)';
+        rows_sql := 'SELECT i.*, ST_Distance(i.meeting_point::geography, ' || origin || ') AS distance_m'
+            || ' FROM itineraries i WHERE ' || conditions;
+        rows_sql := 'SELECT * FROM (' || rows_sql || ') r';
+        IF p_after_id IS NOT NULL THEN
+            rows_sql := rows_sql || ' WHERE (r.distance_m, r.id) > ($9, $11)';
+        END IF;
+        rows_sql := rows_sql || ' ORDER BY r.distance_m, r.id';
+    ELSE
+        IF p_after_id IS NOT NULL THEN
+            conditions := conditions || ' AND (i.created_at, i.id) < ($10, $11)';
+        END IF;
+        rows_sql := 'SELECT i.*, NULL::DOUBLE PRECISION AS distance_m FROM itineraries i WHERE ' || conditions
+            || ' ORDER BY i.created_at DESC, i.id DESC';
+    END IF;
+    rows_sql := rows_sql || ' LIMIT $13 OFFSET $14';
+
+    -- Sparse fieldset ($12, NULL for every column) and the embedded vendor, on the page only
+    RETURN 'SELECT CASE WHEN $12 IS NULL THEN to_jsonb(p) - ''distance_m'''
+        || ' ELSE (SELECT COALESCE(jsonb_object_agg(key, value), ''{}'') FROM jsonb_each(to_jsonb(p)) WHERE key = ANY($12))'
+        || ' || CASE WHEN ''vendor'' = ANY($12) THEN jsonb_build_object(''vendor'','
+        || ' (SELECT jsonb_build_object(''id'', v.id, ''business_name'', v.business_name,'
+        || ' ''rating'', v.rating, ''total_reviews'', v.total_reviews) FROM vendors v WHERE v.id = p.vendor_id))'
+        || ' ELSE ''{}'' END END AS item, p.distance_m, p.created_at, p.id'
+        || ' FROM (' || rows_sql || ') p'
+        || CASE WHEN geo THEN ' ORDER BY p.distance_m, p.id' ELSE ' ORDER BY p.created_at DESC, p.id DESC' END;
+END $$;
+
+
+-- Escape LIKE wildcards in a search term and wrap it for a substring match
+CREATE OR REPLACE FUNCTION search_itineraries_pattern(p_search TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT '%' || replace(replace(replace(p_search, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+$$;
+
+
+CREATE OR REPLACE FUNCTION search_itineraries(
+    p_category TEXT DEFAULT NULL,
+    p_duration_min INT DEFAULT NULL,
+    p_duration_max INT DEFAULT NULL,
+    p_price_max NUMERIC DEFAULT NULL,
+    p_lat DOUBLE PRECISION DEFAULT NULL,
+    p_lng DOUBLE PRECISION DEFAULT NULL,
+    p_radius_m DOUBLE PRECISION DEFAULT 5000,
+    p_search TEXT DEFAULT NULL,
+    p_after_distance_m DOUBLE PRECISION DEFAULT NULL,
+    p_after_created_at TIMESTAMPTZ DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_fields TEXT[] DEFAULT NULL,
+    p_limit INT DEFAULT 10,
+    p_offset INT DEFAULT 0
+) RETURNS TABLE (item JSONB, distance_m DOUBLE PRECISION, created_at TIMESTAMPTZ, id UUID)
+LANGUAGE plpgsql STABLE AS $$
+BEGIN
+    RETURN QUERY EXECUTE search_itineraries_sql(
+        p_category, p_duration_min, p_duration_max, p_price_max, p_lat, p_lng, p_search, p_after_id
+    ) USING p_category, p_duration_min, p_duration_max, p_price_max, p_lat, p_lng, p_radius_m,
+        search_itineraries_pattern(p_search), p_after_distance_m, p_after_created_at, p_after_id, p_fields,
+        p_limit, p_offset;
+END $$;
+
+
+-- Plan of the same statement, to check the indexes are used (scripts/explain_itinerary_search.py)
+CREATE OR REPLACE FUNCTION explain_search_itineraries(
+    p_category TEXT DEFAULT NULL,
+    p_duration_min INT DEFAULT NULL,
+    p_duration_max INT DEFAULT NULL,
+    p_price_max NUMERIC DEFAULT NULL,
+    p_lat DOUBLE PRECISION DEFAULT NULL,
+    p_lng DOUBLE PRECISION DEFAULT NULL,
+    p_radius_m DOUBLE PRECISION DEFAULT 5000,
+    p_search TEXT DEFAULT NULL,
+    p_after_distance_m DOUBLE PRECISION DEFAULT NULL,
+    p_after_created_at TIMESTAMPTZ DEFAULT NULL,
+    p_after_id UUID DEFAULT NULL,
+    p_fields TEXT[] DEFAULT NULL,
+    p_limit INT DEFAULT 10,
+    p_offset INT DEFAULT 0
+) RETURNS SETOF TEXT
+LANGUAGE plpgsql AS $$
+BEGIN
+    RETURN QUERY EXECUTE 'EXPLAIN (ANALYZE, BUFFERS) ' || search_itineraries_sql(
+        p_category, p_duration_min, p_duration_max, p_price_max, p_lat, p_lng, p_search, p_after_id
+    ) USING p_category, p_duration_min, p_duration_max, p_price_max, p_lat, p_lng, p_radius_m,
+        search_itineraries_pattern(p_search), p_after_distance_m, p_after_created_at, p_after_id, p_fields,
+        p_limit, p_offset;
+END $$;
+
+GRANT EXECUTE ON FUNCTION search_itineraries TO anon, authenticated;
+REVOKE EXECUTE ON FUNCTION explain_search_itineraries FROM PUBLIC, anon, authenticated;
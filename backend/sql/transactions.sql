@@ -0,0 +1,35 @@
+-- Payment ledger used by TransactionService
+-- Apply in the Supabase SQL editor (safe to re-run)
+
+CREATE TABLE IF NOT EXISTS transactions (
+    id UUID PRIMARY KEY,
+    booking_id TEXT NOT NULL,
+    amount NUMERIC(12, 2) NOT NULL,
+    currency TEXT NOT NULL DEFAULT 'INR',
+    payment_method TEXT DEFAULT 'razorpay',
+    status TEXT NOT NULL,                 -- pending | created | paid | failed
+    transaction_id TEXT,
+    razorpay_order_id TEXT,
+    razorpay_payment_id TEXT,
+    razorpay_signature TEXT,
+    idempotency_key TEXT,
+    request_fingerprint TEXT,             -- sha256 of booking_id|amount in paise|currency
+    created_at TIMESTAMP NOT NULL DEFAULT now()
+);
+
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+ALTER TABLE transactions ADD COLUMN IF NOT EXISTS request_fingerprint TEXT;
+
+-- One order per idempotency key: concurrent create-order claims lose on this index
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_idempotency_key_idx
+    ON transactions (idempotency_key) WHERE idempotency_key IS NOT NULL;
+
+-- Lookups by gateway IDs (verify, webhooks, reconciliation)
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_razorpay_order_id_idx
+    ON transactions (razorpay_order_id) WHERE razorpay_order_id IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_razorpay_payment_id_idx
+    ON transactions (razorpay_payment_id) WHERE razorpay_payment_id IS NOT NULL;
+
+-- Payment history of a booking, newest first
+CREATE INDEX IF NOT EXISTS transactions_booking_id_created_at_idx
+    ON transactions (booking_id, created_at DESC);